@@ -0,0 +1,29 @@
+import unittest
+from sqlalchemy import inspect
+from app import create_app, db
+from config import TestingConfig
+
+
+class MigrationsOnlyConfig(TestingConfig):
+    DB_CREATE_ALL = False
+    SWAGGER_UI_ENABLED = False
+    MIGRATE_ENABLED = False
+
+
+class TestAppFactory(unittest.TestCase):
+    def test_production_path_skips_schema_creation_and_unused_setup(self):
+        app = create_app(MigrationsOnlyConfig)
+        with app.app_context():
+            self.assertEqual(inspect(db.engine).get_table_names(), [])
+        self.assertNotIn("swagger_ui", app.blueprints)
+        self.assertNotIn("migrate", app.extensions)
+
+    def test_default_path_creates_schema(self):
+        app = create_app("config.TestingConfig")
+        with app.app_context():
+            self.assertIn("service_tickets", inspect(db.engine).get_table_names())
+        self.assertIn("swagger_ui", app.blueprints)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import threading
+import time
+import unittest
+from jose import jwt, JWTError
+from werkzeug.security import generate_password_hash
+from app import create_app
+from app.extensions import password_hasher
+from app.auth.token_cache import VerifiedTokenCache
+from app.auth.passwords import PasswordHasherBusy, _HashingPool
+from config import TestingConfig
+
+
+class TestVerifiedTokenCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = VerifiedTokenCache(maxsize=2)
+
+    def make_token(self, customer_id, secret="secret", ttl=60):
+        return jwt.encode({"customer_id": customer_id, "exp": int(time.time()) + ttl}, secret, algorithm="HS256")
+
+    def test_hit_after_first_decode(self):
+        token = self.make_token(1)
+        self.assertEqual(self.cache.decode(token, "secret")["customer_id"], 1)
+        self.assertEqual(self.cache.decode(token, "secret")["customer_id"], 1)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_evicts_least_recently_used(self):
+        first, second, third = (self.make_token(i) for i in range(3))
+        for token in (first, second, third):
+            self.cache.decode(token, "secret")
+        self.assertEqual(self.cache.stats()["size"], 2)
+        self.cache.decode(first, "secret")
+        self.assertEqual(self.cache.stats()["hits"], 0)
+
+    def test_expired_entry_is_reverified(self):
+        token = self.make_token(1, ttl=-1)
+        with self.assertRaises(JWTError):
+            self.cache.decode(token, "secret")
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    def test_secret_rotation_purges_entries(self):
+        token = self.make_token(1)
+        self.cache.decode(token, "secret")
+        with self.assertRaises(JWTError):
+            self.cache.decode(token, "rotated")
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+
+class TestHashingPool(unittest.TestCase):
+    def test_rejects_work_when_saturated(self):
+        pool = _HashingPool(workers=1, queue_size=0, timeout=5)
+        started, release = threading.Event(), threading.Event()
+
+        def blocker():
+            started.set()
+            release.wait()
+
+        worker = threading.Thread(target=pool.run, args=(blocker,))
+        worker.start()
+        started.wait()
+        with self.assertRaises(PasswordHasherBusy):
+            pool.run(lambda: None)
+        release.set()
+        worker.join()
+        self.assertEqual(pool.run(lambda: "done"), "done")
+
+    def test_timeout_is_reported_as_busy(self):
+        pool = _HashingPool(workers=1, queue_size=0, timeout=0.01)
+        release = threading.Event()
+        with self.assertRaises(PasswordHasherBusy):
+            pool.run(release.wait)
+        release.set()
+        pool.executor.shutdown(wait=True)
+        self.assertTrue(pool.slots.acquire(blocking=False))  # Released once the job finished
+
+
+class TestPasswordHasher(unittest.TestCase):
+    def test_needs_rehash_normalizes_the_configured_method(self):
+        class ShortMethodConfig(TestingConfig):
+            PASSWORD_HASH_METHOD = "scrypt"  # Werkzeug writes this as scrypt:32768:8:1
+        with create_app(ShortMethodConfig).app_context():
+            self.assertFalse(password_hasher.needs_rehash(password_hasher.hash("secret")))
+            self.assertFalse(password_hasher.needs_rehash(generate_password_hash("secret", "scrypt:32768:8:1")))
+            self.assertTrue(password_hasher.needs_rehash(generate_password_hash("secret", "scrypt:16384:8:1")))
+            self.assertTrue(password_hasher.needs_rehash(generate_password_hash("secret", "pbkdf2:sha256:1000")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 from app import create_app, db
-from app.models import Customer, ServiceTicket
+from app.caching import invalidate_tags, ticket_tag
+from app.models import Customer, ServiceTicket, Inventory
+from sqlalchemy import event
 from werkzeug.security import generate_password_hash
 from datetime import datetime, timezone
 
@@ -54,6 +56,13 @@ class TestCustomerBlueprint(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn("token", response.json)
 
+    def test_customer_login_rehashes_outdated_hash(self):
+        self.get_token()
+        with self.app.app_context():
+            customer = Customer.query.filter_by(email="unique_test@example.com").first()
+            self.assertTrue(customer.password_hash.startswith(self.app.config["PASSWORD_HASH_METHOD"] + "$"))
+        self.get_token()  # The upgraded hash still verifies
+
     def test_customer_login_failure(self):
         response = self.client.post("/customers/login", json={
             "email": "wrong@example.com",
@@ -69,6 +78,75 @@ class TestCustomerBlueprint(unittest.TestCase):
         self.assertEqual(response.status_code, 401)
         self.assertIn("message", response.json)
 
+    def test_get_my_tickets_loads_items_without_n_plus_one(self):
+        with self.app.app_context():
+            customer_id = Customer.query.first().id
+            part = Inventory(name="Brake Pads", price=49.99)
+            for i in range(5):
+                ticket = ServiceTicket(VIN=f"VIN{i}", description="Brakes", customer_id=customer_id)
+                ticket.inventory_items.append(part)
+                db.session.add(ticket)
+            db.session.commit()
+
+            headers = {"Authorization": "Bearer " + self.get_token()}
+            statements = []
+            listener = lambda *args: statements.append(args[2])
+            event.listen(db.engine, "before_cursor_execute", listener)
+            try:
+                response = self.client.get("/customers/my-tickets", headers=headers)
+            finally:
+                event.remove(db.engine, "before_cursor_execute", listener)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json), 6)
+        self.assertEqual(response.json[-1]["inventory_items"][0]["name"], "Brake Pads")
+        self.assertEqual(len(statements), 2)  # Tickets plus one SELECT ... IN for their items
+
+    def test_my_tickets_cache_is_per_customer_and_invalidated_on_write(self):
+        with self.app.app_context():
+            db.session.add(Customer(
+                name="Jane Roe",
+                email="jane.roe@example.com",
+                password_hash=generate_password_hash("password123"),
+                phone="5555555555"
+            ))
+            db.session.commit()
+        other = self.client.post("/customers/login", json={"email": "jane.roe@example.com", "password": "password123"})
+        headers = {"Authorization": "Bearer " + self.get_token()}
+        other_headers = {"Authorization": "Bearer " + other.json["token"]}
+
+        self.assertEqual(len(self.client.get("/customers/my-tickets", headers=headers).json), 1)
+        self.assertEqual(self.client.get("/customers/my-tickets", headers=other_headers).json, [])
+
+        response = self.client.post("/customers/create-ticket", json={
+            "VIN": "2HGCM82633A654321",
+            "description": "Brake replacement"
+        }, headers=headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self.client.get("/customers/my-tickets", headers=headers).json), 2)
+
+    def test_my_tickets_not_cached_when_a_ticket_changes_during_the_read(self):
+        headers = {"Authorization": "Bearer " + self.get_token()}
+        read = []
+
+        def concurrent_write(conn, cursor, statement, *args):
+            if "FROM service_tickets" in statement and not read:
+                read.append(statement)
+                invalidate_tags(ticket_tag(1))  # Another request's write lands before add_cache_tags()
+
+        with self.app.app_context():
+            event.listen(db.engine, "after_cursor_execute", concurrent_write)
+        self.assertEqual(len(self.client.get("/customers/my-tickets", headers=headers).json), 1)
+
+        statements = []
+        with self.app.app_context():
+            event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        self.client.get("/customers/my-tickets", headers=headers)
+        self.assertTrue(statements)  # Read again rather than served from the stale entry
+        statements.clear()
+        self.client.get("/customers/my-tickets", headers=headers)
+        self.assertEqual(statements, [])  # Cached once nothing changed mid-request
+
     def test_get_customers_success(self):
         response = self.client.get("/customers/")
         self.assertEqual(response.status_code, 200)
@@ -77,6 +155,35 @@ class TestCustomerBlueprint(unittest.TestCase):
         self.assertEqual(len(response.json["customers"]), 1)
         self.assertEqual(response.json["customers"][0]["name"], "John Doe")
 
+    def test_get_customers_cursor_pagination(self):
+        with self.app.app_context():
+            for i in range(3):
+                db.session.add(Customer(
+                    name=f"Customer {i}",
+                    email=f"customer{i}@example.com",
+                    password_hash="hash",
+                    phone="5555555555"
+                ))
+            db.session.commit()
+
+        response = self.client.get("/customers/?limit=3")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json["customers"]), 3)
+        self.assertNotIn("total", response.json)
+        self.assertIsNotNone(response.json["next_cursor"])
+
+        response = self.client.get(f"/customers/?limit=3&include_total=true&after={response.json['next_cursor']}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json["customers"]), 1)
+        self.assertEqual(response.json["customers"][0]["name"], "Customer 2")
+        self.assertIsNone(response.json["next_cursor"])
+        self.assertEqual(response.json["total"], 4)
+
+    def test_get_customers_invalid_cursor(self):
+        response = self.client.get("/customers/?after=not-a-cursor")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("message", response.json)
+
     def test_register_customer_success(self):
         response = self.client.post("/customers/register", json={
             "name": "Jane Doe",
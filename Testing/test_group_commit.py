@@ -0,0 +1,87 @@
+import math
+import os
+import tempfile
+import threading
+import unittest
+from sqlalchemy import exc
+from app import create_app, db
+from app.auth.utils import encode_token
+from app.group_commit import group_committer
+from app.models import Customer, ServiceTicket
+from config import TestingConfig
+
+
+class GroupCommitConfig(TestingConfig):
+    GROUP_COMMIT_ENABLED = True
+    GROUP_COMMIT_WINDOW_MS = 200
+    GROUP_COMMIT_MAX_BATCH = 4
+
+
+class TestGroupCommit(unittest.TestCase):
+    def setUp(self):
+        # A file database: the batch is committed from another thread's session
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        GroupCommitConfig.SQLALCHEMY_DATABASE_URI = f"sqlite:///{self.db_path}"
+        self.app = create_app(GroupCommitConfig)
+        with self.app.app_context():
+            db.session.add(Customer(name="Rush", email="rush@example.com", phone="1", password_hash="x"))
+            db.session.commit()
+            self.commits = []
+            db.event.listen(db.engine, "commit", lambda connection: self.commits.append(1))
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        os.unlink(self.db_path)
+
+    def insert_concurrently(self, tickets):
+        results = [None] * len(tickets)
+        barrier = threading.Barrier(len(tickets))  # Arrive together, well inside one window
+
+        def run(index):
+            barrier.wait()
+            with self.app.app_context():
+                try:
+                    results[index] = group_committer.insert(tickets[index])
+                except Exception as error:
+                    results[index] = error
+
+        threads = [threading.Thread(target=run, args=(index,)) for index in range(len(tickets))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_inserts_share_commits_and_get_their_ids(self):
+        tickets = [ServiceTicket(VIN=f"VIN{n}", description="Drop-off", customer_id=1) for n in range(8)]
+        ids = self.insert_concurrently(tickets)
+
+        self.assertEqual(sorted(ids), list(range(1, 9)))
+        # Batches may split differently from run to run, but never need more than ceil(8 / 4) commits
+        self.assertLessEqual(len(self.commits), math.ceil(len(tickets) / GroupCommitConfig.GROUP_COMMIT_MAX_BATCH))
+        with self.app.app_context():
+            self.assertEqual(db.session.scalar(db.select(db.func.count()).select_from(ServiceTicket)), len(tickets))
+            for n, ticket_id in enumerate(ids):
+                self.assertEqual(db.session.get(ServiceTicket, ticket_id).VIN, f"VIN{n}")
+
+    def test_failed_insert_only_fails_its_own_request(self):
+        tickets = [ServiceTicket(VIN="GOOD1", description="a", customer_id=1),
+                   ServiceTicket(VIN=None, description="b", customer_id=1),
+                   ServiceTicket(VIN="GOOD2", description="c", customer_id=1)]
+        results = self.insert_concurrently(tickets)
+
+        self.assertIsInstance(results[1], exc.IntegrityError)
+        self.assertTrue(isinstance(results[0], int) and isinstance(results[2], int))
+        with self.app.app_context():
+            self.assertEqual(sorted(t.VIN for t in ServiceTicket.query.all()), ["GOOD1", "GOOD2"])
+
+    def test_create_ticket_returns_id(self):
+        with self.app.app_context():
+            token = encode_token(1)
+        response = self.app.test_client().post("/service-tickets/", json={"VIN": "ABC", "description": "Brakes"},
+                                               headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json["id"], 1)
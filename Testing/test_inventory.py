@@ -1,6 +1,14 @@
+import io
+import json
+import os
+import tempfile
 import unittest
 from app import create_app, db
 from app.models import Inventory, Mechanic, ServiceTicket, Customer  # Import Customer model
+from app.blueprints.inventory.importer import iter_records
+from app.blueprints.inventory.schemas import inventories_row_dumper
+from app.blueprints.inventory.search import search_filters
+from app.streaming import ndjson_response
 from werkzeug.security import generate_password_hash
 from datetime import datetime, timezone  # Import datetime and timezone
 
@@ -85,6 +93,162 @@ class TestInventoryBlueprint(unittest.TestCase):
         self.assertEqual(response.json[0]["name"], "Brake Pads")
 
 
+    def test_get_inventories_paged(self):
+        with self.app.app_context():
+            db.session.add(Inventory(name="Oil Filter", price=9.99))
+            db.session.commit()
+
+        response = self.client.get("/inventory/?limit=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json), 1)
+        self.assertIn("X-Next-Cursor", response.headers)
+
+        response = self.client.get("/inventory/?limit=1&after=" + response.headers["X-Next-Cursor"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json[0]["name"], "Oil Filter")
+        self.assertNotIn("X-Next-Cursor", response.headers)
+
+    def test_get_inventories_stream(self):
+        response = self.client.get("/inventory/?stream=ndjson")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["name"], "Brake Pads")
+
+    def test_stream_reads_keyset_batches(self):
+        with self.app.app_context():
+            db.session.add_all([Inventory(name=f"Part {n}", price=n) for n in range(4)])
+            db.session.commit()
+        statements = []
+        with self.app.test_request_context():
+            db.event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+            dumper = inventories_row_dumper
+            response = ndjson_response(dumper.select(), Inventory.id, dumper, batch_size=2)
+            names = [json.loads(line)["name"] for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(names, ["Brake Pads", "Part 0", "Part 1", "Part 2", "Part 3"])
+        self.assertEqual(len(statements), 3)  # 2 + 2 + 1 rows; the short page ends the stream
+        self.assertTrue(all("LIMIT" in statement for statement in statements))
+        self.assertIn("inventory.id >", statements[1])
+
+    def test_get_inventory_sparse_fields(self):
+        response = self.client.get("/inventory/?fields=name&stream=ndjson")
+        self.assertEqual(json.loads(response.get_data(as_text=True)), {"name": "Brake Pads"})
+
+        response = self.client.get("/inventory/1?fields=id,price")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {"id": 1, "price": 49.99})
+        self.assertEqual(self.client.get("/inventory/1?fields=cost").status_code, 400)
+
+    def test_search_inventory(self):
+        with self.app.app_context():
+            db.session.add_all([Inventory(name="brake fluid", price=9.5), Inventory(name="Oil Filter", price=12),
+                                Inventory(name="Air filter", price=15), Inventory(name="Brake_line", price=30)])
+            db.session.commit()
+
+        response = self.client.get("/inventory/search?q=BRA")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["name"] for item in response.json], ["brake fluid", "Brake Pads", "Brake_line"])
+
+        response = self.client.get("/inventory/search?q=_&match=contains")  # Wildcards are matched literally
+        self.assertEqual([item["name"] for item in response.json], ["Brake_line"])
+
+        response = self.client.get("/inventory/search?min_price=10&max_price=40&sort=-price&limit=2&fields=name")
+        self.assertEqual(response.json, [{"name": "Brake_line"}, {"name": "Air filter"}])
+        response = self.client.get(response.headers["Link"][1:].split(">")[0])
+        self.assertEqual(response.json, [{"name": "Oil Filter"}])
+        self.assertNotIn("X-Next-Cursor", response.headers)
+
+    def test_search_prefix_ending_in_z_or_digit(self):
+        with self.app.app_context():
+            db.session.add_all([Inventory(name="Brz bushing", price=5), Inventory(name="Brzx_9 clip", price=6),
+                                Inventory(name="Bolt M9", price=1), Inventory(name="Bra clip", price=2)])
+            db.session.commit()
+        response = self.client.get("/inventory/search?q=brz")
+        self.assertEqual([item["name"] for item in response.json], ["Brz bushing", "Brzx_9 clip"])
+
+        # The LIKE form used on MySQL and PostgreSQL, whose collations break the range
+        with self.app.app_context():
+            for dialect in ("mysql", "postgresql"):
+                for q, expected in (("brz", ["Brz bushing", "Brzx_9 clip"]), ("brzx_9", ["Brzx_9 clip"]),
+                                    ("bolt m9", ["Bolt M9"]), ("br_", [])):
+                    names = db.session.scalars(db.select(Inventory.name).where(
+                        *search_filters(q, dialect=dialect)).order_by(Inventory.name)).all()
+                    self.assertEqual(names, expected, (dialect, q))
+
+    def test_search_inventory_rejects_bad_parameters(self):
+        for query in ("sort=cost", "match=fuzzy", "min_price=50&max_price=10", "after=abc"):
+            self.assertEqual(self.client.get("/inventory/search?" + query).status_code, 400, query)
+
+    def test_import_inventory_csv(self):
+        with self.app.app_context():
+            existing_id = Inventory.query.first().id
+        headers = {"Authorization": "Bearer " + self.get_mechanic_token(), "Content-Type": "text/csv"}
+        body = f"id,name,price\n{existing_id},Brake Pads,59.99\n,Oil Filter,9.99\n,Spark Plug,abc\n"
+        response = self.client.post("/inventory/import", data=body, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["inserted"], 1)
+        self.assertEqual(response.json["updated"], 1)
+        self.assertEqual(response.json["failed"], 1)
+        self.assertEqual(response.json["errors"][0]["row"], 3)
+        self.assertIn("price", response.json["errors"][0]["errors"])
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Inventory, existing_id).price, 59.99)
+            self.assertEqual(Inventory.query.count(), 2)
+
+    def test_import_inventory_cli_ndjson(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson", delete=False) as f:
+            f.write('{"name": "Wiper Blade", "price": 12.5}\nnot json\n')
+        try:
+            result = self.app.test_cli_runner().invoke(args=["inventory", "import", f.name, "--batch-size", "1"])
+        finally:
+            os.unlink(f.name)
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("1 inserted, 0 updated, 1 failed", result.output)
+
+    def add_part(self, token, **payload):
+        return self.client.post("/inventory/1/add-part", json={"ticket_id": 1, **payload},
+                                headers={"Authorization": f"Bearer {token}"})
+
+    def test_add_part_reserves_stock(self):
+        with self.app.app_context():
+            db.session.get(Inventory, 1).quantity = 5
+            db.session.commit()
+        token = self.get_mechanic_token()
+
+        response = self.add_part(token, quantity=2)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json["quantity"], response.json["stock"]), (2, 3))
+        response = self.add_part(token)  # Adding the part again adds to the ticket's line
+        self.assertEqual((response.json["quantity"], response.json["stock"]), (3, 2))
+        self.assertEqual(self.client.get("/inventory/1").json["quantity"], 2)
+
+    def test_add_part_insufficient_stock(self):
+        with self.app.app_context():
+            db.session.get(Inventory, 1).quantity = 1
+            db.session.commit()
+        token = self.get_mechanic_token()
+
+        response = self.add_part(token, quantity=2)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.add_part(token).status_code, 200)
+        self.assertEqual(self.add_part(token).status_code, 409)  # The last unit is gone
+        self.assertEqual(self.add_part(token, quantity=0).status_code, 400)
+        self.assertEqual(self.add_part(token, ticket_id=999).status_code, 404)
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Inventory, 1).quantity, 0)
+
+    def test_iter_records_reads_plain_streams(self):
+        class Body:  # Like gunicorn's request body: read() only
+            def __init__(self, data):
+                self.data = io.BytesIO(data)
+
+            def read(self, size=-1):
+                return self.data.read(size)
+
+        records = list(iter_records(Body(b'{"name": "Belt", "price": 20}\n'), "ndjson"))
+        self.assertEqual(records, [(1, {"name": "Belt", "price": 20})])
+
     def test_update_inventory_failure(self):
         response = self.client.put("/inventory/999", json={
             "name": "Updated Brake Pads",
@@ -1,6 +1,6 @@
 import unittest
 from app import create_app, db
-from app.models import Mechanic, ServiceTicket, Customer
+from app.models import Mechanic, ServiceTicket, Customer, MechanicTicketCount, mechanic_service_ticket
 from werkzeug.security import generate_password_hash
 from datetime import datetime, timezone
 
@@ -79,6 +79,54 @@ class TestMechanicBlueprint(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIsInstance(response.json, list)
 
+    def test_mechanic_statistics_tracks_assignments(self):
+        headers = {"Authorization": "Bearer " + self.get_mechanic_token()}
+        with self.app.app_context():
+            mechanic = Mechanic.query.first()
+            mechanic_id = mechanic.id
+            ticket_id = ServiceTicket.query.first().id
+            # Assign through the ORM relationship as well as the set-based route
+            second = ServiceTicket(VIN="2HGCM82633A654321", description="Brakes", customer_id=Customer.query.first().id)
+            second.mechanics.append(mechanic)
+            db.session.add(second)
+            db.session.commit()
+            second_id = second.id
+
+        self.client.put(f"/service-tickets/{ticket_id}/add-mechanics", json={"add_ids": [mechanic_id]})
+        response = self.client.get("/mechanics/statistics?limit=1", headers=headers)
+        self.assertEqual(response.json, [{"id": mechanic_id, "name": "Jane Doe", "ticket_count": 2}])
+
+        with self.app.app_context():
+            db.session.delete(db.session.get(ServiceTicket, second_id))
+            db.session.commit()
+        self.client.put(f"/service-tickets/{ticket_id}/add-mechanics", json={"remove_ids": [mechanic_id]})
+        response = self.client.get("/mechanics/statistics", headers=headers)
+        self.assertEqual(response.json, [])
+
+    def test_rebuild_stats_command(self):
+        with self.app.app_context():
+            ticket = ServiceTicket.query.first()
+            mechanic = Mechanic.query.first()
+            db.session.execute(mechanic_service_ticket.insert().values(
+                mechanic_id=mechanic.id, service_ticket_id=ticket.id
+            ))
+            db.session.commit()
+            result = self.app.test_cli_runner().invoke(args=["mechanic", "rebuild-stats"])
+            self.assertEqual(result.exit_code, 0)
+            self.assertEqual(db.session.get(MechanicTicketCount, mechanic.id).ticket_count, 1)
+
+    def test_mechanic_statistics_limit_is_clamped(self):
+        headers = {"Authorization": "Bearer " + self.get_mechanic_token()}
+        with self.app.app_context():
+            ticket = ServiceTicket.query.first()
+            ticket.mechanics.extend([Mechanic.query.first(), Mechanic(
+                name="Sam Roe", email="sam@example.com", phone="5550001111", salary=40000, password_hash="x")])
+            db.session.commit()
+        for limit in (0, -1):  # At least one row, as on by-VIN; 0 used to mean unbounded
+            response = self.client.get(f"/mechanics/statistics?limit={limit}", headers=headers)
+            self.assertEqual((response.status_code, len(response.json)), (200, 1))
+        self.assertEqual(len(self.client.get("/mechanics/statistics", headers=headers).json), 2)
+
     def test_mechanic_statistics_unauthorized(self):
         response = self.client.get("/mechanics/statistics")  # No Authorization header
         self.assertEqual(response.status_code, 401)
@@ -92,6 +140,46 @@ class TestMechanicBlueprint(unittest.TestCase):
         self.assertEqual(response.json[0]["name"], "Jane Doe")
 
 
+    def test_get_mechanics_sparse_fields(self):
+        with self.app.app_context():
+            statements = []
+            db.event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        response = self.client.get("/mechanics/?fields=id,name")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, [{"id": 1, "name": "Jane Doe"}])
+        self.assertNotIn("password_hash", statements[-1])  # Only the requested columns are selected
+
+        response = self.client.get("/mechanics/?fields=name,password")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json["message"], "Unknown fields: password")
+
+    def test_password_hash_is_never_returned(self):
+        responses = [self.client.get("/mechanics/1"), self.client.get("/mechanics/"),
+                     self.client.get("/mechanics/?stream=ndjson"),
+                     self.client.put("/mechanics/1", json={"name": "Jane Doe", "email": "jane@example.com",
+                                                           "phone": "5550001111", "salary": 60000})]
+        for response in responses:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn(b"password_hash", response.data)
+        response = self.client.get("/mechanics/1?fields=password_hash")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.put("/mechanics/1", json={"name": "Jane Doe", "email": "jane@example.com",
+                                                         "phone": "5550001111", "salary": 1, "password_hash": "forged"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_mechanic_detail(self):
+        response = self.client.get("/mechanics/1?fields=email")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {"email": "mechanic@example.com"})
+        self.assertEqual(self.client.get("/mechanics/1").json["salary"], 50000.0)
+        self.assertEqual(self.client.get("/mechanics/99").status_code, 404)
+
+    def test_get_mechanics_stream(self):
+        response = self.client.get("/mechanics/", headers={"Accept": "application/x-ndjson"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        self.assertEqual(len(response.get_data(as_text=True).splitlines()), 1)
+
     def test_update_mechanic_failure(self):
         response = self.client.put("/mechanics/999", json={
             "name": "Jane Updated",
@@ -0,0 +1,72 @@
+import json
+import tempfile
+import unittest
+from app import create_app, db
+from app.models import Inventory
+from app.instrumentation.metrics import MetricsRegistry, LATENCY_BUCKETS
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            db.session.add(Inventory(name="Brake Pads", price=49.99))
+            db.session.commit()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_metrics_exposes_request_and_sql_counts(self):
+        self.client.get("/inventory/")
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        body = response.get_data(as_text=True)
+        self.assertIn('http_requests_total{endpoint="inventory.get_inventories",method="GET",status="200"} 1', body)
+        self.assertIn('http_request_duration_seconds_count{endpoint="inventory.get_inventories",method="GET"} 1', body)
+        self.assertIn('http_request_sql_statements_bucket{endpoint="inventory.get_inventories",le="1"} 1', body)
+        self.assertIn("# TYPE http_request_duration_seconds histogram", body)
+
+    def test_server_timing_header_is_opt_in(self):
+        self.app.config["PROFILING_ENABLED"] = True
+        self.assertNotIn("Server-Timing", self.client.get("/inventory/").headers)
+
+        response = self.client.get("/inventory/", headers={"X-Profile": "1"})
+        timing = response.headers["Server-Timing"]
+        for phase in ("serialize;dur=", "db;dur=", 'desc="1 queries"', "total;dur="):
+            self.assertIn(phase, timing)
+
+    def test_slow_query_logged_with_plan(self):
+        self.app.config["SLOW_QUERY_THRESHOLD_MS"] = 0
+        try:
+            with self.assertLogs("app.slow_query", level="WARNING") as logs:
+                self.client.get("/inventory/")
+        finally:
+            self.app.config["SLOW_QUERY_THRESHOLD_MS"] = None
+        self.assertIn("FROM inventory", logs.output[0])
+        self.assertIn("Plan:", logs.output[0])
+        self.assertIn("SCAN inventory", logs.output[0])
+
+    def test_workers_aggregate_through_shared_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first, second = MetricsRegistry(directory), MetricsRegistry(directory)
+            labels = (("endpoint", "x"), ("method", "GET"))
+            first.observe("http_request_duration_seconds", labels, 0.02, LATENCY_BUCKETS)
+            first.flush()
+            # Stand in for a second worker process writing its own file
+            second.observe("http_request_duration_seconds", labels, 0.2, LATENCY_BUCKETS)
+            snapshot = second.snapshot()
+            snapshot["pid"] = -1
+            with open(f"{directory}/metrics-other.json", "w") as f:
+                json.dump(snapshot, f)
+            body = first.render()
+        self.assertIn('http_request_duration_seconds_count{endpoint="x",method="GET"} 2', body)
+        self.assertIn('http_request_duration_seconds_bucket{endpoint="x",method="GET",le="0.025"} 1', body)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from sqlalchemy import exc
+from app import create_app, db, pooling
+from config import TestingConfig
+
+
+class PooledTestingConfig(TestingConfig):
+    SQLALCHEMY_ENGINE_OPTIONS = {"pool_size": 2, "max_overflow": 0, "pool_timeout": 0.1}
+
+
+class TestPooling(unittest.TestCase):
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        PooledTestingConfig.SQLALCHEMY_DATABASE_URI = f"sqlite:///{self.db_path}"
+        self.app = create_app(PooledTestingConfig)
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        os.unlink(self.db_path)
+
+    def test_uses_instrumented_pool_and_reports_stats(self):
+        with self.app.app_context():
+            self.assertIsInstance(db.engine.pool, pooling.InstrumentedQueuePool)
+            first, second = db.engine.connect(), db.engine.connect()
+            with self.assertRaises(exc.TimeoutError):
+                db.engine.connect()
+            stats = pooling.pool_stats(self.app, db)["default"]
+            first.close()
+            second.close()
+        self.assertEqual(stats["checked_out"], 2)
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertGreater(stats["wait_seconds"], 0)
+
+        body = self.app.test_client().get("/metrics").get_data(as_text=True)
+        self.assertIn('db_pool_timeouts_total{bind="default"} 1', body)
+
+    def test_dispose_after_fork_replaces_pool(self):
+        with self.app.app_context():
+            pooling.warm(self.app, db, connections=2)
+            pool = db.engine.pool
+            self.assertEqual(pool.checkedin(), 2)
+            pooling.dispose_after_fork()
+            self.assertIsNot(db.engine.pool, pool)
+            self.assertEqual(db.engine.pool.checkedin(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
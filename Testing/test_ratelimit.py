@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, MovingWindowRateLimiter
+from app import create_app
+from app.ratelimit_storage import SQLiteStorage
+from config import TestingConfig
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.uri = "sqlite:///" + os.path.join(self.directory, "ratelimit.db")
+        # Two storages on one file stand in for two gunicorn workers
+        self.first = storage_from_string(self.uri)
+        self.second = storage_from_string(self.uri)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_registered_for_sqlite_uris(self):
+        self.assertIsInstance(self.first, SQLiteStorage)
+        self.assertTrue(self.first.check())
+
+    def test_fixed_window_is_shared(self):
+        limit = parse("3 per minute")
+        first, second = FixedWindowRateLimiter(self.first), FixedWindowRateLimiter(self.second)
+        self.assertTrue(first.hit(limit, "login", "1.2.3.4"))
+        self.assertTrue(second.hit(limit, "login", "1.2.3.4"))
+        self.assertTrue(first.hit(limit, "login", "1.2.3.4"))
+        self.assertFalse(second.hit(limit, "login", "1.2.3.4"))
+        self.assertTrue(second.hit(limit, "login", "5.6.7.8"))
+        self.assertEqual(first.get_window_stats(limit, "login", "1.2.3.4").remaining, 0)
+
+    def test_fixed_window_expires(self):
+        self.assertEqual(self.first.incr("key", expiry=0.05), 1)
+        self.assertEqual(self.second.incr("key", expiry=0.05), 2)
+        time.sleep(0.1)
+        self.assertEqual(self.first.get("key"), 0)
+        self.assertEqual(self.second.incr("key", expiry=60), 1)
+
+    def test_moving_window_is_shared(self):
+        limit = parse("2 per second")
+        first, second = MovingWindowRateLimiter(self.first), MovingWindowRateLimiter(self.second)
+        self.assertTrue(first.hit(limit, "login"))
+        self.assertTrue(second.hit(limit, "login"))
+        self.assertFalse(first.hit(limit, "login"))
+        self.assertEqual(second.get_window_stats(limit, "login").remaining, 0)
+        time.sleep(1.05)
+        self.assertTrue(second.hit(limit, "login"))
+
+    def test_clear_and_reset(self):
+        self.first.incr("a", 60)
+        self.first.acquire_entry("b", 5, 60)
+        self.second.clear("a")
+        self.assertEqual(self.first.get("a"), 0)
+        self.assertEqual(self.second.reset(), 1)
+        self.assertEqual(self.first.get_moving_window("b", 5, 60)[1], 0)
+
+
+class SharedLimitConfig(TestingConfig):
+    RATELIMIT_STRATEGY = "moving-window"
+
+
+class TestSharedLoginLimit(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        SharedLimitConfig.RATELIMIT_STORAGE_URI = "sqlite:///" + os.path.join(self.directory, "ratelimit.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_login_limit_holds_across_workers(self):
+        workers = [create_app(SharedLimitConfig) for _ in range(2)]
+        codes = [workers[attempt % 2].test_client().post("/customers/login", json={}).status_code
+                 for attempt in range(6)]
+        self.assertNotIn(429, codes[:5])
+        self.assertEqual(codes[5], 429)
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from flask import g
+from app import create_app, db
+from app.extensions import cache
+from app.models import Customer, Inventory
+from app.replicas import read_only
+from config import TestingConfig
+
+
+class TestReplicas(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+        self.directory.cleanup()
+
+    def make_app(self, replica_path):
+        class ReplicaConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(self.directory.name, "primary.db")
+            SQLALCHEMY_REPLICA_URIS = ["sqlite:///" + replica_path]
+            DB_REPLICA_RETRY_SECONDS = 60
+        self.app = create_app(ReplicaConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.session.add(Inventory(name="Primary part", price=10))
+            db.session.commit()
+
+    def make_replica(self):
+        # A second file standing in for a replica that has only replicated a different row
+        path = os.path.join(self.directory.name, "replica.db")
+        self.make_app(path)
+        with self.app.app_context():
+            engine = db.engines["replica_1"]
+            db.metadata.create_all(engine)
+            with engine.begin() as connection:
+                connection.execute(db.insert(Inventory).values(name="Replica part", price=20))
+
+    def test_read_only_routes_use_the_replica_and_writes_the_primary(self):
+        self.make_replica()
+        self.assertEqual([item["name"] for item in self.client.get("/inventory/").json], ["Replica part"])
+        response = self.client.post("/inventory/", json={"name": "New part", "price": 5})
+        self.assertEqual(response.status_code, 201)
+        with self.app.app_context():
+            self.assertEqual(db.session.scalar(db.select(db.func.count()).select_from(Inventory)), 2)
+        self.assertEqual(len(self.client.get("/inventory/").json), 1)  # Not replicated yet
+
+    def test_cached_customer_total_is_counted_on_the_primary(self):
+        self.make_replica()  # The replica hasn't seen any customers yet
+        with self.app.app_context():
+            db.session.add(Customer(name="Rush", email="rush@example.com", phone="1", password_hash="x"))
+            db.session.commit()
+        response = self.client.get("/customers/")
+        self.assertEqual((response.json["customers"], response.json["total"]), ([], 1))
+        with self.app.app_context():
+            self.assertEqual(cache.get("customers:total"), 1)
+
+    def test_request_sticks_to_the_primary_after_a_write(self):
+        self.make_replica()
+
+        @read_only
+        def view():
+            names = [db.session.scalar(db.select(Inventory.name))]
+            db.session.add(Inventory(name="Written", price=1))
+            db.session.flush()
+            names.append(db.session.scalars(db.select(Inventory.name).order_by(Inventory.id)).all())
+            db.session.rollback()
+            return names
+
+        with self.app.test_request_context():
+            self.assertEqual(view(), ["Replica part", ["Primary part", "Written"]])
+            self.assertTrue(g.db_primary)
+
+    def test_failed_replica_falls_back_to_the_primary(self):
+        self.make_app(os.path.join(self.directory.name, "missing", "replica.db"))  # Cannot be opened
+        with self.assertLogs(self.app.logger, "WARNING"):
+            response = self.client.get("/inventory/")
+        self.assertEqual([item["name"] for item in response.json], ["Primary part"])
+        self.assertIsNone(self.app.extensions["replicas"].choose())  # Skipped until the retry interval passes
+        self.assertEqual(self.client.get("/mechanics/").status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
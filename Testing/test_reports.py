@@ -0,0 +1,109 @@
+import unittest
+from datetime import date, datetime
+from app import create_app, db
+from app.auth.utils import encode_mechanic_token
+from app.blueprints.reports.rollups import backfill_rollups
+from app.models import (Customer, Inventory, Mechanic, MechanicReportDay, ServiceTicket, TicketReportDay,
+                        mechanic_service_ticket)
+
+
+class TestReports(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            db.session.add(Customer(name="Rush", email="rush@example.com", phone="1", password_hash="x"))
+            db.session.add_all([Mechanic(name=name, email=f"{name}@example.com", phone=name, salary=1, password_hash="x")
+                                for name in ("Ann", "Bob")])
+            db.session.add_all([Inventory(name="Brake Pads", price=50, quantity=20),
+                                Inventory(name="Oil Filter", price=10, quantity=20)])
+            db.session.add_all([
+                ServiceTicket(VIN="A", description="x", customer_id=1, service_date=datetime(2024, 1, 1, 9)),  # Monday
+                ServiceTicket(VIN="B", description="x", customer_id=1, service_date=datetime(2024, 1, 3, 17)),
+                ServiceTicket(VIN="C", description="x", customer_id=1, service_date=datetime(2024, 1, 8, 12)),
+            ])
+            db.session.commit()
+            self.headers = {"Authorization": f"Bearer {encode_mechanic_token(1)}"}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def rollups(self):
+        with self.app.app_context():
+            return (sorted((r.day, r.ticket_count, r.parts_units, r.parts_revenue) for r in TicketReportDay.query),
+                    sorted((r.day, r.mechanic_id, r.ticket_count) for r in MechanicReportDay.query))
+
+    def write_activity(self):
+        self.client.post("/service-tickets/1/parts", json={"parts": [{"inventory_id": 1, "quantity": 2},
+                                                                     {"inventory_id": 2}]}, headers=self.headers)
+        self.client.post("/inventory/2/add-part", json={"ticket_id": 2, "quantity": 3}, headers=self.headers)
+        self.client.post("/service-tickets/3/parts", json={"parts": [{"inventory_id": 1}]}, headers=self.headers)
+        self.client.put("/service-tickets/1/add-mechanics", json={"add_ids": [1, 2]})
+        self.client.put("/service-tickets/2/add-mechanics", json={"add_ids": [1]})
+        self.client.put("/service-tickets/1/add-mechanics", json={"remove_ids": [2]})
+        with self.app.app_context():
+            ticket = db.session.get(ServiceTicket, 3)
+            ticket.mechanics.append(db.session.get(Mechanic, 2))  # Through the ORM relationship
+            db.session.commit()
+            db.session.delete(db.session.get(ServiceTicket, 2))
+            db.session.commit()
+
+    def test_incremental_rollups_match_backfill(self):
+        self.write_activity()
+        incremental = self.rollups()
+        self.assertEqual(incremental[0], [
+            (date(2024, 1, 1), 1, 3, 110.0), (date(2024, 1, 3), 0, 0, 0.0), (date(2024, 1, 8), 1, 1, 50.0)])
+        with self.app.app_context():
+            backfill_rollups()
+        rebuilt = self.rollups()
+        # A backfill has no rows for emptied days
+        self.assertEqual([row for row in incremental[0] if row[1] or row[2]], rebuilt[0])
+        self.assertEqual([row for row in incremental[1] if row[2]], rebuilt[1])
+
+    def test_deleting_a_part_removes_its_lines(self):
+        self.write_activity()
+        self.assertEqual(self.client.delete("/inventory/1").status_code, 200)
+        incremental = self.rollups()
+        self.assertEqual(incremental[0], [
+            (date(2024, 1, 1), 1, 1, 10.0), (date(2024, 1, 3), 0, 0, 0.0), (date(2024, 1, 8), 1, 0, 0.0)])
+        with self.app.app_context():
+            backfill_rollups()
+        self.assertEqual([row for row in incremental[0] if row[1] or row[2]], self.rollups()[0])
+
+    def test_ticket_report_periods(self):
+        self.write_activity()
+        response = self.client.get("/reports/tickets?period=week", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, [
+            {"period": "2024-01-01", "tickets": 1, "parts_units": 3, "parts_revenue": 110.0},
+            {"period": "2024-01-08", "tickets": 1, "parts_units": 1, "parts_revenue": 50.0},
+        ])
+        response = self.client.get("/reports/tickets?period=month&start=2024-01-02", headers=self.headers)
+        self.assertEqual(response.json, [{"period": "2024-01-01", "tickets": 1, "parts_units": 1, "parts_revenue": 50.0}])
+        self.assertEqual(self.client.get("/reports/tickets?period=year", headers=self.headers).status_code, 400)
+        self.assertEqual(self.client.get("/reports/tickets?start=soon", headers=self.headers).status_code, 400)
+
+    def test_mechanic_report(self):
+        self.write_activity()
+        response = self.client.get("/reports/mechanics?period=month", headers=self.headers)
+        self.assertEqual(response.json, [
+            {"period": "2024-01-01", "mechanic_id": 1, "name": "Ann", "tickets": 1},
+            {"period": "2024-01-01", "mechanic_id": 2, "name": "Bob", "tickets": 1},
+        ])
+
+    def test_backfill_cli_range(self):
+        with self.app.app_context():
+            db.session.execute(mechanic_service_ticket.insert().values(mechanic_id=1, service_ticket_id=3))
+            db.session.execute(TicketReportDay.__table__.delete())
+            db.session.commit()
+        result = self.app.test_cli_runner().invoke(args=["reports", "backfill", "--start", "2024-01-08"])
+        self.assertIn("rebuilt", result.output)
+        self.assertEqual(self.rollups(), ([(date(2024, 1, 8), 1, 0, 0.0)], [(date(2024, 1, 8), 1, 1)]))
+
+
+if __name__ == "__main__":
+    unittest.main()
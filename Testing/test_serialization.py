@@ -0,0 +1,84 @@
+import json
+import unittest
+from datetime import datetime
+from marshmallow import Schema, fields
+from app import create_app, db
+from app.models import Customer, Inventory, Mechanic, ServiceTicket
+from app.serialization import RowDumper
+from app.blueprints.customers.schemas import customers_schema, customers_row_dumper
+from app.blueprints.mechanic.schemas import mechanics_schema, mechanics_row_dumper
+from app.blueprints.inventory.schemas import inventories_schema, inventories_row_dumper
+from app.blueprints.service_ticket.schemas import service_tickets_schema, service_tickets_row_dumper
+
+
+class TestRowDumper(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            customer = Customer(name="Zoë", email="zoe@example.com", phone="555", password_hash="x")
+            db.session.add_all([
+                customer,
+                Mechanic(name="Jane", email="jane@example.com", phone="1", salary=50000, password_hash="h"),
+                Mechanic(name="Joe", email="joe@example.com", phone="2", salary=41250.5, password_hash="h"),
+            ])
+            parts = [Inventory(name="Brake Pads", price=49.99), Inventory(name="Filter", price=10)]
+            db.session.add_all(parts)
+            db.session.flush()
+            db.session.add_all([
+                ServiceTicket(VIN="VIN1", description="Brakes", service_date=datetime(2024, 5, 1, 9, 30, 15, 250),
+                              customer_id=customer.id, inventory_items=[parts[1], parts[0]]),
+                ServiceTicket(VIN="VIN2", description="Check", service_date=datetime(2024, 5, 2),
+                              customer_id=customer.id),
+            ])
+            db.session.commit()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def assertSameBytes(self, schema, dumper, model):
+        with self.app.app_context():
+            expected = schema.dump(model.query.order_by(model.id).all())
+            actual = dumper.dump(db.session.execute(dumper.select().order_by(model.id)))
+            db.session.expire_all()
+        self.assertEqual(json.dumps(actual), json.dumps(expected))  # Key order and value types too
+        self.assertEqual(self.app.json.dumps(actual), self.app.json.dumps(expected))
+
+    def test_matches_marshmallow_byte_for_byte(self):
+        self.assertSameBytes(customers_schema, customers_row_dumper, Customer)
+        self.assertSameBytes(mechanics_schema, mechanics_row_dumper, Mechanic)
+        self.assertSameBytes(inventories_schema, inventories_row_dumper, Inventory)
+        self.assertSameBytes(service_tickets_schema, service_tickets_row_dumper, ServiceTicket)
+
+    def test_nested_items_use_one_query(self):
+        with self.app.app_context():
+            statements = []
+            db.event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+            tickets = service_tickets_row_dumper.dump(db.session.execute(service_tickets_row_dumper.select()))
+        self.assertEqual(len(statements), 2)
+        self.assertEqual([item["name"] for item in tickets[0]["inventory_items"]], ["Brake Pads", "Filter"])
+        self.assertEqual(tickets[1]["inventory_items"], [])
+
+    def test_refuses_fields_it_cannot_reproduce(self):
+        class CustomSchema(Schema):
+            id = fields.Int()
+            label = fields.Method("make_label")
+
+            def make_label(self, obj):
+                return f"#{obj.id}"
+
+        with self.app.app_context(), self.assertRaises(TypeError):
+            RowDumper(CustomSchema(many=True), Customer).columns
+
+    def test_list_endpoints_serve_rows(self):
+        client = self.app.test_client()
+        response = client.get("/inventory/")
+        self.assertEqual(response.json, [
+            {"id": 1, "name": "Brake Pads", "price": 49.99, "quantity": 0},
+            {"id": 2, "name": "Filter", "price": 10.0, "quantity": 0},
+        ])
+        self.assertIn(b'"price": 10.0', response.data)
+        self.assertEqual(client.get("/customers/?limit=5").json["customers"][0]["name"], "Zoë")
@@ -1,6 +1,6 @@
 import unittest
 from app import create_app, db
-from app.models import Customer, ServiceTicket, Mechanic
+from app.models import Customer, Inventory, ServiceTicket, Mechanic
 from werkzeug.security import generate_password_hash
 from datetime import datetime, timezone
 
@@ -67,11 +67,119 @@ class TestServiceTicketBlueprint(unittest.TestCase):
         self.assertIn("message", response.json)
         self.assertEqual(response.json["message"], "Service ticket created successfully")
 
-   
+    def get_mechanic_token(self):
+        """Helper method to log in and retrieve a mechanic token."""
+        response = self.client.post("/mechanics/login", json={
+            "email": "mechanic@example.com",
+            "password": "password123"
+        })
+        self.assertEqual(response.status_code, 200)
+        return response.json["token"]
+
+    def test_get_service_tickets_by_vin(self):
+        with self.app.app_context():
+            db.session.add(ServiceTicket(
+                VIN="1HGCM82633A123456",
+                description="Tire rotation",
+                customer_id=Customer.query.first().id,
+                service_date=datetime(2020, 1, 1)
+            ))
+            db.session.commit()
+        headers = {"Authorization": "Bearer " + self.get_mechanic_token()}
+        response = self.client.get("/service-tickets/by-vin/1hgcm82633a123456", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([ticket["description"] for ticket in response.json], ["Oil change", "Tire rotation"])
+
+        response = self.client.get("/service-tickets/by-vin/1HGCM82633A123456")
+        self.assertEqual(response.status_code, 401)
+
+    def test_lowercase_vins_are_found_by_vin(self):
+        headers = {"Authorization": "Bearer " + self.get_token()}
+        self.client.post("/service-tickets/", json={"VIN": "5yjsa1e26hf000337", "description": "Alignment"},
+                         headers=headers)
+        self.client.post("/customers/create-ticket", json={"VIN": "5YJsa1e26hf000337", "description": "Wipers"},
+                         headers=headers)
+        self.client.put("/service-tickets/1", json={"VIN": "5yjSA1E26HF000337"}, headers=headers)
+        response = self.client.get("/service-tickets/by-vin/5yjsa1e26hf000337",
+                                   headers={"Authorization": "Bearer " + self.get_mechanic_token()})
+        self.assertEqual(sorted(ticket["description"] for ticket in response.json), ["Alignment", "Oil change", "Wipers"])
+        self.assertEqual({ticket["VIN"] for ticket in response.json}, {"5YJSA1E26HF000337"})
+
+    def test_add_mechanics_to_service_ticket(self):
+        with self.app.app_context():
+            mechanic_id = Mechanic.query.first().id
+            ticket_id = ServiceTicket.query.first().id
+
+        response = self.client.put(f"/service-tickets/{ticket_id}/add-mechanics", json={
+            "add_ids": [mechanic_id, 999]
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["added"], {str(mechanic_id): "added", "999": "unknown"})
 
-   
+        response = self.client.put(f"/service-tickets/{ticket_id}/add-mechanics", json={
+            "add_ids": [mechanic_id]
+        })
+        self.assertEqual(response.json["added"], {str(mechanic_id): "already_present"})
+
+        response = self.client.put(f"/service-tickets/{ticket_id}/add-mechanics", json={
+            "remove_ids": [mechanic_id]
+        })
+        self.assertEqual(response.json["removed"], {str(mechanic_id): "removed"})
+        with self.app.app_context():
+            self.assertEqual(db.session.get(ServiceTicket, ticket_id).mechanics, [])
+
+    def test_add_mechanics_invalid_ids(self):
+        with self.app.app_context():
+            ticket_id = ServiceTicket.query.first().id
+        response = self.client.put(f"/service-tickets/{ticket_id}/add-mechanics", json={
+            "add_ids": ["abc"]
+        })
+        self.assertEqual(response.status_code, 400)
+        response = self.client.put(f"/service-tickets/{ticket_id}/add-mechanics", json={"add_ids": [True]})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.put(f"/service-tickets/{ticket_id}/add-mechanics", json=[1])
+        self.assertEqual(response.status_code, 400)
+
+    def add_stock(self):
+        with self.app.app_context():
+            db.session.add_all([Inventory(name="Brake Pads", price=49.99, quantity=10),
+                                Inventory(name="Oil Filter", price=9.5, quantity=2)])
+            db.session.commit()
+
+    def test_add_parts_and_total(self):
+        self.add_stock()
+        headers = {"Authorization": "Bearer " + self.get_mechanic_token()}
+        response = self.client.post("/service-tickets/1/parts", json={"parts": [
+            {"inventory_id": 1, "quantity": 2}, {"inventory_id": 2}, {"inventory_id": 99}
+        ]}, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["parts"], {"1": "added", "2": "added", "99": "unknown"})
+
+        response = self.client.post("/service-tickets/1/parts", json={"parts": [{"inventory_id": 1}]}, headers=headers)
+        self.assertEqual(response.json["parts"], {"1": "increased"})
+        response = self.client.get("/service-tickets/1/total", headers=headers)
+        self.assertEqual(response.json, {"ticket_id": 1, "total": 159.47, "items": 4})
+        with self.app.app_context():
+            self.assertEqual([db.session.get(Inventory, n).quantity for n in (1, 2)], [7, 1])
+
+    def test_add_parts_insufficient_stock_reserves_nothing(self):
+        self.add_stock()
+        headers = {"Authorization": "Bearer " + self.get_mechanic_token()}
+        response = self.client.post("/service-tickets/1/parts", json={"parts": [
+            {"inventory_id": 1, "quantity": 3}, {"inventory_id": 2, "quantity": 3}
+        ]}, headers=headers)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json["insufficient"], {"2": {"requested": 3, "available": 2}})
+        with self.app.app_context():
+            self.assertEqual([db.session.get(Inventory, n).quantity for n in (1, 2)], [10, 2])
+        self.assertEqual(self.client.get("/service-tickets/1/total", headers=headers).json["total"], 0)
+        self.assertEqual(self.client.get("/service-tickets/9/total", headers=headers).status_code, 404)
+        response = self.client.post("/service-tickets/1/parts", json={"parts": [{"inventory_id": "1"}]}, headers=headers)
+        self.assertEqual(response.status_code, 400)
+        for body in ([{"inventory_id": 1}], "parts", 3):  # Not an object
+            response = self.client.post("/service-tickets/1/parts", json=body, headers=headers)
+            self.assertEqual(response.status_code, 400, body)
 
-    
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from app import create_app, db
+from app.extensions import cache
+from app.blueprints.mechanic.leaderboard import rebuild_ticket_counts
+from app.blueprints.reports.rollups import backfill_rollups
+from app.transfer import export_data, import_data
+from app.models import Customer, Inventory, Mechanic, ServiceTicket, inventory_service_ticket, mechanic_service_ticket
+from config import TestingConfig
+
+
+def file_config(path):
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + path
+    return FileConfig
+
+
+class TestTransfer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.dump = os.path.join(self.directory.name, "dump.ndjson.gz")
+        self.source = create_app(file_config(os.path.join(self.directory.name, "source.db")))
+        self.target = create_app(file_config(os.path.join(self.directory.name, "target.db")))
+        with self.source.app_context():
+            db.session.add(Customer(name="Rush", email="rush@example.com", phone="1", password_hash="x"))
+            db.session.add(Mechanic(name="Ann", email="ann@example.com", phone="2", salary=1.5, password_hash="y"))
+            db.session.add(Inventory(name="Brake Pads", price=49.99, quantity=7))
+            db.session.add_all([ServiceTicket(VIN=f"VIN{n}", description="Ünïcode", customer_id=1,
+                                              service_date=datetime(2024, 1, n, 9, 30)) for n in range(1, 6)])
+            db.session.commit()
+            db.session.execute(inventory_service_ticket.insert(), [
+                {"inventory_id": 1, "service_ticket_id": n, "quantity": n} for n in range(1, 6)])
+            db.session.execute(mechanic_service_ticket.insert().values(mechanic_id=1, service_ticket_id=2))
+            db.session.commit()
+            rebuild_ticket_counts()
+            backfill_rollups()
+
+    def tearDown(self):
+        for app in (self.source, self.target):
+            with app.app_context():
+                db.session.remove()
+                db.engine.dispose()
+        self.directory.cleanup()
+
+    def snapshot(self, app):
+        with app.app_context():
+            return {table.name: db.session.execute(db.select(table).order_by(*table.primary_key.columns)).all()
+                    for table in db.metadata.sorted_tables}
+
+    def test_round_trip_copies_every_table(self):
+        result = self.source.test_cli_runner().invoke(args=["export", self.dump, "--batch-size", "2"])
+        self.assertIn("Exported", result.output)
+        result = self.target.test_cli_runner().invoke(args=["import", self.dump, "--batch-size", "2"])
+        self.assertEqual(result.exit_code, 0, result.output)
+
+        expected = self.snapshot(self.source)
+        self.assertEqual(len(expected["service_tickets"]), 5)
+        self.assertTrue(expected["report_ticket_days"])
+        self.assertEqual(self.snapshot(self.target), expected)
+
+        # New rows continue after the imported ids
+        with self.target.app_context():
+            db.session.add(ServiceTicket(VIN="NEW", description="x", customer_id=1))
+            db.session.commit()
+            self.assertEqual(db.session.scalar(db.select(db.func.max(ServiceTicket.id))), 6)
+
+    def test_export_reads_keyset_batches(self):
+        statements = []
+        with self.source.app_context():
+            db.event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+            export_data(self.dump, batch_size=2)
+        lines = [statement for statement in statements if "FROM inventory_service_ticket" in statement]
+        self.assertEqual(len(lines), 3)  # 2 + 2 + 1 of the five part lines
+        self.assertTrue(all("LIMIT" in statement for statement in lines))
+        self.assertIn("inventory_service_ticket.inventory_id =", lines[1])  # Composite key: (1, 2) < (1, 3)
+        with self.target.app_context():
+            self.assertEqual(import_data(self.dump, batch_size=2)["inventory_service_ticket"], 5)
+
+    def test_export_is_one_snapshot(self):
+        with self.source.app_context():
+            db.session.execute(db.text("PRAGMA journal_mode=WAL"))  # Lets a writer commit while the export reads
+            db.session.commit()
+            expected = {table.name: db.session.scalar(db.select(db.func.count()).select_from(table))
+                        for table in db.metadata.sorted_tables}
+            writer = db.create_engine(db.engine.url)
+
+            def write_during_export(conn, cursor, statement, *args):
+                if "FROM customers" in statement and not writer.pool.checkedin():
+                    with writer.begin() as connection:  # A new ticket with a part line, mid-export
+                        ticket_id = connection.execute(db.insert(ServiceTicket).values(
+                            VIN="LATE", description="x", customer_id=1, service_date=datetime(2024, 2, 1))
+                        ).inserted_primary_key[0]
+                        connection.execute(inventory_service_ticket.insert().values(
+                            inventory_id=1, service_ticket_id=ticket_id))
+
+            db.event.listen(db.engine, "after_cursor_execute", write_during_export)
+            try:
+                self.assertEqual(export_data(self.dump), expected)
+            finally:
+                db.event.remove(db.engine, "after_cursor_execute", write_during_export)
+                writer.dispose()
+            self.assertEqual(db.session.scalar(db.select(db.func.count()).select_from(ServiceTicket)), 6)
+        with self.target.app_context():
+            self.assertEqual(import_data(self.dump), expected)
+
+    def test_import_refuses_non_empty_tables_unless_replacing(self):
+        self.source.test_cli_runner().invoke(args=["export", self.dump])
+        result = self.source.test_cli_runner().invoke(args=["import", self.dump])
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("not empty", result.output)
+
+        expected = self.snapshot(self.source)
+        with self.source.app_context():
+            cache.set("customers:total", 99)
+        result = self.source.test_cli_runner().invoke(args=["import", self.dump, "--replace"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(self.snapshot(self.source), expected)
+        with self.source.app_context():
+            self.assertIsNone(cache.get("customers:total"))  # Pre-import cache entries are gone
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,40 +1,67 @@
 from flask import Flask
-from app.extensions import db, ma, limiter, cache, migrate  
-from app.blueprints.customers import customers_bp
-from app.blueprints.mechanic import mechanics_bp
-from app.blueprints.service_ticket import service_ticket_bp
-from app.blueprints.inventory import inventory_bp
-from flask_swagger_ui import get_swaggerui_blueprint
+from app.extensions import db, ma, limiter, cache, password_hasher
+from app import instrumentation, pooling, replicas, serialization
+from app.group_commit import group_committer
 from dotenv import load_dotenv
-import os
 
-# Load environment variables from .env file
-load_dotenv()
 
 def create_app(config_class="config.ProductionConfig"):
+    # Load environment variables from .env file before the config class reads them
+    load_dotenv()
+
     app = Flask(__name__, static_folder='static')  # Ensure Flask serves the Static folder
     app.config.from_object(config_class)
   
     # Initialize extensions
+    pooling.configure(app)
+    replicas.configure(app)  # SQLALCHEMY_REPLICA_URIS become replica_<n> binds
     db.init_app(app)
+    replicas.init_app(app, db)
     ma.init_app(app)
-    cache.init_app(app, config={"CACHE_TYPE": "SimpleCache"})
+    cache.init_app(app)  # Backend comes from the config class (CACHE_TYPE, CACHE_DIR, ...)
     limiter.init_app(app)
-    migrate.init_app(app, db)  
+    if app.config.get("MIGRATE_ENABLED", True):
+        # Alembic is only needed by `flask db`; gunicorn workers skip importing it
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    password_hasher.init_app(app)
+    serialization.init_app(app)  # ?fields= errors become 400s
+
+    metrics_view = instrumentation.init_app(app)
+    if metrics_view is not None:
+        limiter.exempt(metrics_view)  # Scrapers must never be rate limited
+    pooling.init_app(app, db)
+    group_committer.init_app(app)  # After instrumentation so batch sizes reach /metrics
 
-    with app.app_context():
-        db.create_all()
+    # Imported here so that `import app` (migrations, CLI, workers before create_app) stays cheap
+    from app.blueprints.customers import customers_bp
+    from app.blueprints.mechanic import mechanics_bp
+    from app.blueprints.service_ticket import service_ticket_bp
+    from app.blueprints.inventory import inventory_bp
+    from app.blueprints.reports import reports_bp
+    from app.transfer import export_command, import_command
+
+    # Production relies on `flask db upgrade`; introspecting the schema on every worker boot is wasted work
+    if app.config.get("DB_CREATE_ALL", True):
+        with app.app_context():
+            db.create_all()
 
     # Register blueprints
     app.register_blueprint(customers_bp, url_prefix="/customers")
     app.register_blueprint(mechanics_bp, url_prefix="/mechanics")
     app.register_blueprint(service_ticket_bp, url_prefix="/service-tickets")
     app.register_blueprint(inventory_bp, url_prefix="/inventory")
+    app.register_blueprint(reports_bp, url_prefix="/reports")
+
+    app.cli.add_command(export_command)  # flask export / flask import: whole-database snapshots
+    app.cli.add_command(import_command)
 
     # Swagger UI setup
-    SWAGGER_URL = '/swagger'
-    API_URL = '/static/swagger.yaml'  
-    swaggerui_blueprint = get_swaggerui_blueprint(SWAGGER_URL, API_URL)
-    app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL)
+    if app.config.get("SWAGGER_UI_ENABLED", True):
+        from flask_swagger_ui import get_swaggerui_blueprint
+        SWAGGER_URL = '/swagger'
+        API_URL = '/static/swagger.yaml'  
+        swaggerui_blueprint = get_swaggerui_blueprint(SWAGGER_URL, API_URL)
+        app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL)
 
     return app
\ No newline at end of file
@@ -1,6 +1,7 @@
 from functools import wraps
-from flask import request, jsonify
-from jose import jwt
+from flask import request, jsonify, g
+from app.auth.token_cache import verified_tokens
+from app.instrumentation.profiling import span
 from app.extensions import db
 from app.models import Customer
 
@@ -15,13 +16,15 @@ def token_required(f):
 
         try:
             token = token.split(" ")[1]
-            data = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+            with span("auth"):
+                data = verified_tokens.decode(token, SECRET_KEY, algorithms=["HS256"])
             customer_id = data.get("customer_id")
             if not customer_id:
                 return jsonify({"message": "Invalid token"}), 401
         except Exception as e:
             return jsonify({"message": f"Token validation failed: {str(e)}"}), 401
 
+        g.principal = ("customer", customer_id)
         return f(customer_id, *args, **kwargs)
     return decorated
 
@@ -34,7 +37,8 @@ def mechanic_token_required(f):
 
         try:
             token = token.split(" ")[1]
-            data = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+            with span("auth"):
+                data = verified_tokens.decode(token, SECRET_KEY, algorithms=["HS256"])
             mechanic_id = data.get("mechanic_id")
             role = data.get("role")
             if not mechanic_id or role != "mechanic":
@@ -42,5 +46,6 @@ def mechanic_token_required(f):
         except Exception as e:
             return jsonify({"message": f"Token validation failed: {str(e)}"}), 401
 
+        g.principal = ("mechanic", mechanic_id)
         return f(mechanic_id, *args, **kwargs)
     return decorated
\ No newline at end of file
@@ -0,0 +1,92 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app, jsonify
+from werkzeug.security import generate_password_hash, check_password_hash
+
+DEFAULT_METHOD = "scrypt:32768:8:1"
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full or a job times out; surfaced to clients as a 503."""
+
+
+class _HashingPool:
+    def __init__(self, workers, queue_size, timeout):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        # Running plus queued jobs; once exhausted new requests are refused instead of waiting
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.timeout = timeout
+
+    def _call(self, fn, args):
+        try:
+            return fn(*args)
+        finally:
+            self.slots.release()  # Before the result is set, so a woken caller sees the slot free
+
+    def run(self, fn, *args):
+        if not self.slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            future = self.executor.submit(self._call, fn, args)
+        except BaseException:
+            self.slots.release()
+            raise
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # The job keeps its slot until it finishes; the caller gets the same 503 as a full queue
+            raise PasswordHasherBusy() from None
+
+
+class PasswordHasher:
+    """Runs password hashing and verification on a dedicated, bounded thread pool.
+
+    Configuration (per config class):
+      PASSWORD_HASH_METHOD      Werkzeug method string including its work factors,
+                                e.g. "scrypt:32768:8:1" or "pbkdf2:sha256:600000".
+      PASSWORD_HASH_WORKERS     Threads doing hashing work (default: CPU count).
+      PASSWORD_HASH_QUEUE_SIZE  Jobs allowed to wait for a thread before new ones get a 503.
+      PASSWORD_HASH_TIMEOUT     Seconds a request waits for its result.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        workers = app.config.get("PASSWORD_HASH_WORKERS") or os.cpu_count() or 1
+        app.extensions["password_hasher"] = _HashingPool(
+            workers,
+            app.config.get("PASSWORD_HASH_QUEUE_SIZE", workers * 4),
+            app.config.get("PASSWORD_HASH_TIMEOUT", 30)
+        )
+        # Werkzeug fills in default work factors ("scrypt" is written as "scrypt:32768:8:1"),
+        # so compare stored hashes with the prefix it actually produces for the configured method
+        method = app.config.get("PASSWORD_HASH_METHOD", DEFAULT_METHOD)
+        app.extensions["password_hash_prefix"] = generate_password_hash("", method).split("$", 1)[0]
+        app.register_error_handler(PasswordHasherBusy, _busy_response)
+
+    @property
+    def method(self):
+        return current_app.config.get("PASSWORD_HASH_METHOD", DEFAULT_METHOD)
+
+    def _run(self, fn, *args):
+        return current_app.extensions["password_hasher"].run(fn, *args)
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if the hash was made with a different method or work factor than configured."""
+        return password_hash.split("$", 1)[0] != current_app.extensions["password_hash_prefix"]
+
+
+def _busy_response(error):
+    response = jsonify({"message": "Server is busy, please retry shortly"})
+    response.status_code = 503
+    response.headers["Retry-After"] = "1"
+    return response
@@ -0,0 +1,69 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from jose import jwt
+
+DEFAULT_MAXSIZE = 4096
+
+
+class VerifiedTokenCache:
+    """Bounded, thread-safe LRU of claims from tokens that already passed jwt.decode.
+
+    Entries are keyed by a SHA-256 digest of the signing secret and the token, so the
+    raw token is never stored and a token verified under an old secret can't be served
+    after the secret changes. Each entry expires at the token's own `exp` claim.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._secret_digest = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(value):
+        return hashlib.sha256(value.encode()).digest()
+
+    def decode(self, token, secret, algorithms=("HS256",)):
+        """Return the claims of `token`, verifying it with jose only on a cache miss."""
+        secret_digest = self._digest(secret)
+        key = hashlib.sha256(secret_digest + token.encode()).digest()
+        now = time.time()
+        with self._lock:
+            if secret_digest != self._secret_digest:
+                # SECRET_KEY rotated: nothing verified under the old key is useful any more
+                self._entries.clear()
+                self._secret_digest = secret_digest
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(entry[1])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+
+        claims = jwt.decode(token, secret, algorithms=list(algorithms))
+        expires_at = claims.get("exp")
+        if isinstance(expires_at, (int, float)):
+            with self._lock:
+                self._entries[key] = (expires_at, dict(claims))
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return claims
+
+    def purge(self):
+        """Drop every cached token, e.g. after SECRET_KEY has been rotated."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+
+verified_tokens = VerifiedTokenCache()
@@ -2,13 +2,34 @@ from flask import Blueprint, request, jsonify
 from app.models import Customer, ServiceTicket, db  
 from app.auth.utils import encode_token  
 from app.auth.decorators import token_required  
-from app.blueprints.customers.schemas import login_schema, customers_schema, customer_schema  
-from app.blueprints.service_ticket.schemas import service_ticket_schema, service_tickets_schema  
-from app.extensions import limiter, cache 
-from werkzeug.security import generate_password_hash
+from app.blueprints.customers.schemas import login_schema, customer_schema, customers_row_dumper
+from app.blueprints.service_ticket.schemas import service_ticket_schema, service_tickets_row_dumper
+from app.extensions import limiter, cache, password_hasher
+from app.caching import cached_per_principal, add_cache_tags, invalidate_tags, customer_tag, ticket_tag, inventory_tag
+from app.pagination import decode_cursor, keyset_page, parse_limit
+from app.serialization import requested_dumper
+from app.group_commit import group_committer
+from app.replicas import read_only
+import math
 
 customer_blueprint = Blueprint("customer", __name__)
 
+CUSTOMER_TOTAL_CACHE_KEY = "customers:total"
+CUSTOMER_TOTAL_TIMEOUT = 300
+
+
+def customer_total():
+    """Return the number of customers, caching the COUNT(*) between registrations.
+
+    Counted on the primary even in read_only() views: register deletes the shared entry,
+    and a lagging replica would put the old count back for CUSTOMER_TOTAL_TIMEOUT.
+    """
+    total = cache.get(CUSTOMER_TOTAL_CACHE_KEY)
+    if total is None:
+        total = db.session.execute(db.select(db.func.count(Customer.id)), bind_arguments={"bind": db.engine}).scalar()
+        cache.set(CUSTOMER_TOTAL_CACHE_KEY, total, timeout=CUSTOMER_TOTAL_TIMEOUT)
+    return total
+
 @customer_blueprint.route("/login", methods=["POST"])
 @limiter.limit("5 per minute")  # Apply rate limiting
 def login():
@@ -21,30 +42,64 @@ def login():
     password = data.get("password")
 
     customer = Customer.query.filter_by(email=email).first()
-    if not customer or not customer.check_password(password):
+    if not customer or not password_hasher.verify(customer.password_hash, password):
         return jsonify({"message": "Invalid credentials"}), 401
 
+    # Upgrade hashes made with an older method or work factor while we have the password
+    if password_hasher.needs_rehash(customer.password_hash):
+        customer.password_hash = password_hasher.hash(password)
+        db.session.commit()
+
     token = encode_token(customer.id)
     return jsonify({"token": token}), 200
 
 
-@customer_blueprint.route("/my-tickets", methods=["GET"])
+@customer_blueprint.route("/my-tickets", methods=["GET"])  # Primary only: a lagging replica would refill the cache stale
 @token_required
-@cache.cached(timeout=60)  # Apply caching
+@cached_per_principal(tags=lambda customer_id: [customer_tag(customer_id)])  # Apply caching
 def my_tickets(customer_id):
-    tickets = ServiceTicket.query.filter_by(customer_id=customer_id).all()
-    return jsonify(service_tickets_schema.dump(tickets))  
+    tickets = service_tickets_row_dumper.dump(
+        service_tickets_row_dumper.query().filter(ServiceTicket.customer_id == customer_id)
+    )
+    add_cache_tags(
+        *(ticket_tag(ticket["id"]) for ticket in tickets),
+        *{inventory_tag(item["id"]) for ticket in tickets for item in ticket["inventory_items"]}
+    )
+    return jsonify(tickets)  
 
 
 @customer_blueprint.route("/", methods=["GET"])
+@read_only
 def get_customers():
+    dumper = requested_dumper(customers_row_dumper)  # ?fields=id,name narrows the SELECT too
+
+    # Cursor mode: ?after=<cursor>&limit=N pages on the primary key without OFFSET or COUNT(*)
+    if "after" in request.args or "limit" in request.args:
+        limit = parse_limit(request.args.get("limit", type=int))
+        after = request.args.get("after")
+        try:
+            after_id = decode_cursor(after) if after else None
+        except ValueError:
+            return jsonify({"message": "Invalid cursor"}), 400
+
+        customers, next_cursor = keyset_page(dumper.query(), Customer.id, after_id, limit)
+        response = {
+            "customers": dumper.dump(customers),
+            "next_cursor": next_cursor,
+            "limit": limit
+        }
+        if request.args.get("include_total", "false").lower() == "true":
+            response["total"] = customer_total()
+        return jsonify(response), 200
+
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
-    customers = Customer.query.paginate(page=page, per_page=per_page)
+    customers = dumper.query().order_by(Customer.id).paginate(page=page, per_page=per_page, count=False)
+    total = customer_total()
     return jsonify({
-        "customers": customers_schema.dump(customers.items),
-        "total": customers.total,
-        "pages": customers.pages
+        "customers": dumper.dump(customers.items),
+        "total": total,
+        "pages": math.ceil(total / per_page) if per_page else 0
     }), 200
 
 
@@ -62,7 +117,7 @@ def register():
         return jsonify({"message": "Email already exists"}), 400
 
     # Hash the password before storing it
-    hashed_password = generate_password_hash(data.get("password"))
+    hashed_password = password_hasher.hash(data.get("password"))
 
     # Create a new customer
     customer = Customer(
@@ -73,6 +128,7 @@ def register():
     )
     db.session.add(customer)
     db.session.commit()
+    cache.delete(CUSTOMER_TOTAL_CACHE_KEY)
 
     return jsonify({"message": "Customer registered successfully"}), 201
 
@@ -94,7 +150,7 @@ def create_service_ticket(customer_id):
         description=description,
         customer_id=customer_id
     )
-    db.session.add(service_ticket)
-    db.session.commit()
+    ticket_id = group_committer.insert(service_ticket)  # Shares a commit with concurrent requests if enabled
+    invalidate_tags(customer_tag(customer_id))
 
-    return jsonify({"message": "Service ticket created successfully"}), 201
\ No newline at end of file
+    return jsonify({"message": "Service ticket created successfully", "id": ticket_id}), 201
\ No newline at end of file
@@ -1,6 +1,9 @@
 from marshmallow import Schema, fields
+from app.instrumentation.profiling import TimedDumpMixin
+from app.models import Customer
+from app.serialization import RowDumper
 
-class CustomerSchema(Schema):
+class CustomerSchema(TimedDumpMixin, Schema):
     id = fields.Int(dump_only=True)
     name = fields.Str(required=True)
     email = fields.Email(required=True)
@@ -9,4 +12,5 @@ class CustomerSchema(Schema):
 
 login_schema = CustomerSchema(only=("email", "password"))
 customer_schema = CustomerSchema()
-customers_schema = CustomerSchema(many=True)
\ No newline at end of file
+customers_schema = CustomerSchema(many=True)
+customers_row_dumper = RowDumper(customers_schema, Customer)  # Read-only list fast path
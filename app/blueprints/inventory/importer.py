@@ -0,0 +1,141 @@
+import csv
+import io
+import json
+import click
+from flask.cli import with_appcontext
+from marshmallow import Schema, fields, validate, ValidationError
+from app.extensions import db
+from app.models import Inventory
+from app.caching import invalidate_tags, inventory_tag
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+
+class InventoryImportSchema(Schema):
+    id = fields.Int(load_default=None)
+    name = fields.Str(required=True, validate=validate.Length(min=1, max=100))
+    price = fields.Float(required=True)
+    quantity = fields.Int(validate=validate.Range(min=0))  # Omitted: new items start at 0, existing keep theirs
+
+
+import_schema = InventoryImportSchema()
+
+
+class _ReadOnlyStream(io.RawIOBase):
+    """Adapts an input stream that only has read() (gunicorn's request body) for TextIOWrapper."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def iter_records(stream, fmt):
+    """Yield (row_number, record) pairs from a binary CSV or NDJSON stream.
+
+    Records are parsed lazily from the stream; a line that isn't valid JSON yields
+    its error message as the record instead.
+    """
+    if not hasattr(stream, "readable"):
+        stream = io.BufferedReader(_ReadOnlyStream(stream))
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    if fmt == "csv":
+        for row_number, row in enumerate(csv.DictReader(text), start=1):
+            # Empty CSV cells mean "not provided", which lets optional columns be left blank
+            yield row_number, {key: value for key, value in row.items() if key and value != ""}
+        return
+
+    for row_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row_number, f"Invalid JSON: {e}"
+            continue
+        yield row_number, record if isinstance(record, dict) else "Each line must be a JSON object"
+
+
+def _flush_batch(batch, report):
+    rows = {}
+    new_rows = []
+    for row in batch:
+        if row["id"] is None:
+            new_rows.append({key: value for key, value in row.items() if key != "id"})
+        else:
+            rows[row["id"]] = row  # Later rows win over earlier ones with the same id
+
+    existing = set()
+    if rows:
+        existing = set(db.session.scalars(db.select(Inventory.id).where(Inventory.id.in_(rows))))
+    updates = [row for inventory_id, row in rows.items() if inventory_id in existing]
+    inserts = new_rows + [row for inventory_id, row in rows.items() if inventory_id not in existing]
+
+    # Both statements run as multi-row executemany calls, committed together
+    if updates:
+        db.session.execute(db.update(Inventory), updates)
+    if inserts:
+        db.session.execute(db.insert(Inventory), inserts)
+    db.session.commit()
+    if updates:
+        invalidate_tags(*(inventory_tag(row["id"]) for row in updates))
+
+    report["inserted"] += len(inserts)
+    report["updated"] += len(updates)
+
+
+def import_inventory(records, batch_size=BATCH_SIZE):
+    """Validate and upsert inventory records in batches, one commit per batch.
+
+    `records` is an iterable of (row_number, record) pairs as produced by
+    iter_records. Rows with an id matching an existing item update it; all other
+    rows are inserted. Returns a report with per-row validation errors (capped at
+    MAX_REPORTED_ERRORS so memory stays bounded).
+    """
+    report = {"processed": 0, "inserted": 0, "updated": 0, "failed": 0, "errors": []}
+    batch = []
+    for row_number, record in records:
+        report["processed"] += 1
+        try:
+            if isinstance(record, str):
+                raise ValidationError({"_row": [record]})
+            batch.append(import_schema.load(record))
+        except ValidationError as e:
+            report["failed"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                report["errors"].append({"row": row_number, "errors": e.messages})
+            else:
+                report["errors_truncated"] = True
+            continue
+        if len(batch) >= batch_size:
+            _flush_batch(batch, report)
+            batch = []
+    if batch:
+        _flush_batch(batch, report)
+    return report
+
+
+@click.command("import")
+@with_appcontext
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "fmt", type=click.Choice(["csv", "ndjson"]), default=None,
+              help="File format; inferred from the extension when omitted.")
+@click.option("--batch-size", default=BATCH_SIZE, show_default=True)
+def import_command(path, fmt, batch_size):
+    """Bulk import inventory items from a CSV or NDJSON file."""
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "ndjson")
+    with open(path, "rb") as stream:
+        report = import_inventory(iter_records(stream, fmt), batch_size)
+    for error in report["errors"]:
+        click.echo(f"Row {error['row']}: {json.dumps(error['errors'])}", err=True)
+    click.echo(
+        f"Processed {report['processed']} rows: {report['inserted']} inserted, "
+        f"{report['updated']} updated, {report['failed']} failed."
+    )
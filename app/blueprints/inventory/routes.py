@@ -1,10 +1,19 @@
 from flask import Blueprint, request, jsonify
-from app.models import Inventory, ServiceTicket
+from app.models import Inventory
 from app.extensions import db
-from app.blueprints.inventory.schemas import inventory_schema, inventories_schema
+from app.blueprints.inventory.schemas import inventory_schema, inventories_row_dumper
 from app.auth.decorators import mechanic_token_required 
+from app.pagination import decode_sort_cursor, keyset_list_response, list_response, parse_limit, sorted_keyset_page
+from app.caching import invalidate_tags, inventory_tag, ticket_tag
+from app.blueprints.inventory.importer import import_inventory, iter_records, import_command
+from app.blueprints.inventory.search import MATCHES, SEARCH_DEFAULT_LIMIT, SORTS, search_filters
+from app.blueprints.inventory.stock import StockError, reserve_part
+from app.streaming import wants_ndjson, ndjson_response
+from app.serialization import requested_dumper
+from app.replicas import read_only
 
 inventory_blueprint = Blueprint("inventory", __name__)
+inventory_blueprint.cli.add_command(import_command)  # flask inventory import <file>
 
 @inventory_blueprint.route("/", methods=["POST"])
 def create_inventory():
@@ -19,10 +28,64 @@ def create_inventory():
     return jsonify(inventory_schema.dump(inventory)), 201
 
 
+@inventory_blueprint.route("/import", methods=["POST"])
+@mechanic_token_required
+def import_inventories(mechanic_id):
+    # The body is parsed as it streams in; format comes from ?format= or the Content-Type
+    fmt = request.args.get("format")
+    if fmt is None:
+        fmt = "csv" if request.mimetype == "text/csv" else "ndjson" if request.mimetype in (
+            "application/x-ndjson", "application/jsonl") else None
+    if fmt not in ("csv", "ndjson"):
+        return jsonify({"message": "Send text/csv or application/x-ndjson, or pass ?format=csv|ndjson"}), 415
+
+    report = import_inventory(iter_records(request.stream, fmt))
+    return jsonify(report), 200
+
+
 @inventory_blueprint.route("/", methods=["GET"])
+@read_only
 def get_inventories():
-    inventories = Inventory.query.all()
-    return jsonify(inventories_schema.dump(inventories)), 200
+    dumper = requested_dumper(inventories_row_dumper)  # ?fields=id,name narrows the SELECT too
+    if wants_ndjson():
+        return ndjson_response(dumper.select(), Inventory.id, dumper)
+    return keyset_list_response(dumper.query(), Inventory.id, dumper)
+
+
+@inventory_blueprint.route("/search", methods=["GET"])
+@read_only
+def search_inventory():
+    # ?q=bra&match=prefix|contains&min_price=10&max_price=50&sort=name|-name|price|-price&limit=20&after=<cursor>
+    match = request.args.get("match", "prefix")
+    sort = request.args.get("sort", "name")
+    min_price = request.args.get("min_price", type=float)
+    max_price = request.args.get("max_price", type=float)
+    if match not in MATCHES:
+        return jsonify({"message": f"match must be one of: {', '.join(MATCHES)}"}), 400
+    if sort not in SORTS:
+        return jsonify({"message": f"sort must be one of: {', '.join(SORTS)}"}), 400
+    if min_price is not None and max_price is not None and min_price > max_price:
+        return jsonify({"message": "min_price must not exceed max_price"}), 400
+    after = request.args.get("after")
+    try:
+        after_key = decode_sort_cursor(after) if after else None
+    except ValueError:
+        return jsonify({"message": "Invalid cursor"}), 400
+
+    dumper = requested_dumper(inventories_row_dumper)
+    query = dumper.query().filter(*search_filters(request.args.get("q"), match, min_price, max_price))
+    sort_key, descending = SORTS[sort]
+    limit = parse_limit(request.args.get("limit", type=int), default=SEARCH_DEFAULT_LIMIT)
+    rows, next_cursor = sorted_keyset_page(query, sort_key, Inventory.id, after_key, limit, descending)
+    return list_response(dumper.dump(rows), next_cursor, limit)
+
+
+@inventory_blueprint.route("/<int:id>", methods=["GET"])
+@read_only
+def get_inventory(id):
+    dumper = requested_dumper(inventories_row_dumper)
+    inventory = dumper.query().filter(Inventory.id == id).first_or_404()
+    return jsonify(dumper.dump([inventory])[0]), 200
 
 
 @inventory_blueprint.route("/<int:id>", methods=["PUT"])
@@ -36,6 +99,7 @@ def update_inventory(id):
     for key, value in data.items():
         setattr(inventory, key, value)
     db.session.commit()
+    invalidate_tags(inventory_tag(id))
     return jsonify(inventory_schema.dump(inventory)), 200
 
 
@@ -44,28 +108,26 @@ def delete_inventory(id):
     inventory = Inventory.query.get_or_404(id)
     db.session.delete(inventory)
     db.session.commit()
+    invalidate_tags(inventory_tag(id))
     return jsonify({"message": "Inventory deleted"}), 200
 
 
 @inventory_blueprint.route("/<int:inventory_id>/add-part", methods=["POST"])
 @mechanic_token_required  # Ensure only mechanics can access this route
 def add_part_to_service_ticket(mechanic_id, inventory_id):
-    # Fetch the inventory item
-    inventory_item = Inventory.query.get_or_404(inventory_id)
-
-    # Get ticket_id from the request payload
+    # Get ticket_id (and optionally how many units) from the request payload
     data = request.json
     ticket_id = data.get("ticket_id")
     if not ticket_id:
         return jsonify({"message": "Service Ticket ID is required"}), 400
+    quantity = data.get("quantity", 1)
+    if not isinstance(quantity, int) or isinstance(quantity, bool) or quantity < 1:
+        return jsonify({"message": "quantity must be a positive integer"}), 400
 
-    # Fetch the service ticket
-    service_ticket = ServiceTicket.query.get_or_404(ticket_id)
-
-    # Add the inventory item to the service ticket
-    if inventory_item not in service_ticket.inventory_items:
-        service_ticket.inventory_items.append(inventory_item)
-        db.session.commit()
-        return jsonify({"message": "Part added to service ticket"}), 200
-    else:
-        return jsonify({"message": "Part is already associated with this service ticket"}), 400
\ No newline at end of file
+    # Reserve the units and add them to the ticket; adding a part again adds to its quantity
+    try:
+        line_quantity, stock = reserve_part(ticket_id, inventory_id, quantity)
+    except StockError as e:
+        return jsonify({"message": str(e)}), e.status
+    invalidate_tags(ticket_tag(ticket_id), inventory_tag(inventory_id))
+    return jsonify({"message": "Part added to service ticket", "quantity": line_quantity, "stock": stock}), 200
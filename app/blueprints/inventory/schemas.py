@@ -1,12 +1,18 @@
-from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
+from marshmallow import validate
+from marshmallow_sqlalchemy import SQLAlchemyAutoSchema, auto_field
 from app.models import Inventory
 from app.extensions import db  
+from app.instrumentation.profiling import TimedDumpMixin
+from app.serialization import RowDumper
 
-class InventorySchema(SQLAlchemyAutoSchema):
+class InventorySchema(TimedDumpMixin, SQLAlchemyAutoSchema):
     class Meta:
         model = Inventory
         load_instance = True
 
+    quantity = auto_field(validate=validate.Range(min=0))  # Units in stock; PUT sets a counted level
+
 
 inventory_schema = InventorySchema(session=db.session)
-inventories_schema = InventorySchema(many=True, session=db.session)
\ No newline at end of file
+inventories_schema = InventorySchema(many=True, session=db.session)
+inventories_row_dumper = RowDumper(inventories_schema, Inventory)  # Read-only list fast path
@@ -0,0 +1,53 @@
+from app.extensions import db
+from app.models import Inventory
+
+SEARCH_DEFAULT_LIMIT = 20  # Typeahead pages are short
+SORTS = {
+    "name": (db.func.lower(Inventory.name), False),
+    "-name": (db.func.lower(Inventory.name), True),
+    "price": (Inventory.price, False),
+    "-price": (Inventory.price, True),
+}
+MATCHES = ("prefix", "contains")
+
+
+def _prefix_bounds(prefix):
+    """[low, high) range of strings starting with `prefix`, e.g. "bra" -> ("bra", "brb").
+
+    Only valid under binary (code point) collation: under MySQL's and PostgreSQL's usual
+    collations punctuation such as "{" sorts before letters, so "brz" would get an empty range.
+    """
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _escape_like(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_filters(q=None, match="prefix", min_price=None, max_price=None, dialect=None):
+    """WHERE clauses for an inventory search.
+
+    Names are matched case-insensitively against lower(name). A prefix is an index seek
+    on ix_inventory_name_lower: an explicit range on SQLite, whose binary collation makes
+    that exact, and LIKE 'prefix%' elsewhere, which MySQL and PostgreSQL turn into a
+    collation-aware range themselves. A substring ("contains") can't be
+    seeked; sorted by name it walks that same index in order and stops once the page is
+    full. Price bounds are inclusive and use ix_inventory_price.
+    """
+    filters = []
+    name = db.func.lower(Inventory.name)
+    if q:
+        q = q.lower()
+        dialect = dialect or db.session.get_bind().dialect.name
+        if match == "prefix" and dialect == "sqlite":
+            low, high = _prefix_bounds(q)
+            filters += [name >= low, name < high]
+        elif match == "prefix":
+            filters.append(name.like(f"{_escape_like(q)}%", escape="\\"))
+        else:
+            filters.append(name.like(f"%{_escape_like(q)}%", escape="\\"))
+    if min_price is not None:
+        filters.append(Inventory.price >= min_price)
+    if max_price is not None:
+        filters.append(Inventory.price <= max_price)
+    return filters
@@ -0,0 +1,136 @@
+from sqlalchemy import exc
+from app.extensions import db
+from app.models import Inventory, ServiceTicket, inventory_service_ticket
+from app.upsert import increment
+from app.blueprints.reports.rollups import Activity
+
+
+MAX_PARTS_PER_REQUEST = 100  # Keeps the multi-row statements well inside bind parameter limits
+
+
+class StockError(Exception):
+    """A reservation that was refused; `status` is the HTTP status to answer with."""
+
+    def __init__(self, message, status, details=None):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+
+def _add_to_line(ticket_id, inventory_id, quantity):
+    """Add `quantity` units to the ticket's line for the part, creating the line if needed."""
+    line = inventory_service_ticket.c
+    where = (line.service_ticket_id == ticket_id, line.inventory_id == inventory_id)
+    added = db.session.execute(
+        db.update(inventory_service_ticket).where(*where).values(quantity=line.quantity + quantity)
+    ).rowcount
+    if added:
+        return
+    try:
+        with db.session.begin_nested():  # Savepoint: losing the insert race must not undo the stock update
+            db.session.execute(db.insert(inventory_service_ticket).values(
+                service_ticket_id=ticket_id, inventory_id=inventory_id, quantity=quantity))
+    except exc.IntegrityError:
+        # Another request created the line between our UPDATE and INSERT; it exists now
+        db.session.execute(
+            db.update(inventory_service_ticket).where(*where).values(quantity=line.quantity + quantity))
+
+
+def reserve_part(ticket_id, inventory_id, quantity=1):
+    """Take `quantity` units of a part out of stock and put them on a service ticket.
+
+    The stock check and decrement are one conditional UPDATE, so two technicians
+    racing for the last unit can't both get it: the database serialises the two
+    updates on the row and the second one matches nothing. No row is read first and
+    no lock is held beyond the statement's own until the commit that follows it.
+    Commits on success and returns (units on the ticket line, units left in stock);
+    rolls back and raises StockError otherwise.
+    """
+    try:
+        taken = db.session.execute(
+            db.update(Inventory)
+            .where(Inventory.id == inventory_id, Inventory.quantity >= quantity)
+            .values(quantity=Inventory.quantity - quantity)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not taken and db.session.scalar(db.select(Inventory.id).where(Inventory.id == inventory_id)) is None:
+            raise StockError("Inventory item not found", 404)
+        service_date = db.session.scalar(db.select(ServiceTicket.service_date).where(ServiceTicket.id == ticket_id))
+        if service_date is None:
+            raise StockError("Service ticket not found", 404)
+        if not taken:
+            raise StockError("Insufficient stock", 409)
+
+        _add_to_line(ticket_id, inventory_id, quantity)
+        line = inventory_service_ticket.c
+        line_quantity = db.session.scalar(db.select(line.quantity).where(
+            line.service_ticket_id == ticket_id, line.inventory_id == inventory_id))
+        stock, price = db.session.execute(
+            db.select(Inventory.quantity, Inventory.price).where(Inventory.id == inventory_id)).one()
+        activity = Activity()
+        activity.parts(service_date.date(), quantity, quantity * price)
+        activity.apply(db.session.connection())
+        db.session.commit()
+    except BaseException:
+        db.session.rollback()
+        raise
+    return line_quantity, stock
+
+
+def _upsert_lines(ticket_id, quantities):
+    """Add units to many ticket lines in one INSERT, adding to lines that already exist."""
+    increment(db.session.connection(), inventory_service_ticket, [
+        {"service_ticket_id": ticket_id, "inventory_id": inventory_id, "quantity": quantity}
+        for inventory_id, quantity in sorted(quantities.items())
+    ], ["inventory_id", "service_ticket_id"])
+
+
+def reserve_parts(ticket_id, quantities):
+    """Reserve units of many parts and put them on a service ticket, all or nothing.
+
+    `quantities` maps inventory ids to units. All stock is taken by one conditional
+    UPDATE (a CASE gives each part its own amount) and the ticket lines are written by
+    one upsert, so a dozen parts cost two statements instead of a dozen round trips.
+    If any part is short nothing is reserved: StockError (409) lists what was asked
+    for and what is available. Ids that don't exist are skipped. Commits on success
+    and returns {inventory_id: "added" | "increased" | "unknown"}.
+    """
+    try:
+        amount = db.case(quantities, value=Inventory.id)
+        taken = db.session.execute(
+            db.update(Inventory)
+            .where(Inventory.id.in_(quantities), Inventory.quantity >= amount)
+            .values(quantity=Inventory.quantity - amount)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        service_date = db.session.scalar(db.select(ServiceTicket.service_date).where(ServiceTicket.id == ticket_id))
+        if service_date is None:
+            raise StockError("Service ticket not found", 404)
+        known = dict(db.session.execute(
+            db.select(Inventory.id, Inventory.price).where(Inventory.id.in_(quantities))).all())
+        if taken != len(known):
+            db.session.rollback()  # Undo the parts that did have enough, then report current levels
+            stock = dict(db.session.execute(
+                db.select(Inventory.id, Inventory.quantity).where(Inventory.id.in_(known))).all())
+            raise StockError("Insufficient stock", 409, {
+                str(inventory_id): {"requested": quantities[inventory_id], "available": available}
+                for inventory_id, available in sorted(stock.items()) if available < quantities[inventory_id]
+            })
+
+        line = inventory_service_ticket.c
+        existing = set(db.session.scalars(db.select(line.inventory_id).where(
+            line.service_ticket_id == ticket_id, line.inventory_id.in_(known))))
+        if known:
+            _upsert_lines(ticket_id, {inventory_id: quantities[inventory_id] for inventory_id in known})
+            activity = Activity()
+            activity.parts(service_date.date(), sum(quantities[inventory_id] for inventory_id in known),
+                           sum(quantities[inventory_id] * price for inventory_id, price in known.items()))
+            activity.apply(db.session.connection())
+        db.session.commit()
+    except BaseException:
+        db.session.rollback()
+        raise
+    return {
+        inventory_id: "unknown" if inventory_id not in known else "increased" if inventory_id in existing else "added"
+        for inventory_id in sorted(quantities)
+    }
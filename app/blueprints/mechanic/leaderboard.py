@@ -0,0 +1,102 @@
+from collections import Counter
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.link_history import link_changes
+from app.models import Mechanic, MechanicTicketCount, ServiceTicket, mechanic_service_ticket
+
+counts = MechanicTicketCount.__table__
+
+
+def adjust_ticket_counts(connection, deltas):
+    """Apply {mechanic_id: delta} to the maintained counts inside the caller's transaction."""
+    for mechanic_id, delta in deltas.items():
+        if not delta:
+            continue
+        result = connection.execute(
+            counts.update()
+            .where(counts.c.mechanic_id == mechanic_id)
+            .values(ticket_count=counts.c.ticket_count + delta)
+        )
+        if result.rowcount == 0 and delta > 0:
+            # Mechanic predates the aggregate; rebuild-stats repairs any other drift
+            connection.execute(counts.insert().values(mechanic_id=mechanic_id, ticket_count=delta))
+
+
+def top_mechanics(limit=None):
+    """Mechanics with at least one ticket, busiest first, read from the maintained counts."""
+    query = db.session.query(
+        Mechanic.id, Mechanic.name, MechanicTicketCount.ticket_count
+    ).join(MechanicTicketCount, MechanicTicketCount.mechanic_id == Mechanic.id).filter(
+        MechanicTicketCount.ticket_count > 0
+    ).order_by(MechanicTicketCount.ticket_count.desc(), Mechanic.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def rebuild_ticket_counts():
+    """Recompute every count from mechanic_service_ticket."""
+    db.session.execute(counts.delete())
+    db.session.execute(counts.insert().from_select(
+        ["mechanic_id", "ticket_count"],
+        db.select(Mechanic.id, db.func.count(mechanic_service_ticket.c.service_ticket_id))
+        .outerjoin(mechanic_service_ticket, mechanic_service_ticket.c.mechanic_id == Mechanic.id)
+        .group_by(Mechanic.id)
+    ))
+    db.session.commit()
+
+
+@click.command("rebuild-stats")
+@with_appcontext
+def rebuild_stats_command():
+    """Rebuild the mechanic ticket-count leaderboard."""
+    rebuild_ticket_counts()
+    click.echo("Mechanic ticket counts rebuilt.")
+
+
+@event.listens_for(Session, "before_flush")
+def _capture_deleted_assignments(session, flush_context, instances):
+    # Tickets and mechanics being deleted take their junction rows with them, so read
+    # those rows while they still exist
+    deleted_tickets = [obj.id for obj in session.deleted if isinstance(obj, ServiceTicket)]
+    deleted_mechanics = [obj.id for obj in session.deleted if isinstance(obj, Mechanic)]
+    deltas = Counter()
+    if deleted_tickets:
+        rows = session.execute(
+            db.select(mechanic_service_ticket.c.mechanic_id)
+            .where(mechanic_service_ticket.c.service_ticket_id.in_(deleted_tickets))
+        ).scalars()
+        for mechanic_id in rows:
+            deltas[mechanic_id] -= 1
+    if deleted_mechanics:
+        session.execute(counts.delete().where(counts.c.mechanic_id.in_(deleted_mechanics)))
+        for mechanic_id in deleted_mechanics:
+            deltas.pop(mechanic_id, None)
+    session.info["leaderboard_deltas"] = deltas
+    session.info["leaderboard_deleted_mechanics"] = set(deleted_mechanics)
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_assignment_changes(session, flush_context):
+    deltas = session.info.pop("leaderboard_deltas", Counter())
+    deleted_mechanics = session.info.pop("leaderboard_deleted_mechanics", set())
+    new_mechanics = [obj.id for obj in session.new if isinstance(obj, Mechanic)]
+    if new_mechanics:
+        session.connection().execute(counts.insert(), [
+            {"mechanic_id": mechanic_id, "ticket_count": 0} for mechanic_id in new_mechanics
+        ])
+
+    # Assignments made or undone through either side's collection
+    added, removed = link_changes(list(session.new) + list(session.dirty), "mechanics", "service_tickets", Mechanic)
+    for ticket, mechanic in added:
+        if ticket not in session.deleted:
+            deltas[mechanic.id] += 1
+    for ticket, mechanic in removed:
+        if ticket not in session.deleted:
+            deltas[mechanic.id] -= 1
+    for mechanic_id in deleted_mechanics:
+        deltas.pop(mechanic_id, None)
+    adjust_ticket_counts(session.connection(), deltas)
@@ -1,11 +1,17 @@
 from flask import Blueprint, request, jsonify
-from app.models import Mechanic, ServiceTicket, db
+from app.models import Mechanic, db
 from app.auth.utils import encode_mechanic_token
 from app.auth.decorators import mechanic_token_required
-from app.extensions import limiter
-from app.blueprints.mechanic.schemas import mechanic_schema, mechanics_schema 
+from app.extensions import limiter, password_hasher
+from app.blueprints.mechanic.schemas import mechanic_schema, mechanics_row_dumper
+from app.pagination import keyset_list_response
+from app.streaming import wants_ndjson, ndjson_response
+from app.serialization import requested_dumper
+from app.blueprints.mechanic.leaderboard import top_mechanics, rebuild_stats_command
+from app.replicas import read_only
 
 mechanic_blueprint = Blueprint("mechanic", __name__)
+mechanic_blueprint.cli.add_command(rebuild_stats_command)  # flask mechanic rebuild-stats
 
 @mechanic_blueprint.route("/login", methods=["POST"])
 @limiter.limit("5 per minute")  # Apply rate limiting
@@ -15,19 +21,25 @@ def mechanic_login():
     password = data.get("password")
 
     mechanic = Mechanic.query.filter_by(email=email).first()
-    if not mechanic or not mechanic.check_password(password):  
+    if not mechanic or not password_hasher.verify(mechanic.password_hash, password):  
         return jsonify({"message": "Invalid credentials"}), 401
 
+    # Upgrade hashes made with an older method or work factor while we have the password
+    if password_hasher.needs_rehash(mechanic.password_hash):
+        mechanic.password_hash = password_hasher.hash(password)
+        db.session.commit()
+
     token = encode_mechanic_token(mechanic.id)
     return jsonify({"token": token}), 200
 
 
 @mechanic_blueprint.route("/statistics", methods=["GET"])
+@read_only
 @mechanic_token_required
 def mechanic_statistics(mechanic_id):
-    mechanics = db.session.query(
-        Mechanic.id, Mechanic.name, db.func.count(ServiceTicket.id).label("ticket_count")
-    ).join(Mechanic.service_tickets).group_by(Mechanic.id).order_by(db.desc("ticket_count")).all()
+    # Reads the maintained per-mechanic counts instead of aggregating every assignment
+    limit = request.args.get("limit", type=int)
+    mechanics = top_mechanics(None if limit is None else max(1, min(limit, 500)))
 
     return jsonify([{
         "id": mechanic.id,
@@ -37,9 +49,20 @@ def mechanic_statistics(mechanic_id):
 
 
 @mechanic_blueprint.route("/", methods=["GET"])
+@read_only
 def get_mechanics():
-    mechanics = Mechanic.query.all()
-    return jsonify(mechanics_schema.dump(mechanics)), 200
+    dumper = requested_dumper(mechanics_row_dumper)  # ?fields=id,name narrows the SELECT too
+    if wants_ndjson():
+        return ndjson_response(dumper.select(), Mechanic.id, dumper)
+    return keyset_list_response(dumper.query(), Mechanic.id, dumper)
+
+
+@mechanic_blueprint.route("/<int:id>", methods=["GET"])
+@read_only
+def get_mechanic(id):
+    dumper = requested_dumper(mechanics_row_dumper)
+    mechanic = dumper.query().filter(Mechanic.id == id).first_or_404()
+    return jsonify(dumper.dump([mechanic])[0]), 200
 
 
 @mechanic_blueprint.route("/<int:id>", methods=["PUT"])
@@ -78,8 +101,7 @@ def register_mechanic():
         return jsonify({"message": "Email already exists"}), 400
 
     # Hash the password before storing it
-    from werkzeug.security import generate_password_hash
-    hashed_password = generate_password_hash(data.get("password"))
+    hashed_password = password_hasher.hash(data.get("password"))
 
     # Create a new mechanic
     mechanic = Mechanic(
@@ -2,16 +2,19 @@ from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
 from marshmallow import fields
 from app.models import Mechanic
 from app.extensions import db  
+from app.instrumentation.profiling import TimedDumpMixin
+from app.serialization import RowDumper
 
-class MechanicSchema(SQLAlchemyAutoSchema):
+class MechanicSchema(TimedDumpMixin, SQLAlchemyAutoSchema):
     class Meta:
         model = Mechanic
         load_instance = True
+        exclude = ("password_hash",)  # Never dumped (or selectable with ?fields=), never loaded from clients
 
     email = fields.Email(required=True)
     phone = fields.Str(required=True)
     password = fields.Str(load_only=True)  # Mark password as load_only to exclude it from updates
-    password_hash = fields.Str(dump_only=True)  # Exclude password_hash from validation
 
 mechanic_schema = MechanicSchema(session=db.session)
-mechanics_schema = MechanicSchema(many=True, session=db.session)
\ No newline at end of file
+mechanics_schema = MechanicSchema(many=True, session=db.session)
+mechanics_row_dumper = RowDumper(mechanics_schema, Mechanic)  # Read-only list fast path
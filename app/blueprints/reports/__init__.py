@@ -0,0 +1,4 @@
+from flask import Blueprint
+from .routes import reports_blueprint
+
+reports_bp = reports_blueprint
@@ -0,0 +1,240 @@
+from collections import defaultdict
+from datetime import timedelta
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.link_history import link_changes
+from app.models import (Inventory, Mechanic, MechanicReportDay, ServiceTicket, TicketReportDay,
+                        inventory_service_ticket, mechanic_service_ticket)
+from app.upsert import increment
+
+ticket_days = TicketReportDay.__table__
+mechanic_days = MechanicReportDay.__table__
+TICKET_COUNTERS = ["ticket_count", "parts_units", "parts_revenue"]
+
+
+class Activity:
+    """Rollup changes collected from one write: per day (tickets, part units, parts revenue)
+    and per (day, mechanic_id) assigned tickets."""
+
+    def __init__(self):
+        self.days = defaultdict(lambda: [0, 0, 0])
+        self.mechanics = defaultdict(int)
+        self.deleted_mechanics = set()
+
+    def ticket(self, day, count=1):
+        self.days[day][0] += count
+
+    def parts(self, day, units, revenue):
+        self.days[day][1] += units
+        self.days[day][2] += revenue
+
+    def assignment(self, day, mechanic_id, count=1):
+        self.mechanics[(day, mechanic_id)] += count
+
+    def apply(self, connection):
+        """Write the collected changes inside the caller's transaction."""
+        _apply(connection, ticket_days, ["day"], {(day,): values for day, values in self.days.items()},
+               TICKET_COUNTERS)
+        _apply(connection, mechanic_days, ["day", "mechanic_id"],
+               {key: [count] for key, count in self.mechanics.items() if key[1] not in self.deleted_mechanics},
+               ["ticket_count"])
+
+
+def _apply(connection, table, keys, deltas, counters):
+    # Buckets that only grow are upserted; a decrement for a bucket that doesn't exist
+    # predates the rollups, so it is skipped rather than stored negative (backfill repairs it)
+    growing, shrinking = [], []
+    for key, values in sorted(deltas.items()):
+        if not any(values):
+            continue
+        row = {**dict(zip(keys, key)), **dict(zip(counters, values))}
+        (growing if min(values) >= 0 else shrinking).append(row)
+    increment(connection, table, growing, keys)
+    for row in shrinking:
+        connection.execute(table.update().where(*(table.c[name] == row[name] for name in keys))
+                           .values({name: table.c[name] + row[name] for name in counters}))
+
+
+PERIODS = {
+    "day": lambda day: day,
+    "week": lambda day: day - timedelta(days=day.weekday()),  # Weeks start on Monday
+    "month": lambda day: day.replace(day=1),
+}
+
+
+def _range(column, start, end):
+    return ([column >= start] if start else []) + ([column <= end] if end else [])
+
+
+def ticket_report(period="day", start=None, end=None):
+    """Tickets, part units and parts revenue per period, summed from the daily rollup rows."""
+    totals = {}
+    rows = db.session.execute(
+        db.select(ticket_days.c.day, *(ticket_days.c[name] for name in TICKET_COUNTERS))
+        .where(*_range(ticket_days.c.day, start, end)).order_by(ticket_days.c.day)
+    )
+    for day, tickets, units, revenue in rows:
+        bucket = totals.setdefault(PERIODS[period](day), [0, 0, 0])
+        bucket[0] += tickets
+        bucket[1] += units
+        bucket[2] += revenue
+    return [{"period": bucket.isoformat(), "tickets": tickets, "parts_units": units,
+             "parts_revenue": round(revenue, 2)}
+            for bucket, (tickets, units, revenue) in totals.items() if tickets or units]
+
+
+def mechanic_report(period="day", start=None, end=None):
+    """Tickets per mechanic per period, busiest first within each period."""
+    totals = defaultdict(int)
+    names = {}
+    rows = db.session.execute(
+        db.select(mechanic_days.c.day, Mechanic.id, Mechanic.name, mechanic_days.c.ticket_count)
+        .join(Mechanic, Mechanic.id == mechanic_days.c.mechanic_id)
+        .where(*_range(mechanic_days.c.day, start, end))
+    )
+    for day, mechanic_id, name, count in rows:
+        totals[(PERIODS[period](day), mechanic_id)] += count
+        names[mechanic_id] = name
+    return [{"period": bucket.isoformat(), "mechanic_id": mechanic_id, "name": names[mechanic_id], "tickets": count}
+            for (bucket, mechanic_id), count in sorted(totals.items(), key=lambda item: (item[0][0], -item[1], item[0][1]))
+            if count]
+
+
+def _day(column):
+    # SQLite has no DATE type to cast to; date() returns the ISO string a Date column stores
+    if db.session.get_bind().dialect.name == "sqlite":
+        return db.func.date(column)
+    return db.cast(column, db.Date)
+
+
+def backfill_rollups(start=None, end=None):
+    """Recompute the rollups for service dates in [start, end] (default: all) from the ticket tables.
+
+    Revenue is recomputed at current part prices, whereas incremental updates book
+    the price at the time units are added.
+    """
+    conditions = []
+    if start is not None:
+        conditions.append(ServiceTicket.service_date >= start)
+    if end is not None:
+        conditions.append(ServiceTicket.service_date < end + timedelta(days=1))
+    for table in (ticket_days, mechanic_days):
+        db.session.execute(table.delete().where(*_range(table.c.day, start, end)))
+
+    day = _day(ServiceTicket.service_date).label("day")
+    line = inventory_service_ticket.c
+    activity = db.union_all(
+        db.select(day, db.literal(1).label("tickets"), db.literal(0).label("units"),
+                  db.literal(0.0).label("revenue")).where(*conditions),
+        db.select(day, db.literal(0), line.quantity, Inventory.price * line.quantity)
+        .join(inventory_service_ticket, line.service_ticket_id == ServiceTicket.id)
+        .join(Inventory, Inventory.id == line.inventory_id).where(*conditions),
+    ).subquery()
+    db.session.execute(ticket_days.insert().from_select(
+        ["day", *TICKET_COUNTERS],
+        db.select(activity.c.day, db.func.sum(activity.c.tickets), db.func.sum(activity.c.units),
+                  db.func.sum(activity.c.revenue)).group_by(activity.c.day)
+    ))
+    db.session.execute(mechanic_days.insert().from_select(
+        ["day", "mechanic_id", "ticket_count"],
+        db.select(day, mechanic_service_ticket.c.mechanic_id, db.func.count())
+        .join(mechanic_service_ticket, mechanic_service_ticket.c.service_ticket_id == ServiceTicket.id)
+        .where(*conditions).group_by(day, mechanic_service_ticket.c.mechanic_id)
+    ))
+    db.session.commit()
+
+
+@click.command("backfill")
+@with_appcontext
+@click.option("--start", type=click.DateTime(["%Y-%m-%d"]), default=None, help="First service date to rebuild.")
+@click.option("--end", type=click.DateTime(["%Y-%m-%d"]), default=None, help="Last service date to rebuild.")
+def backfill_command(start, end):
+    """Rebuild the report rollups from tickets, parts and mechanic assignments."""
+    backfill_rollups(start and start.date(), end and end.date())
+    click.echo("Report rollups rebuilt.")
+
+
+@event.listens_for(Session, "before_flush")
+def _capture_removed_activity(session, flush_context, instances):
+    # Deleted tickets and unlinked parts take their junction rows with them, so read
+    # what they contributed while those rows still exist
+    activity = Activity()
+    line = inventory_service_ticket.c
+    deleted = {obj.id: obj.service_date.date() for obj in session.deleted if isinstance(obj, ServiceTicket)}
+    if deleted:
+        for day in deleted.values():
+            activity.ticket(day, -1)
+        parts = session.execute(
+            db.select(line.service_ticket_id, db.func.sum(line.quantity), db.func.sum(Inventory.price * line.quantity))
+            .join(Inventory, Inventory.id == line.inventory_id)
+            .where(line.service_ticket_id.in_(deleted)).group_by(line.service_ticket_id)
+        )
+        for ticket_id, units, revenue in parts:
+            activity.parts(deleted[ticket_id], -units, -revenue)
+        assignments = session.execute(
+            db.select(mechanic_service_ticket.c.service_ticket_id, mechanic_service_ticket.c.mechanic_id)
+            .where(mechanic_service_ticket.c.service_ticket_id.in_(deleted))
+        )
+        for ticket_id, mechanic_id in assignments:
+            activity.assignment(deleted[ticket_id], mechanic_id, -1)
+
+    # Deleted parts take their lines on surviving tickets with them through the secondary cascade
+    deleted_parts = {obj.id for obj in session.deleted if isinstance(obj, Inventory)}
+    if deleted_parts:
+        day = ServiceTicket.service_date
+        lines = session.execute(
+            db.select(day, line.quantity, Inventory.price * line.quantity)
+            .join(inventory_service_ticket, line.service_ticket_id == ServiceTicket.id)
+            .join(Inventory, Inventory.id == line.inventory_id)
+            .where(line.inventory_id.in_(deleted_parts), line.service_ticket_id.not_in(deleted))
+        )
+        for service_date, units, revenue in lines:
+            activity.parts(service_date.date(), -units, -revenue)
+
+    # Parts and mechanics unlinked from surviving tickets through the ORM collections
+    existing = [obj for obj in session.dirty if obj not in session.deleted]
+    _, unlinked = link_changes(existing, "inventory_items", "service_tickets", Inventory)
+    unlinked = [(ticket, part) for ticket, part in unlinked
+                if ticket not in session.deleted and part not in session.deleted]  # Those are counted above
+    if unlinked:
+        quantities = {(ticket_id, inventory_id): quantity for ticket_id, inventory_id, quantity in session.execute(
+            db.select(line.service_ticket_id, line.inventory_id, line.quantity).where(db.or_(*(
+                db.and_(line.service_ticket_id == ticket.id, line.inventory_id == part.id) for ticket, part in unlinked
+            )))
+        )}
+        for ticket, part in unlinked:
+            units = quantities.get((ticket.id, part.id), 0)
+            activity.parts(ticket.service_date.date(), -units, -units * part.price)
+    _, unassigned = link_changes(existing, "mechanics", "service_tickets", Mechanic)
+    for ticket, mechanic in unassigned:
+        if ticket not in session.deleted:
+            activity.assignment(ticket.service_date.date(), mechanic.id, -1)
+
+    # A deleted mechanic's rows go with them (the foreign key cascades too, where it is enforced)
+    activity.deleted_mechanics = {obj.id for obj in session.deleted if isinstance(obj, Mechanic)}
+    if activity.deleted_mechanics:
+        session.execute(mechanic_days.delete().where(mechanic_days.c.mechanic_id.in_(activity.deleted_mechanics)))
+    session.info["report_activity"] = activity
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_ticket_activity(session, flush_context):
+    activity = session.info.pop("report_activity", None) or Activity()
+    for obj in session.new:
+        if isinstance(obj, ServiceTicket):
+            activity.ticket(obj.service_date.date())
+
+    # Links added through the ORM collections get the junction's default quantity of one
+    objects = [obj for obj in list(session.new) + list(session.dirty) if obj not in session.deleted]
+    linked, _ = link_changes(objects, "inventory_items", "service_tickets", Inventory)
+    for ticket, part in linked:
+        if ticket not in session.deleted:
+            activity.parts(ticket.service_date.date(), 1, part.price)
+    assigned, _ = link_changes(objects, "mechanics", "service_tickets", Mechanic)
+    for ticket, mechanic in assigned:
+        if ticket not in session.deleted:
+            activity.assignment(ticket.service_date.date(), mechanic.id)
+    activity.apply(session.connection())
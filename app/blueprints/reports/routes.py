@@ -0,0 +1,42 @@
+from datetime import date
+from flask import Blueprint, request, jsonify
+from app.auth.decorators import mechanic_token_required
+from app.blueprints.reports.rollups import PERIODS, backfill_command, mechanic_report, ticket_report
+from app.replicas import read_only
+
+reports_blueprint = Blueprint("reports", __name__)
+reports_blueprint.cli.add_command(backfill_command)  # flask reports backfill [--start --end]
+
+
+def _report_args():
+    """(period, start, end) from ?period=day|week|month&start=YYYY-MM-DD&end=YYYY-MM-DD, or an error message."""
+    period = request.args.get("period", "day")
+    if period not in PERIODS:
+        return None, f"period must be one of: {', '.join(PERIODS)}"
+    try:
+        start, end = (date.fromisoformat(request.args[name]) if name in request.args else None
+                      for name in ("start", "end"))
+    except ValueError:
+        return None, "start and end must be dates (YYYY-MM-DD)"
+    return (period, start, end), None
+
+
+@reports_blueprint.route("/tickets", methods=["GET"])
+@read_only
+@mechanic_token_required
+def tickets_report(mechanic_id):
+    # Reads only the daily rollups: cost grows with the number of days, not tickets
+    args, error = _report_args()
+    if error:
+        return jsonify({"message": error}), 400
+    return jsonify(ticket_report(*args)), 200
+
+
+@reports_blueprint.route("/mechanics", methods=["GET"])
+@read_only
+@mechanic_token_required
+def mechanics_report(mechanic_id):
+    args, error = _report_args()
+    if error:
+        return jsonify({"message": error}), 400
+    return jsonify(mechanic_report(*args)), 200
@@ -1,7 +1,15 @@
 from flask import Blueprint, request, jsonify
-from app.models import ServiceTicket, Mechanic, Inventory, db
-from app.auth.decorators import token_required
+from app.models import ServiceTicket, Mechanic, Inventory, inventory_service_ticket, mechanic_service_ticket, db
+from app.auth.decorators import token_required, mechanic_token_required
+from app.blueprints.service_ticket.schemas import service_tickets_row_dumper
 from app.extensions import limiter
+from app.caching import invalidate_tags, customer_tag, inventory_tag, ticket_tag
+from app.blueprints.inventory.stock import MAX_PARTS_PER_REQUEST, StockError, reserve_parts
+from app.blueprints.mechanic.leaderboard import adjust_ticket_counts
+from app.blueprints.reports.rollups import Activity
+from app.serialization import requested_dumper
+from app.group_commit import group_committer
+from app.replicas import read_only
 
 service_ticket_blueprint = Blueprint("service_ticket", __name__)
 
@@ -14,12 +22,27 @@ def create_service_ticket(customer_id):
         description=data.get("description"),
         customer_id=customer_id
     )
-    db.session.add(service_ticket)
-    db.session.commit()
-    return jsonify({"message": "Service ticket created successfully"}), 201
+    ticket_id = group_committer.insert(service_ticket)  # Shares a commit with concurrent requests if enabled
+    invalidate_tags(customer_tag(customer_id))
+    return jsonify({"message": "Service ticket created successfully", "id": ticket_id}), 201
+
+
+@service_ticket_blueprint.route("/by-vin/<string:vin>", methods=["GET"])
+@read_only
+@mechanic_token_required
+def get_service_tickets_by_vin(mechanic_id, vin):
+    # Served by ix_service_tickets_vin_service_date: an index range scan already in date order
+    limit = request.args.get("limit", 100, type=int)
+    dumper = requested_dumper(service_tickets_row_dumper)
+    tickets = db.session.execute(
+        dumper.select().where(ServiceTicket.VIN == vin.upper())
+        .order_by(ServiceTicket.service_date.desc()).limit(max(1, min(limit, 500)))
+    )
+    return jsonify(dumper.dump(tickets)), 200
 
 
 @service_ticket_blueprint.route("/<int:ticket_id>", methods=["GET"])
+@read_only
 @token_required
 def get_service_ticket(customer_id, ticket_id):
     service_ticket = ServiceTicket.query.filter_by(id=ticket_id, customer_id=customer_id).first_or_404()
@@ -40,6 +63,7 @@ def update_service_ticket(customer_id, ticket_id):
     service_ticket.VIN = data.get("VIN", service_ticket.VIN)
     service_ticket.description = data.get("description", service_ticket.description)
     db.session.commit()
+    invalidate_tags(ticket_tag(ticket_id))
     return jsonify({"message": "Service ticket updated successfully"}), 200
 
 
@@ -49,6 +73,7 @@ def delete_service_ticket(customer_id, ticket_id):
     service_ticket = ServiceTicket.query.filter_by(id=ticket_id, customer_id=customer_id).first_or_404()
     db.session.delete(service_ticket)
     db.session.commit()
+    invalidate_tags(customer_tag(customer_id), ticket_tag(ticket_id))
     return jsonify({"message": "Service ticket deleted successfully"}), 200
 
 
@@ -59,24 +84,136 @@ def add_mechanics_to_service_ticket(ticket_id):
 
     # Get mechanic IDs to add or remove from the request payload
     data = request.json
+    if not isinstance(data, dict):
+        return jsonify({"message": "Request body must be a JSON object"}), 400
     add_ids = data.get("add_ids", [])
     remove_ids = data.get("remove_ids", [])
-
-    # Add mechanics to the service ticket
-    for mechanic_id in add_ids:
-        mechanic = Mechanic.query.get(mechanic_id)
-        if mechanic and mechanic not in service_ticket.mechanics:
-            service_ticket.mechanics.append(mechanic)
-
-    # Remove mechanics from the service ticket
-    for mechanic_id in remove_ids:
-        mechanic = Mechanic.query.get(mechanic_id)
-        if mechanic and mechanic in service_ticket.mechanics:
-            service_ticket.mechanics.remove(mechanic)
-
+    # bool is an int subclass; true/false aren't mechanic ids
+    if not all(isinstance(ids, list) and all(isinstance(i, int) and not isinstance(i, bool) for i in ids)
+               for ids in (add_ids, remove_ids)):
+        return jsonify({"message": "add_ids and remove_ids must be lists of integers"}), 400
+    add_ids, remove_ids = set(add_ids), set(remove_ids)
+
+    requested_ids = add_ids | remove_ids
+    known_ids = set()
+    assigned_ids = set()
+    if requested_ids:
+        # One query validates every id, one more finds the current assignments
+        known_ids = set(db.session.scalars(
+            db.select(Mechanic.id).where(Mechanic.id.in_(requested_ids))
+        ))
+        assigned_ids = set(db.session.scalars(
+            db.select(mechanic_service_ticket.c.mechanic_id).where(
+                mechanic_service_ticket.c.service_ticket_id == service_ticket.id,
+                mechanic_service_ticket.c.mechanic_id.in_(requested_ids)
+            )
+        ))
+
+    # Removal wins when an id is in both lists, as it did when adds ran before removes
+    to_add = (add_ids & known_ids) - assigned_ids - remove_ids
+    to_remove = remove_ids & known_ids & assigned_ids
+
+    if to_add:
+        db.session.execute(mechanic_service_ticket.insert(), [
+            {"mechanic_id": mechanic_id, "service_ticket_id": service_ticket.id}
+            for mechanic_id in sorted(to_add)
+        ])
+    if to_remove:
+        db.session.execute(mechanic_service_ticket.delete().where(
+            mechanic_service_ticket.c.service_ticket_id == service_ticket.id,
+            mechanic_service_ticket.c.mechanic_id.in_(to_remove)
+        ))
+    adjust_ticket_counts(db.session.connection(), {
+        **{mechanic_id: 1 for mechanic_id in to_add},
+        **{mechanic_id: -1 for mechanic_id in to_remove}
+    })
+    activity = Activity()
+    for mechanic_id in to_add | to_remove:
+        activity.assignment(service_ticket.service_date.date(), mechanic_id, 1 if mechanic_id in to_add else -1)
+    activity.apply(db.session.connection())
     db.session.commit()
-    return jsonify({"message": "Mechanics updated successfully"}), 200
-
+    if to_add or to_remove:
+        invalidate_tags(ticket_tag(service_ticket.id))
+    # The Core statements bypass the ORM collection, so drop any stale copy of it
+    db.session.expire(service_ticket, ["mechanics"])
+
+    added = {}
+    for mechanic_id in sorted(add_ids):
+        if mechanic_id not in known_ids:
+            added[str(mechanic_id)] = "unknown"
+        elif mechanic_id in to_add:
+            added[str(mechanic_id)] = "added"
+        elif mechanic_id in remove_ids:
+            added[str(mechanic_id)] = "skipped"
+        else:
+            added[str(mechanic_id)] = "already_present"
+
+    removed = {}
+    for mechanic_id in sorted(remove_ids):
+        if mechanic_id not in known_ids:
+            removed[str(mechanic_id)] = "unknown"
+        elif mechanic_id in to_remove:
+            removed[str(mechanic_id)] = "removed"
+        else:
+            removed[str(mechanic_id)] = "not_assigned"
 
+    return jsonify({
+        "message": "Mechanics updated successfully",
+        "added": added,
+        "removed": removed
+    }), 200
 
 
+@service_ticket_blueprint.route("/<int:ticket_id>/parts", methods=["POST"])
+@mechanic_token_required
+def add_parts_to_service_ticket(mechanic_id, ticket_id):
+    # {"parts": [{"inventory_id": 1, "quantity": 2}, ...]}; quantity defaults to 1
+    data = request.json
+    parts = data.get("parts") if isinstance(data, dict) else None  # A bare list or scalar body is a 400 too
+    if not isinstance(parts, list) or not 0 < len(parts) <= MAX_PARTS_PER_REQUEST:
+        return jsonify({"message": f"parts must be a list of 1 to {MAX_PARTS_PER_REQUEST} items"}), 400
+    quantities = {}
+    for part in parts:
+        inventory_id = part.get("inventory_id") if isinstance(part, dict) else None
+        quantity = part.get("quantity", 1) if isinstance(part, dict) else None
+        if not all(isinstance(value, int) and not isinstance(value, bool) and value > 0
+                   for value in (inventory_id, quantity)):
+            return jsonify({"message": "Each part needs an integer inventory_id and a positive integer quantity"}), 400
+        quantities[inventory_id] = quantities.get(inventory_id, 0) + quantity  # Repeated ids add up
+
+    try:
+        results = reserve_parts(ticket_id, quantities)
+    except StockError as e:
+        body = {"message": str(e)}
+        if e.details is not None:
+            body["insufficient"] = e.details
+        return jsonify(body), e.status
+    reserved = [inventory_id for inventory_id, result in results.items() if result != "unknown"]
+    if reserved:
+        invalidate_tags(ticket_tag(ticket_id), *(inventory_tag(inventory_id) for inventory_id in reserved))
+    return jsonify({
+        "message": "Parts added to service ticket",
+        "parts": {str(inventory_id): result for inventory_id, result in results.items()}
+    }), 200
+
+
+@service_ticket_blueprint.route("/<int:ticket_id>/total", methods=["GET"])
+@read_only
+@mechanic_token_required
+def get_service_ticket_total(mechanic_id, ticket_id):
+    # One aggregate over the ticket's lines at current prices; the outer joins keep a ticket with no parts
+    line = inventory_service_ticket.c
+    row = db.session.execute(
+        db.select(
+            ServiceTicket.id,
+            db.func.coalesce(db.func.sum(Inventory.price * line.quantity), 0),
+            db.func.coalesce(db.func.sum(line.quantity), 0),
+        )
+        .outerjoin(inventory_service_ticket, line.service_ticket_id == ServiceTicket.id)
+        .outerjoin(Inventory, Inventory.id == line.inventory_id)
+        .where(ServiceTicket.id == ticket_id)
+        .group_by(ServiceTicket.id)
+    ).first()
+    if row is None:
+        return jsonify({"message": "Service ticket not found"}), 404
+    return jsonify({"ticket_id": ticket_id, "total": round(row[1], 2), "items": row[2]}), 200
@@ -1,13 +1,17 @@
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
 from marshmallow import fields
 from app.models import ServiceTicket
+from app.instrumentation.profiling import TimedDumpMixin
+from app.serialization import RowDumper
 
-class ServiceTicketSchema(SQLAlchemyAutoSchema):
+class ServiceTicketSchema(TimedDumpMixin, SQLAlchemyAutoSchema):
     class Meta:
         model = ServiceTicket
         load_instance = True
 
-    inventory_items = fields.List(fields.Nested("InventorySchema"))  
+    inventory_items = fields.List(fields.Nested("InventorySchema", exclude=("quantity",)))  # Stock level isn't ticket data
 
 service_ticket_schema = ServiceTicketSchema()
-service_tickets_schema = ServiceTicketSchema(many=True)
\ No newline at end of file
+service_tickets_schema = ServiceTicketSchema(many=True)
+service_tickets_row_dumper = RowDumper(service_tickets_schema, ServiceTicket)  # Read-only list fast path
+
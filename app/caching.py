@@ -0,0 +1,99 @@
+from functools import wraps
+from uuid import uuid4
+from flask import Response, current_app, g, request
+from app.extensions import cache
+
+VIEW_CACHE_TIMEOUT = 3600
+TAG_VERSION_PREFIX = "tag-version/"
+INVALIDATION_KEY = TAG_VERSION_PREFIX + "*"  # Changes on every invalidation of any tag
+
+
+def customer_tag(customer_id):
+    return f"customer:{customer_id}"
+
+
+def ticket_tag(ticket_id):
+    return f"ticket:{ticket_id}"
+
+
+def inventory_tag(inventory_id):
+    return f"inventory:{inventory_id}"
+
+
+def _current_versions(tags):
+    keys = [TAG_VERSION_PREFIX + tag for tag in tags]
+    return dict(zip(tags, cache.get_many(*keys)))
+
+
+def _snapshot_versions(tags):
+    """Return the current version of each tag, giving untouched tags a version first.
+
+    Every tag gets a real version so that an evicted version key reads as a mismatch
+    (a cache miss) rather than matching a snapshot taken before any invalidation.
+    """
+    versions = _current_versions(tags)
+    for tag, version in versions.items():
+        if version is None:
+            cache.add(TAG_VERSION_PREFIX + tag, uuid4().hex, timeout=0)
+            versions[tag] = cache.get(TAG_VERSION_PREFIX + tag)
+    return versions
+
+
+def invalidate_tags(*tags):
+    """Invalidate every cached response tagged with any of `tags`."""
+    if tags:
+        versions = {TAG_VERSION_PREFIX + tag: uuid4().hex for tag in tags}
+        cache.set_many({**versions, INVALIDATION_KEY: uuid4().hex}, timeout=0)
+
+
+def add_cache_tags(*tags):
+    """Tag the response being computed by a cached_per_principal view.
+
+    These versions are read after the view has loaded the entities, so one invalidated
+    in between would look current. A response with such tags is therefore only stored
+    if no tag at all was invalidated while the view ran.
+    """
+    snapshot = g.get("cache_tags")
+    if snapshot is not None:
+        snapshot.update(_snapshot_versions([tag for tag in tags if tag not in snapshot]))
+
+
+def cached_per_principal(timeout=VIEW_CACHE_TIMEOUT, tags=None):
+    """Cache a view's response per authenticated principal, invalidated by entity tags.
+
+    Must be applied below token_required / mechanic_token_required so g.principal is
+    set. The key combines the principal with the full request path and query string.
+    `tags` is called with the view arguments and returns the tags known up front; the
+    view may add more with add_cache_tags() as it loads entities. A cached entry is
+    only served while every one of its tags still has the version it was stored with.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            principal = g.get("principal")
+            if principal is None:
+                return f(*args, **kwargs)
+
+            kind, principal_id = principal
+            key = f"view/{kind}:{principal_id}/{request.full_path}"
+            entry = cache.get(key)
+            if entry is not None and _current_versions(list(entry["tags"])) == entry["tags"]:
+                return Response(entry["body"], status=entry["status"], mimetype=entry["mimetype"])
+
+            # Take the snapshot before the view reads the database so a concurrent
+            # write's invalidation can't be recorded as current for stale data
+            invalidation = cache.get(INVALIDATION_KEY)
+            g.cache_tags = _snapshot_versions(tags(*args, **kwargs) if tags else [])
+            upfront = set(g.cache_tags)
+            response = current_app.make_response(f(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed and (
+                    g.cache_tags.keys() <= upfront or cache.get(INVALIDATION_KEY) == invalidation):
+                cache.set(key, {
+                    "body": response.get_data(),
+                    "status": response.status_code,
+                    "mimetype": response.mimetype,
+                    "tags": g.cache_tags
+                }, timeout=timeout)
+            return response
+        return decorated
+    return decorator
@@ -3,14 +3,16 @@ from flask_marshmallow import Marshmallow
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_caching import Cache
-from flask_migrate import Migrate
+from app.auth.passwords import PasswordHasher
+from app import ratelimit_storage  # noqa: F401  Registers the sqlite:// limiter storage scheme
+from app.replicas import RoutingSession
 
 # Initialize extensions
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})  # Read-only views may use replicas
 ma = Marshmallow()
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=["200 per day", "50 per hour"]
 )
 cache = Cache()
-migrate = Migrate()  
\ No newline at end of file
+password_hasher = PasswordHasher()
\ No newline at end of file
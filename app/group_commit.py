@@ -0,0 +1,132 @@
+import threading
+from flask import current_app
+from sqlalchemy import inspect
+from app.extensions import db
+from app.instrumentation.metrics import DESCRIPTIONS
+
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+DESCRIPTIONS["db_group_commit_batch_size"] = ("histogram", "Inserts committed together by group commit.")
+
+
+class _Batch:
+    def __init__(self):
+        self.objects = []
+        self.results = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+
+
+class _Batcher:
+    """Leader/follower batching: the first insert of a batch waits out the window, then commits all of it."""
+
+    def __init__(self, window, max_batch, registry=None):
+        self.window = window
+        self.max_batch = max_batch
+        self.registry = registry
+        self._lock = threading.Lock()
+        self._open = None
+
+    def submit(self, obj):
+        with self._lock:
+            batch = self._open
+            leader = batch is None
+            if leader:
+                batch = self._open = _Batch()
+            index = len(batch.objects)
+            batch.objects.append(obj)
+            if len(batch.objects) >= self.max_batch:
+                self._open = None  # Later arrivals start the next batch
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._open is batch:
+                    self._open = None
+            try:
+                batch.results = self._commit(batch.objects)
+            except BaseException as error:
+                batch.results = [error] * len(batch.objects)
+                raise
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        result = batch.results[index]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def _commit(self, objects):
+        if self.registry is not None:
+            self.registry.observe("db_group_commit_batch_size", (), len(objects), BATCH_SIZE_BUCKETS)
+        try:
+            return _insert(objects)
+        except Exception:
+            if len(objects) == 1:
+                raise
+        # One bad row must not fail everybody else's request: retry one transaction each
+        results = []
+        for obj in objects:
+            try:
+                results.extend(_insert([obj]))
+            except Exception as error:
+                results.append(error)
+        return results
+
+
+def _insert(objects):
+    """Insert `objects` in one transaction of a private session and return their primary keys."""
+    session = db.session.session_factory()
+    try:
+        session.add_all(objects)
+        session.flush()  # Keys are known after the flush; reading them after commit would reload each row
+        keys = [inspect(obj).identity[0] for obj in objects]
+        session.commit()
+        return keys
+    except BaseException:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+class GroupCommitter:
+    """Inserts new rows, optionally sharing one transaction (and one fsync) between concurrent requests.
+
+    Configuration (per config class):
+      GROUP_COMMIT_ENABLED    Batch inserts across requests (default False: one commit per request).
+      GROUP_COMMIT_WINDOW_MS  How long the first insert of a batch waits for others to join (default 5).
+      GROUP_COMMIT_MAX_BATCH  Commit early once this many inserts are waiting (default 100).
+
+    `insert()` returns only after the transaction holding the row has committed, so a client
+    that got a response can rely on its row being durable, exactly as with a commit per
+    request. Batching only happens between threads of one process (gunicorn --threads).
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        batcher = None
+        if app.config.get("GROUP_COMMIT_ENABLED", False):
+            batcher = _Batcher(
+                app.config.get("GROUP_COMMIT_WINDOW_MS", 5) / 1000,
+                app.config.get("GROUP_COMMIT_MAX_BATCH", 100),
+                app.extensions.get("metrics")
+            )
+        app.extensions["group_commit"] = batcher
+
+    def insert(self, obj):
+        """Insert the new ORM object `obj`, commit, and return its primary key."""
+        batcher = current_app.extensions.get("group_commit")
+        if batcher is None:
+            db.session.add(obj)
+            db.session.commit()
+            return inspect(obj).identity[0]
+        return batcher.submit(obj)
+
+
+group_committer = GroupCommitter()
@@ -0,0 +1,28 @@
+from app.auth.token_cache import verified_tokens
+from app.instrumentation import metrics, profiling, sql
+from app.instrumentation.metrics import MetricsRegistry
+
+
+def init_app(app):
+    """Hook request metrics, profiling and SQL instrumentation into the app and expose /metrics.
+
+    Set METRICS_DIR to a directory shared by all gunicorn workers on the host so a
+    scrape of any worker reports the totals of all of them. PROFILING_ENABLED adds a
+    Server-Timing header to requests sent with X-Profile: 1 (or every request with
+    PROFILING_ALWAYS). SLOW_QUERY_THRESHOLD_MS logs slower statements with their plan.
+    """
+    sql.install()
+    profiling.init_app(app)
+    if not app.config.get("METRICS_ENABLED", True):
+        return None
+    registry = MetricsRegistry(app.config.get("METRICS_DIR"), app.config.get("METRICS_FLUSH_INTERVAL", 1.0))
+    registry.register_collector(
+        "auth_token_cache_hits_total", "counter", "Verified-token cache hits.",
+        lambda: {(): verified_tokens.hits}
+    )
+    registry.register_collector(
+        "auth_token_cache_misses_total", "counter", "Verified-token cache misses.",
+        lambda: {(): verified_tokens.misses}
+    )
+    app.extensions["metrics"] = registry
+    return metrics.init_app(app, registry)
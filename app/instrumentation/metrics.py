@@ -0,0 +1,209 @@
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from flask import Response, g, request
+from app.instrumentation.sql import request_db_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+PROMETHEUS_MIMETYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DESCRIPTIONS = {
+    "http_requests_total": ("counter", "HTTP requests by endpoint, method and status code."),
+    "http_request_duration_seconds": ("histogram", "HTTP request latency in seconds."),
+    "http_request_sql_statements": ("histogram", "SQL statements executed per request."),
+    "http_request_db_seconds_total": ("counter", "Cumulative time spent in SQL statements."),
+}
+
+
+class MetricsRegistry:
+    """Counters, histograms and gauges for one worker process.
+
+    With a shared directory configured, each worker periodically writes its values to
+    its own file and a scrape sums the files of every worker, so /metrics reports the
+    same totals no matter which gunicorn worker answers it. Gauges are only summed
+    over workers that are still alive.
+    """
+
+    def __init__(self, directory=None, flush_interval=1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.collectors = []
+        self._counters = {}
+        self._histograms = {}
+        self._flusher_pid = None
+        self._lock = threading.Lock()
+
+    def register_collector(self, name, kind, help_text, collect):
+        """Register a callable returning {labels_tuple: value} sampled at flush/scrape time."""
+        DESCRIPTIONS[name] = (kind, help_text)
+        self.collectors.append((name, kind, collect))
+
+    def inc(self, name, labels, value=1.0):
+        with self._lock:
+            key = (name, labels)
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name, labels, value, buckets):
+        with self._lock:
+            key = (name, labels)
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [list(buckets), [0] * len(buckets), 0.0, 0]
+            index = bisect_left(buckets, value)
+            if index < len(buckets):
+                histogram[1][index] += 1
+            histogram[2] += value
+            histogram[3] += 1
+
+    def snapshot(self):
+        with self._lock:
+            snapshot = {
+                "pid": os.getpid(),
+                "counters": [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                "histograms": [[name, list(labels), *map(_copy, data)] for (name, labels), data in self._histograms.items()],
+                "gauges": []
+            }
+        for name, kind, collect in self.collectors:
+            target = snapshot["gauges"] if kind == "gauge" else snapshot["counters"]
+            target.extend([name, list(labels), value] for labels, value in collect().items())
+        return snapshot
+
+    def maybe_flush(self):
+        """Make sure this worker's values reach the shared directory every flush_interval.
+
+        A daemon thread does the writing, started lazily in each (post-fork) worker so
+        that idle workers still publish their final values.
+        """
+        if not self.directory or self._flusher_pid == os.getpid():
+            return
+        self._flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_forever, name="metrics-flush", daemon=True).start()
+
+    def _flush_forever(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                pass  # A transient filesystem error shouldn't kill the flusher
+
+    def flush(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def _snapshots(self):
+        if not self.directory:
+            return [self.snapshot()]
+        self.flush()
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # Being replaced by its worker right now; picked up next scrape
+        return snapshots
+
+    def render(self):
+        """Aggregate every worker's values into the Prometheus text exposition format."""
+        counters, gauges, histograms = {}, {}, {}
+        for snapshot in self._snapshots():
+            for name, labels, value in snapshot["counters"]:
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0.0) + value
+            if _alive(snapshot["pid"]):
+                for name, labels, value in snapshot["gauges"]:
+                    key = (name, tuple(map(tuple, labels)))
+                    gauges[key] = gauges.get(key, 0.0) + value
+            for name, labels, buckets, counts, total, count in snapshot["histograms"]:
+                key = (name, tuple(map(tuple, labels)))
+                merged = histograms.setdefault(key, [buckets, [0] * len(buckets), 0.0, 0])
+                merged[1] = [a + b for a, b in zip(merged[1], counts)]
+                merged[2] += total
+                merged[3] += count
+
+        families = {}
+        for (name, labels), value in sorted(counters.items()) + sorted(gauges.items()):
+            families.setdefault(name, []).append(f"{name}{_labels(labels)} {_number(value)}")
+        for (name, labels), (buckets, counts, total, count) in sorted(histograms.items()):
+            lines = families.setdefault(name, [])
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{_labels(labels + (('le', _number(bound)),))} {cumulative}")
+            lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+
+        output = []
+        for name in sorted(families):
+            kind, help_text = DESCRIPTIONS.get(name, ("untyped", name))
+            output.append(f"# HELP {name} {help_text}")
+            output.append(f"# TYPE {name} {kind}")
+            output.extend(families[name])
+        return "\n".join(output) + "\n"
+
+
+def _copy(value):
+    return list(value) if isinstance(value, list) else value
+
+
+def _alive(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def init_app(app, registry):
+    @app.before_request
+    def _start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop("request_started", None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        endpoint = request.endpoint or "unmatched"
+        db_stats = request_db_stats()
+        registry.inc("http_requests_total", (("endpoint", endpoint), ("method", request.method), ("status", str(response.status_code))))
+        registry.observe("http_request_duration_seconds", (("endpoint", endpoint), ("method", request.method)), elapsed, LATENCY_BUCKETS)
+        registry.observe("http_request_sql_statements", (("endpoint", endpoint),), db_stats.statements, STATEMENT_BUCKETS)
+        registry.inc("http_request_db_seconds_total", (("endpoint", endpoint),), db_stats.seconds)
+        registry.maybe_flush()
+        return response
+
+    def metrics_view():
+        return Response(registry.render(), mimetype=PROMETHEUS_MIMETYPE)
+
+    app.add_url_rule("/metrics", "metrics", metrics_view)
+    return metrics_view
@@ -0,0 +1,62 @@
+import time
+from contextlib import contextmanager
+from flask import current_app, g, has_app_context, request
+from app.instrumentation.sql import request_db_stats
+
+
+def profiling_active():
+    """True if this request is being profiled (PROFILING_ENABLED plus per-request opt-in)."""
+    return g.get("profile") is not None
+
+
+@contextmanager
+def span(name):
+    """Add the time spent in the block to the named phase of the current request.
+
+    Re-entering a phase that is already running (e.g. a nested schema dump) is not
+    counted twice.
+    """
+    profile = g.get("profile") if has_app_context() else None
+    if profile is None or name in g.profile_open:
+        yield
+        return
+    g.profile_open.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile[name] = profile.get(name, 0.0) + time.perf_counter() - started
+        g.profile_open.discard(name)
+
+
+class TimedDumpMixin:
+    """Schema mixin that attributes dump() time to the "serialize" phase."""
+
+    def dump(self, obj, *, many=None):
+        with span("serialize"):
+            return super().dump(obj, many=many)
+
+
+def init_app(app):
+    @app.before_request
+    def _start_profile():
+        config = current_app.config
+        if not config.get("PROFILING_ENABLED", False):
+            return
+        if config.get("PROFILING_ALWAYS", False) or request.headers.get("X-Profile") == "1":
+            g.profile = {}
+            g.profile_open = set()
+            g.profile_started = time.perf_counter()
+
+    @app.after_request
+    def _server_timing(response):
+        profile = g.get("profile")
+        if profile is None:
+            return response
+        total = time.perf_counter() - g.profile_started
+        db_stats = request_db_stats()
+        metrics = [f"{name};dur={profile[name] * 1000:.2f}" for name in ("auth", "serialize") if name in profile]
+        metrics.append(f'db;dur={db_stats.seconds * 1000:.2f};desc="{db_stats.statements} queries"')
+        metrics.append(f"total;dur={total * 1000:.2f}")
+        response.headers["Server-Timing"] = ", ".join(metrics)
+        return response
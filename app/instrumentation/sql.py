@@ -0,0 +1,90 @@
+import logging
+import time
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_installed = False
+slow_query_log = logging.getLogger("app.slow_query")
+
+EXPLAIN_PREFIXES = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "mysql": "EXPLAIN ",
+    "mariadb": "EXPLAIN ",
+    "postgresql": "EXPLAIN ",
+}
+EXPLAINABLE = ("select", "with", "update", "delete")
+
+
+class RequestDBStats:
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+def request_db_stats():
+    """SQL statement count and cumulative DB time for the current request."""
+    stats = g.get("db_stats")
+    if stats is None:
+        stats = g.db_stats = RequestDBStats()
+    return stats
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    if has_request_context():
+        stats = request_db_stats()
+        stats.statements += 1
+        stats.seconds += elapsed
+    if has_app_context():
+        threshold = current_app.config.get("SLOW_QUERY_THRESHOLD_MS")
+        if threshold is not None and elapsed * 1000 >= threshold:
+            _log_slow_query(conn, statement, parameters, executemany, elapsed)
+
+
+def explain(conn, statement, parameters):
+    """Return the database's plan for `statement` as a list of rows, or None if unsupported.
+
+    Runs on the raw DBAPI connection so it neither re-enters these event hooks nor
+    shows up in the request's statement count.
+    """
+    prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+    if prefix is None or not statement.lstrip().lower().startswith(EXPLAINABLE):
+        return None
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return [tuple(row) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def _log_slow_query(conn, statement, parameters, executemany, elapsed):
+    plan = None
+    if not executemany:
+        try:
+            plan = explain(conn, statement, parameters)
+        except Exception as e:  # The plan is diagnostic only; never fail the real query
+            plan = [(f"EXPLAIN failed: {e}",)]
+    location = f"{request.method} {request.path}" if has_request_context() else "outside request"
+    plan_text = "\n".join("  " + " | ".join(map(str, row)) for row in plan) if plan else "  (no plan)"
+    slow_query_log.warning(
+        "Slow query (%.1f ms) during %s:\n%s\nParameters: %r\nPlan:\n%s",
+        elapsed * 1000, location, statement, parameters, plan_text
+    )
+
+
+def install():
+    """Listen on every Engine (including binds created later) exactly once per process."""
+    global _installed
+    if _installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _installed = True
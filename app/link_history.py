@@ -0,0 +1,27 @@
+from sqlalchemy.orm import attributes
+from app.models import ServiceTicket
+
+
+def _pairs(history, owner, owner_is_ticket):
+    for other in history:
+        yield (owner, other) if owner_is_ticket else (other, owner)
+
+
+def link_changes(objects, ticket_side, other_side, other_type):
+    """Distinct (ticket, other) links added and removed among `objects` since the last flush.
+
+    Either side of a many-to-many relationship can record the same link, so the history of
+    ServiceTicket.<ticket_side> and <other_type>.<other_side> is merged into one set each.
+    Unloaded collections are not loaded; they have no pending changes.
+    """
+    added, removed = set(), set()
+    for obj in objects:
+        if isinstance(obj, ServiceTicket):
+            history = attributes.get_history(obj, ticket_side, passive=attributes.PASSIVE_NO_INITIALIZE)
+            added.update(_pairs(history.added, obj, True))
+            removed.update(_pairs(history.deleted, obj, True))
+        elif isinstance(obj, other_type):
+            history = attributes.get_history(obj, other_side, passive=attributes.PASSIVE_NO_INITIALIZE)
+            added.update(_pairs(history.added, obj, False))
+            removed.update(_pairs(history.deleted, obj, False))
+    return added, removed
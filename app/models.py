@@ -1,6 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import List  # Import list for type hints
-from sqlalchemy.orm import relationship, Mapped, mapped_column
+from sqlalchemy.orm import relationship, Mapped, mapped_column, validates
 from .extensions import db
 from werkzeug.security import check_password_hash
 from sqlalchemy import Float
@@ -30,12 +30,16 @@ class Mechanic(db.Model):
 
 class ServiceTicket(db.Model):  
     __tablename__ = "service_tickets"
+    __table_args__ = (
+        # Vehicle history: every ticket for a VIN, newest first
+        db.Index("ix_service_tickets_vin_service_date", "VIN", "service_date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     VIN: Mapped[str] = mapped_column(db.String(17), nullable=False)  
     description: Mapped[str] = mapped_column(db.String(300), nullable=False)
-    service_date: Mapped[datetime] = mapped_column(db.DateTime, nullable=False, default=datetime.utcnow)
-    customer_id: Mapped[int] = mapped_column(db.ForeignKey("customers.id"), nullable=False)
+    service_date: Mapped[datetime] = mapped_column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    customer_id: Mapped[int] = mapped_column(db.ForeignKey("customers.id"), nullable=False, index=True)
 
     # Relationship with Customer
     customer: Mapped["Customer"] = relationship("Customer", back_populates="service_tickets")
@@ -51,15 +55,23 @@ class ServiceTicket(db.Model):
     inventory_items: Mapped[list["Inventory"]] = relationship(
         "Inventory",
         secondary="inventory_service_ticket",
-        back_populates="service_tickets"
+        back_populates="service_tickets",
+        order_by="Inventory.id"  # Deterministic dump order, shared with the row dumper
     )
 
+    @validates("VIN")
+    def normalize_vin(self, key, vin):
+        """Store VINs uppercase so GET /service-tickets/by-vin/<vin> can match them exactly on the index."""
+        return vin.strip().upper() if isinstance(vin, str) else vin
+
 
 # Junction table for Mechanic and ServiceTicket
 mechanic_service_ticket = db.Table(
     "mechanic_service_ticket",
     db.Column("mechanic_id", db.Integer, db.ForeignKey("mechanics.id"), primary_key=True),
-    db.Column("service_ticket_id", db.Integer, db.ForeignKey("service_tickets.id"), primary_key=True)
+    db.Column("service_ticket_id", db.Integer, db.ForeignKey("service_tickets.id"), primary_key=True),
+    # The composite primary key only serves lookups by mechanic_id
+    db.Index("ix_mechanic_service_ticket_service_ticket_id", "service_ticket_id")
 )
 
 
@@ -67,7 +79,9 @@ mechanic_service_ticket = db.Table(
 inventory_service_ticket = db.Table(
     "inventory_service_ticket",
     db.Column("inventory_id", db.Integer, db.ForeignKey("inventory.id"), primary_key=True),
-    db.Column("service_ticket_id", db.Integer, db.ForeignKey("service_tickets.id"), primary_key=True)
+    db.Column("service_ticket_id", db.Integer, db.ForeignKey("service_tickets.id"), primary_key=True),
+    db.Column("quantity", db.Integer, nullable=False, default=1, server_default="1"),  # Units of the part on the ticket
+    db.Index("ix_inventory_service_ticket_service_ticket_id", "service_ticket_id")
 )
 
 
@@ -90,14 +104,49 @@ class Customer(db.Model):
 
 class Inventory(db.Model): 
     __tablename__ = "inventory"
+    __table_args__ = (
+        db.CheckConstraint("quantity >= 0", name="ck_inventory_quantity_nonnegative"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(db.String(100), nullable=False)
-    price: Mapped[float] = mapped_column(db.Float(), nullable=False)
+    price: Mapped[float] = mapped_column(db.Float(), nullable=False, index=True)  # Search price ranges
+    # Units in stock; only ever changed by conditional UPDATEs (see inventory/stock.py) or an explicit count
+    quantity: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0, server_default="0")
 
     # Many-to-Many Relationship with ServiceTicket
     service_tickets: Mapped[List["ServiceTicket"]] = relationship(
         "ServiceTicket",
         secondary="inventory_service_ticket",
         back_populates="inventory_items"
-    )
\ No newline at end of file
+    )
+
+# Case-insensitive name search: prefix lookups are range seeks on lower(name) (see inventory/search.py)
+db.Index("ix_inventory_name_lower", db.func.lower(Inventory.name))
+
+
+class MechanicTicketCount(db.Model):
+    """Maintained count of mechanic_service_ticket rows per mechanic (see mechanic/leaderboard.py)."""
+    __tablename__ = "mechanic_ticket_counts"
+
+    mechanic_id: Mapped[int] = mapped_column(db.ForeignKey("mechanics.id", ondelete="CASCADE"), primary_key=True)
+    ticket_count: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0, index=True)
+
+
+class TicketReportDay(db.Model):
+    """Maintained daily rollup of tickets and parts by service_date (see reports/rollups.py)."""
+    __tablename__ = "report_ticket_days"
+
+    day: Mapped[date] = mapped_column(db.Date, primary_key=True)
+    ticket_count: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0)
+    parts_units: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0)
+    parts_revenue: Mapped[float] = mapped_column(db.Float(), nullable=False, default=0)
+
+
+class MechanicReportDay(db.Model):
+    """Maintained daily count of tickets assigned per mechanic, by service_date (see reports/rollups.py)."""
+    __tablename__ = "report_mechanic_days"
+
+    day: Mapped[date] = mapped_column(db.Date, primary_key=True)
+    mechanic_id: Mapped[int] = mapped_column(db.ForeignKey("mechanics.id", ondelete="CASCADE"), primary_key=True)
+    ticket_count: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0)
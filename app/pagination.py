@@ -0,0 +1,127 @@
+import base64
+import binascii
+import json
+from flask import jsonify, request, url_for
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def encode_cursor(last_id):
+    """Encode the last primary key of a page as an opaque cursor string."""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor (a bare integer id is accepted too).
+
+    Raises ValueError if the cursor is malformed.
+    """
+    if cursor.isdigit():
+        return int(cursor)
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = data["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(last_id, int):
+        raise ValueError("Invalid cursor")
+    return last_id
+
+
+def encode_sort_cursor(sort_value, last_id):
+    """Encode the position after a row in a (sort_value, id) ordering."""
+    raw = json.dumps({"k": sort_value, "id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_sort_cursor(cursor):
+    """Decode a cursor produced by encode_sort_cursor into (sort_value, id).
+
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        sort_value, last_id = data["k"], data["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(last_id, int) or not isinstance(sort_value, (str, int, float)):
+        raise ValueError("Invalid cursor")
+    return sort_value, last_id
+
+
+def parse_limit(value, default=DEFAULT_LIMIT):
+    """Clamp a requested page size to 1..MAX_LIMIT."""
+    if value is None:
+        return default
+    return max(1, min(value, MAX_LIMIT))
+
+
+def keyset_page(query, column, after=None, limit=DEFAULT_LIMIT):
+    """Return one page of `query` ordered by `column`, starting after the id `after`.
+
+    Fetches limit + 1 rows so the next cursor can be produced without a COUNT(*).
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    if after is not None:
+        query = query.filter(column > after)
+    rows = query.order_by(column).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, column.key))
+
+
+def sorted_keyset_page(query, sort_key, id_column, after=None, limit=DEFAULT_LIMIT, descending=False):
+    """Like keyset_page, ordered by the expression `sort_key` with `id_column` breaking ties.
+
+    `after` is a (sort_value, id) pair from decode_sort_cursor. The sort key is added as the
+    last column of each row; an index on it (which carries the primary key) serves both the
+    filter and the ORDER BY, so a page costs the same at any depth.
+    """
+    if after is not None:
+        value, last_id = after
+        if descending:
+            query = query.filter((sort_key < value) | ((sort_key == value) & (id_column < last_id)))
+        else:
+            query = query.filter((sort_key > value) | ((sort_key == value) & (id_column > last_id)))
+    order = (sort_key.desc(), id_column.desc()) if descending else (sort_key, id_column)
+    rows = query.add_columns(sort_key).order_by(*order).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_sort_cursor(last[-1], getattr(last, id_column.key))
+
+
+def keyset_list_response(query, column, schema, default_limit=MAX_LIMIT):
+    """Serve a page of `query` as a bare JSON list, advertising the next page in headers.
+
+    Reads ?after=<cursor>&limit=N from the request. The list body keeps the shape older
+    clients expect; the cursor for the next page goes in X-Next-Cursor and a Link header.
+    """
+    limit = parse_limit(request.args.get("limit", type=int), default=default_limit)
+    after = request.args.get("after")
+    try:
+        after_id = decode_cursor(after) if after else None
+    except ValueError:
+        return jsonify({"message": "Invalid cursor"}), 400
+
+    items, next_cursor = keyset_page(query, column, after_id, limit)
+    return list_response(schema.dump(items), next_cursor, limit)
+
+
+def list_response(body, next_cursor, limit):
+    """JSON list response whose next page is advertised in X-Next-Cursor and a Link header."""
+    response = jsonify(body)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+        next_url = url_for(request.endpoint, _external=False, **{
+            **request.view_args, **request.args.to_dict(), "after": next_cursor, "limit": limit
+        })
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return response, 200
@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+import weakref
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+_engines = weakref.WeakSet()
+_fork_hook_registered = False
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self._stats_lock = threading.Lock()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            with self._stats_lock:
+                self.checkouts += 1
+                self.timeouts += timed_out
+                self.wait_seconds += time.perf_counter() - started
+
+
+def configure(app):
+    """Use the instrumented pool wherever the config asks for a sized pool.
+
+    Call before db.init_app(). Configs without pool_size (e.g. in-memory SQLite,
+    which needs a StaticPool) are left alone.
+    """
+    options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    if "pool_size" in options:
+        options.setdefault("poolclass", InstrumentedQueuePool)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+
+def init_app(app, db):
+    """Track the app's engines so they can be disposed after fork and report their pools."""
+    global _fork_hook_registered
+    with app.app_context():
+        _engines.update(db.engines.values())
+    if not _fork_hook_registered and hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=dispose_after_fork)
+        _fork_hook_registered = True
+
+    registry = app.extensions.get("metrics")
+    if registry is not None:
+        for name, key, kind, help_text in POOL_METRICS:
+            registry.register_collector(name, kind, help_text, _pool_collector(app, db, key))
+
+
+POOL_METRICS = (
+    ("db_pool_size", "size", "gauge", "Configured connection pool size."),
+    ("db_pool_checked_out", "checked_out", "gauge", "Connections currently checked out of the pool."),
+    ("db_pool_overflow", "overflow", "gauge", "Connections open beyond pool_size."),
+    ("db_pool_checkouts_total", "checkouts", "counter", "Pool checkouts."),
+    ("db_pool_timeouts_total", "timeouts", "counter", "Checkouts that timed out waiting for a connection."),
+    ("db_pool_wait_seconds_total", "wait_seconds", "counter", "Time spent waiting for a pooled connection."),
+)
+
+
+def _pool_collector(app, db, key):
+    def collect():
+        return {(("bind", bind),): values[key] for bind, values in pool_stats(app, db).items()}
+    return collect
+
+
+def dispose_after_fork():
+    """Drop connections inherited from the parent without closing the parent's sockets.
+
+    Covers gunicorn's preload_app, where the app (and possibly a connection used at
+    startup) is created in the master before workers fork.
+    """
+    for engine in list(_engines):
+        engine.dispose(close=False)
+
+
+def warm(app, db, connections=None):
+    """Open pool connections up front so a worker's first requests don't pay for connecting."""
+    with app.app_context():
+        for engine in db.engines.values():
+            count = connections if connections is not None else app.config.get(
+                "SQLALCHEMY_POOL_WARM", getattr(engine.pool, "size", lambda: 1)()
+            )
+            opened = []
+            try:
+                for _ in range(count):
+                    opened.append(engine.connect())
+            finally:
+                for connection in opened:
+                    connection.close()
+
+
+def pool_stats(app, db):
+    """Per-bind pool statistics: {bind: {checked_out, overflow, size, checkouts, timeouts, wait_seconds}}."""
+    stats = {}
+    with app.app_context():
+        for bind, engine in db.engines.items():
+            pool = engine.pool
+            if not isinstance(pool, QueuePool):
+                continue
+            stats[bind or "default"] = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "checkouts": getattr(pool, "checkouts", 0),
+                "timeouts": getattr(pool, "timeouts", 0),
+                "wait_seconds": getattr(pool, "wait_seconds", 0.0),
+            }
+    return stats
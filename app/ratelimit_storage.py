@@ -0,0 +1,176 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from limits.storage import MovingWindowSupport, Storage
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to SQLite's own busy-timeout polling
+    fcntl = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (key TEXT PRIMARY KEY, value INTEGER NOT NULL, expiry REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS ix_counters_expiry ON counters (expiry);
+CREATE TABLE IF NOT EXISTS window_entries (key TEXT NOT NULL, ts REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS ix_window_entries_key_ts ON window_entries (key, ts);
+"""
+
+PURGE_EVERY = 1000  # Writes between sweeps of expired keys left behind by clients that went away
+
+
+class SQLiteStorage(Storage, MovingWindowSupport):
+    """Rate limit counters in a SQLite file shared by every worker process on the host.
+
+    Registered for ``sqlite:///path/to/file.db`` storage URIs. The database runs in WAL mode
+    so reads never block; every write is a short ``BEGIN IMMEDIATE`` transaction. Writers first
+    queue on a thread lock and a ``flock`` of a sidecar ``.lock`` file: the kernel wakes the next
+    waiter as soon as the lock is free, whereas SQLite's busy handler sleeps in growing steps
+    (up to 100ms) and turns contention into long tail latency. Supports the fixed-window and
+    moving-window strategies.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri=None, wrap_exceptions=False, timeout=5.0, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        path = urlparse(uri).path if uri else ""
+        # sqlite:///relative.db -> "relative.db", sqlite:////abs/file.db -> "/abs/file.db"
+        self.path = path[1:] if path.startswith("/") else path
+        if not self.path:
+            raise ValueError("SQLite rate limit storage needs a file path, e.g. sqlite:////tmp/ratelimit.db")
+        self.timeout = float(timeout)
+        self._local = threading.local()
+        self._thread_lock = threading.Lock()
+        self._lock_fd, self._lock_pid = None, None
+        self._writes = 0
+        self._connection()  # Create the schema up front so a bad path fails at startup
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self):
+        """One connection per thread, reopened in forked children (connections must not cross a fork)."""
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")  # Counters may lose the last write on power loss, never on a crash
+            connection.executescript(SCHEMA)
+            local.connection, local.pid = connection, os.getpid()
+        return local.connection
+
+    @contextmanager
+    def _writer_lock(self):
+        """Serialise writers: threads on a mutex, processes on flock (one descriptor per process)."""
+        with self._thread_lock:
+            if fcntl is None:
+                yield
+                return
+            if self._lock_pid != os.getpid():
+                self._lock_fd, self._lock_pid = os.open(self.path + ".lock", os.O_CREAT | os.O_RDWR, 0o644), os.getpid()
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _write(self, work):
+        """Run `work(connection, now)` in an immediate (write-locked) transaction."""
+        connection = self._connection()
+        with self._writer_lock():
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(connection, time.time())
+                self._writes += 1
+                if self._writes % PURGE_EVERY == 0:
+                    self._purge(connection)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return result
+
+    def _purge(self, connection):
+        now = time.time()
+        connection.execute("DELETE FROM counters WHERE expiry <= ?", (now,))
+        # Moving windows are at most a day long in this app; older entries can never count again
+        connection.execute("DELETE FROM window_entries WHERE ts <= ?", (now - 86400,))
+
+    # Fixed window
+
+    def incr(self, key, expiry, amount=1):
+        def work(connection, now):
+            connection.execute("DELETE FROM counters WHERE key = ? AND expiry <= ?", (key, now))
+            return connection.execute(
+                "INSERT INTO counters (key, value, expiry) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = value + excluded.value RETURNING value",
+                (key, amount, now + expiry),
+            ).fetchone()[0]
+        return self._write(work)
+
+    def get(self, key):
+        row = self._connection().execute(
+            "SELECT value FROM counters WHERE key = ? AND expiry > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        now = time.time()
+        row = self._connection().execute(
+            "SELECT expiry FROM counters WHERE key = ? AND expiry > ?", (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    # Moving window
+
+    def acquire_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+
+        def work(connection, now):
+            connection.execute("DELETE FROM window_entries WHERE key = ? AND ts <= ?", (key, now - expiry))
+            # Full if the entry `limit - amount` places back from the newest is still in the window
+            blocking = connection.execute(
+                "SELECT 1 FROM window_entries WHERE key = ? ORDER BY ts DESC LIMIT 1 OFFSET ?",
+                (key, limit - amount),
+            ).fetchone()
+            if blocking:
+                return False
+            connection.executemany("INSERT INTO window_entries (key, ts) VALUES (?, ?)", [(key, now)] * amount)
+            return True
+        return self._write(work)
+
+    def get_moving_window(self, key, limit, expiry):
+        now = time.time()
+        oldest, count = self._connection().execute(
+            "SELECT MIN(ts), COUNT(*) FROM window_entries WHERE key = ? AND ts > ?", (key, now - expiry)
+        ).fetchone()
+        return (oldest, count) if count else (now, 0)
+
+    # Housekeeping
+
+    def check(self):
+        try:
+            self._connection().execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        def work(connection, now):
+            removed = connection.execute("DELETE FROM counters").rowcount
+            return removed + connection.execute("DELETE FROM window_entries").rowcount
+        return self._write(work)
+
+    def clear(self, key):
+        def work(connection, now):
+            connection.execute("DELETE FROM counters WHERE key = ?", (key,))
+            connection.execute("DELETE FROM window_entries WHERE key = ?", (key,))
+        self._write(work)
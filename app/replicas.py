@@ -0,0 +1,101 @@
+import random
+import time
+from functools import wraps
+from flask import current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import exc
+from app.instrumentation.metrics import DESCRIPTIONS
+
+BIND_PREFIX = "replica_"
+DESCRIPTIONS["db_replica_fallbacks_total"] = ("counter", "Read-only requests retried on the primary after a replica failed.")
+
+
+class ReplicaRouter:
+    """Picks a healthy replica bind for read-only requests; a failed replica sits out for retry_seconds."""
+
+    def __init__(self, keys, retry_seconds):
+        self.keys = keys
+        self.retry_seconds = retry_seconds
+        self._down_until = {}
+
+    def choose(self):
+        now = time.monotonic()
+        healthy = [key for key in self.keys if self._down_until.get(key, 0) <= now]
+        return random.choice(healthy) if healthy else None
+
+    def mark_down(self, key):
+        self._down_until[key] = time.monotonic() + self.retry_seconds
+
+
+def configure(app):
+    """Add a bind per URI in SQLALCHEMY_REPLICA_URIS. Call before db.init_app()."""
+    uris = app.config.get("SQLALCHEMY_REPLICA_URIS") or []
+    binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+    for number, uri in enumerate(uris, start=1):
+        binds[f"{BIND_PREFIX}{number}"] = uri
+    app.config["SQLALCHEMY_BINDS"] = binds
+
+
+def init_app(app, db):
+    keys = [key for key in app.config["SQLALCHEMY_BINDS"] if key.startswith(BIND_PREFIX)]
+    for key in keys:
+        # Replicas hold no tables of their own: keep them out of create_all()/drop_all()
+        db.metadatas.pop(key, None)
+    app.extensions["replicas"] = ReplicaRouter(keys, app.config.get("DB_REPLICA_RETRY_SECONDS", 30)) if keys else None
+
+
+def _writes(session, clause):
+    if session._flushing or session.new or session.deleted or session.identity_map.check_modified():
+        return True
+    return getattr(clause, "is_dml", False) or getattr(clause, "_for_update_arg", None) is not None
+
+
+class RoutingSession(Session):
+    """db.session that sends the reads of read_only() views to a replica.
+
+    Everything else uses the normal binds. Once a read-only request writes (flush,
+    INSERT/UPDATE/DELETE or SELECT ... FOR UPDATE) it sticks to the primary, so it
+    reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context() and g.get("db_read_only") and not g.get("db_primary"):
+            if _writes(self, clause):
+                g.db_primary = True
+            else:
+                key = g.get("db_replica")
+                if key is None:
+                    key = g.db_replica = current_app.extensions["replicas"].choose()
+                if key is not None:
+                    return self._db.engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def read_only(view):
+    """Serve the view from a replica when replicas are configured.
+
+    A request keeps one replica throughout. If a replica statement fails, the replica
+    is skipped for DB_REPLICA_RETRY_SECONDS and the view runs again on the primary.
+    Responses streamed after the view returns can't be retried.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        router = current_app.extensions.get("replicas")
+        if router is None:
+            return view(*args, **kwargs)
+        g.db_read_only = True
+        try:
+            return view(*args, **kwargs)
+        except exc.DBAPIError:
+            key = g.get("db_replica")
+            if key is None or g.get("db_primary"):
+                raise
+            current_app.extensions["sqlalchemy"].session.rollback()
+            router.mark_down(key)
+            registry = current_app.extensions.get("metrics")
+            if registry is not None:
+                registry.inc("db_replica_fallbacks_total", (("bind", key),))
+            current_app.logger.warning("Replica %s failed; retrying %s on the primary", key, view.__name__)
+            g.db_read_only = False
+            return view(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,38 @@
+from flask import Response, current_app, request, stream_with_context
+from app.extensions import db
+from app.serialization import RowDumper
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 500
+
+
+def wants_ndjson():
+    """True when the client asked for a streamed NDJSON body (?stream=ndjson or Accept header)."""
+    if request.args.get("stream") == "ndjson":
+        return True
+    return request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+
+def ndjson_response(statement, column, schema, batch_size=STREAM_BATCH_SIZE):
+    """Stream the rows of `statement` as NDJSON in `column` order, one serialized object per line.
+
+    Rows are read as keyset pages of `batch_size` (WHERE column > last ORDER BY column LIMIT n),
+    like keyset_page(), and serialized a page at a time, so memory stays flat regardless of
+    table size or whether the driver buffers whole result sets. `schema` must be a many=True
+    schema, or a RowDumper with `statement` from its select().
+    """
+    rows_only = isinstance(schema, RowDumper)
+
+    def generate():
+        after = None
+        while True:
+            page = statement if after is None else statement.where(column > after)
+            result = db.session.execute(page.order_by(column).limit(batch_size))
+            rows = result.all() if rows_only else result.scalars().all()
+            if rows:
+                yield "".join(current_app.json.dumps(item) + "\n" for item in schema.dump(rows))
+            if len(rows) < batch_size:
+                return
+            after = getattr(rows[-1], column.key)
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
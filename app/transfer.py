@@ -0,0 +1,206 @@
+import gzip
+import json
+from contextlib import contextmanager
+from datetime import date, datetime
+import click
+from flask.cli import with_appcontext
+from app.extensions import cache, db
+
+FORMAT = "mechanic-api-export"
+VERSION = 1
+BATCH_SIZE = 10000
+GZIP_LEVEL = 1  # Export speed matters more than a few percent of file size
+
+
+def _encode(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot export {type(value).__name__} values")
+
+
+def _decoders(table, columns):
+    """Per-column functions turning exported JSON values back into column values."""
+    decoders = []
+    for name in columns:
+        column_type = table.c[name].type
+        if isinstance(column_type, db.DateTime):
+            decoders.append(datetime.fromisoformat)
+        elif isinstance(column_type, db.Date):
+            decoders.append(date.fromisoformat)
+        else:
+            decoders.append(None)
+    return decoders
+
+
+@contextmanager
+def _snapshot():
+    """A connection inside one read transaction, so every table is read as of the same moment."""
+    with db.engine.connect() as connection:
+        if connection.dialect.name == "sqlite":
+            # pysqlite doesn't begin a transaction for SELECTs; an explicit BEGIN holds one read snapshot
+            connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+            connection.exec_driver_sql("BEGIN")
+            try:
+                yield connection
+            finally:
+                connection.exec_driver_sql("ROLLBACK")
+            return
+        options = {"isolation_level": "REPEATABLE READ"}  # One snapshot for the whole transaction
+        if connection.dialect.name == "postgresql":
+            options["postgresql_readonly"] = True
+        connection = connection.execution_options(**options)
+        with connection.begin():
+            yield connection
+
+
+def _after(columns, values):
+    """Rows after `values` in `columns` order, as keyset_page() compares a single key.
+
+    Composite keys are spelled out as (a > x) OR (a = x AND b > y) rather than a row-value
+    comparison, which the same primary key index serves on every dialect.
+    """
+    condition = columns[-1] > values[-1]
+    for column, value in zip(reversed(columns[:-1]), reversed(values[:-1])):
+        condition = (column > value) | ((column == value) & condition)
+    return condition
+
+
+def export_data(path, batch_size=BATCH_SIZE):
+    """Write every table to a gzip-compressed NDJSON file; returns {table: rows}.
+
+    Tables are written in dependency order, each as a header line
+    {"table": ..., "columns": [...]} followed by one JSON array per row. All tables are
+    read in a single REPEATABLE READ transaction (an explicit BEGIN on SQLite), so writes
+    during the export can't leave junction rows pointing at tickets that weren't exported.
+    Each table is read in primary key order as keyset pages of `batch_size`
+    (WHERE key > last ORDER BY key LIMIT n), so memory stays flat however large the
+    tables are, even on drivers that buffer whole result sets.
+    """
+    counts = {}
+    with _snapshot() as connection, gzip.open(path, "wt", encoding="utf-8", compresslevel=GZIP_LEVEL) as out:
+        out.write(json.dumps({"format": FORMAT, "version": VERSION}) + "\n")
+        for table in db.metadata.sorted_tables:
+            columns = [column.name for column in table.columns]
+            out.write(json.dumps({"table": table.name, "columns": columns}) + "\n")
+            key = list(table.primary_key.columns)
+            positions = [columns.index(column.name) for column in key]
+            statement = db.select(*table.columns).order_by(*key).limit(batch_size)
+            counts[table.name] = 0
+            last = None
+            while True:
+                rows = connection.execute(statement if last is None else statement.where(_after(key, last))).all()
+                out.write("".join(json.dumps(list(row), default=_encode) + "\n" for row in rows))
+                counts[table.name] += len(rows)
+                if len(rows) < batch_size:
+                    break
+                last = [rows[-1][position] for position in positions]
+    return counts
+
+
+def _reset_sequence(table):
+    # Explicit ids don't advance PostgreSQL sequences; MySQL and SQLite catch up on their own
+    column = table.autoincrement_column
+    if column is None or db.session.get_bind().dialect.name != "postgresql":
+        return
+    db.session.execute(
+        db.select(db.func.setval(db.func.pg_get_serial_sequence(table.name, column.name),
+                                 db.func.coalesce(db.func.max(column), 0) + 1, False))
+    )
+
+
+def _read_header(line, expected_key):
+    try:
+        header = json.loads(line)
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or expected_key not in header:
+        raise click.ClickException(f"Not a {FORMAT} file, or it is corrupt.")
+    return header
+
+
+def import_data(path, batch_size=BATCH_SIZE, replace=False):
+    """Load a file written by export_data into empty tables; returns {table: rows}.
+
+    Rows are inserted as multi-row executemany batches of `batch_size` in the file's
+    (dependency) order, each committed on its own so no transaction's undo log or locks
+    grow with the table. An import that fails partway leaves the committed batches behind;
+    run it again with `replace`, which deletes existing rows in every table first
+    (otherwise non-empty tables are refused). The cache is cleared afterwards.
+    """
+    tables = db.metadata.tables
+    if replace:
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+    else:
+        occupied = [table.name for table in db.metadata.sorted_tables
+                    if db.session.execute(db.select(db.literal(1)).select_from(table).limit(1)).first()]
+        db.session.rollback()
+        if occupied:
+            raise click.ClickException(f"Tables are not empty: {', '.join(occupied)}. Use --replace to overwrite.")
+
+    counts = {}
+    table = None
+    batch = []
+
+    def flush():
+        if batch:
+            db.session.execute(table.insert(), batch)
+            db.session.commit()
+            counts[table.name] += len(batch)
+            batch.clear()
+
+    def finish():
+        flush()
+        _reset_sequence(table)
+        db.session.commit()
+
+    with gzip.open(path, "rt", encoding="utf-8") as stream:
+        header = _read_header(stream.readline(), "format")
+        if header["format"] != FORMAT or header["version"] != VERSION:
+            raise click.ClickException(f"Unsupported export format {header['format']} version {header['version']}.")
+        for line in stream:
+            if line.startswith("{"):
+                if table is not None:
+                    finish()
+                header = _read_header(line, "table")
+                if header["table"] not in tables:
+                    raise click.ClickException(f"Unknown table {header['table']}; is the schema up to date?")
+                table = tables[header["table"]]
+                columns = header["columns"]
+                unknown = set(columns) - set(table.c.keys())
+                if unknown:
+                    raise click.ClickException(f"Unknown columns in {table.name}: {', '.join(sorted(unknown))}.")
+                decoders = _decoders(table, columns)
+                counts[table.name] = 0
+                continue
+            values = json.loads(line)
+            batch.append({name: decode(value) if decode and value is not None else value
+                          for name, decode, value in zip(columns, decoders, values)})
+            if len(batch) >= batch_size:
+                flush()
+        if table is not None:
+            finish()
+    cache.clear()  # Cached responses, totals and tag versions describe the old rows, in every worker
+    return counts
+
+
+@click.command("export")
+@with_appcontext
+@click.argument("path", type=click.Path(dir_okay=False, writable=True))
+@click.option("--batch-size", default=BATCH_SIZE, show_default=True)
+def export_command(path, batch_size):
+    """Export every table to a gzip-compressed NDJSON file."""
+    counts = export_data(path, batch_size)
+    click.echo(f"Exported {sum(counts.values())} rows from {len(counts)} tables to {path}.")
+
+
+@click.command("import")
+@with_appcontext
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--batch-size", default=BATCH_SIZE, show_default=True)
+@click.option("--replace", is_flag=True, help="Delete existing rows first instead of refusing non-empty tables.")
+def import_command(path, batch_size, replace):
+    """Import a file written by `flask export` into an up-to-date schema."""
+    counts = import_data(path, batch_size, replace)
+    click.echo(f"Imported {sum(counts.values())} rows into {len(counts)} tables.")
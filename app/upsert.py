@@ -0,0 +1,33 @@
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+
+def increment(connection, table, rows, keys):
+    """Add each row's non-key values onto the row with the same `keys`, inserting rows that don't exist.
+
+    One multi-row INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE where the dialect has
+    it, so concurrent first writes to a key can't collide. Elsewhere it falls back to an
+    UPDATE per row followed by an INSERT when nothing matched. Every row needs the same keys.
+    """
+    if not rows:
+        return
+    counters = [name for name in rows[0] if name not in keys]
+    dialect = connection.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        statement = (sqlite if dialect == "sqlite" else postgresql).insert(table).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c[name] for name in keys],
+            set_={name: table.c[name] + statement.excluded[name] for name in counters})
+    elif dialect in ("mysql", "mariadb"):
+        statement = mysql.insert(table).values(rows)
+        statement = statement.on_duplicate_key_update(
+            {name: table.c[name] + statement.inserted[name] for name in counters})
+    else:
+        for row in rows:
+            updated = connection.execute(
+                table.update().where(*(table.c[name] == row[name] for name in keys))
+                .values({name: table.c[name] + row[name] for name in counters})
+            ).rowcount
+            if not updated:
+                connection.execute(table.insert().values(row))
+        return
+    connection.execute(statement)
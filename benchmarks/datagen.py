@@ -0,0 +1,115 @@
+"""Synthetic data generator for benchmarks and load tests.
+
+Creates the schema and fills it with a deterministic dataset (same --seed, same rows):
+N customers, M mechanics, K parts and T service tickets spread over the last --days
+days, each ticket with two part lines and one or two mechanics. The maintained
+aggregates (mechanic leaderboard, report rollups) are rebuilt afterwards, since the
+rows are written with bulk Core inserts that bypass the ORM.
+
+    python -m benchmarks.datagen --database-url sqlite:////tmp/load.db --customers 10000 --tickets 100000
+
+Every account's password is PASSWORD below (hashed once with PASSWORD_HASH_METHOD, default
+scrypt) and its email is customer<n>@example.com / mechanic<n>@example.com. Ticket n
+(1-based) belongs to customer (n - 1) % N + 1 and has VIN "VIN" + n padded to 17
+characters, so load tests can derive valid requests without querying.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from werkzeug.security import generate_password_hash
+from app import create_app, db
+from app.auth.passwords import DEFAULT_METHOD
+from app.blueprints.mechanic.leaderboard import rebuild_ticket_counts
+from app.blueprints.reports.rollups import backfill_rollups
+from app.models import Customer, Inventory, Mechanic, ServiceTicket, inventory_service_ticket, mechanic_service_ticket
+
+PASSWORD = "password123"
+BATCH_SIZE = 10000
+WORDS = ["brake", "pad", "rotor", "oil", "filter", "air", "cabin", "spark", "plug", "belt", "hose",
+         "clamp", "wiper", "blade", "bulb", "fuse", "sensor", "pump", "gasket", "seal", "bearing", "strut"]
+
+
+class DataConfig:
+    TESTING = True
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    CACHE_TYPE = "SimpleCache"
+    RATELIMIT_ENABLED = False
+    METRICS_ENABLED = False
+    SWAGGER_UI_ENABLED = False
+
+
+def ticket_vin(ticket_id):
+    return f"VIN{ticket_id:014}"
+
+
+def ticket_customer(ticket_id, customers):
+    return (ticket_id - 1) % customers + 1
+
+
+def _insert(target, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            db.session.execute(db.insert(target), batch)
+            batch = []
+    if batch:
+        db.session.execute(db.insert(target), batch)
+
+
+def populate(customers, tickets, parts, mechanics, days=365, seed=42, stock=1000000):
+    """Fill the current app's (empty) database; returns the row counts written."""
+    rng = random.Random(seed)
+    password_hash = generate_password_hash(PASSWORD, os.environ.get("PASSWORD_HASH_METHOD", DEFAULT_METHOD))
+    first_day = datetime.utcnow().replace(microsecond=0) - timedelta(days=days)
+
+    _insert(Customer, ({"name": f"Customer {n}", "email": f"customer{n}@example.com", "phone": f"1{n:09}",
+                        "password_hash": password_hash} for n in range(1, customers + 1)))
+    _insert(Mechanic, ({"name": f"Mechanic {n}", "email": f"mechanic{n}@example.com", "phone": f"2{n:09}",
+                        "salary": 40000 + rng.randrange(40000), "password_hash": password_hash}
+                       for n in range(1, mechanics + 1)))
+    _insert(Inventory, ({"name": f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {n}",
+                         "price": round(rng.uniform(1, 500), 2), "quantity": stock} for n in range(1, parts + 1)))
+    _insert(ServiceTicket, ({"VIN": ticket_vin(n), "description": "Scheduled service",
+                             "service_date": first_day + timedelta(seconds=rng.randrange(days * 86400)),
+                             "customer_id": ticket_customer(n, customers)} for n in range(1, tickets + 1)))
+    _insert(inventory_service_ticket, (
+        {"service_ticket_id": n, "inventory_id": part, "quantity": rng.randint(1, 4)}
+        for n in range(1, tickets + 1) for part in rng.sample(range(1, parts + 1), min(2, parts))
+    ))
+    _insert(mechanic_service_ticket, (
+        {"service_ticket_id": n, "mechanic_id": mechanic}
+        for n in range(1, tickets + 1) for mechanic in rng.sample(range(1, mechanics + 1), min(rng.randint(1, 2), mechanics))
+    ))
+    db.session.commit()
+    rebuild_ticket_counts()
+    backfill_rollups()
+    return {"customers": customers, "mechanics": mechanics, "parts": parts, "tickets": tickets}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", required=True, help="emptied and refilled")
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--tickets", type=int, default=10000)
+    parser.add_argument("--parts", type=int, default=1000)
+    parser.add_argument("--mechanics", type=int, default=50)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    DataConfig.SQLALCHEMY_DATABASE_URI = args.database_url
+    app = create_app(DataConfig)
+    started = time.perf_counter()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        counts = populate(args.customers, args.tickets, args.parts, args.mechanics, args.days, args.seed)
+    print(json.dumps({**counts, "seconds": round(time.perf_counter() - started, 2)}))
+
+
+if __name__ == "__main__":
+    main()
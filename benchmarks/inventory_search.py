@@ -0,0 +1,97 @@
+"""Inventory search (typeahead) latency benchmark.
+
+Fills a temporary SQLite database with --rows parts, then replays typeahead-style
+requests against GET /inventory/search through the test client (routing, query and
+serialization included) and reports latency percentiles per query shape:
+
+    python -m benchmarks.inventory_search --rows 100000
+
+Prints the query plan of each shape first so a missing index shows up as a SCAN.
+Results are in milliseconds, printed as JSON. The target is p99 under 10 ms.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from app import create_app, db
+from app.models import Inventory
+
+WORDS = ["brake", "pad", "rotor", "oil", "filter", "air", "cabin", "spark", "plug", "belt", "hose",
+         "clamp", "wiper", "blade", "bulb", "fuse", "sensor", "pump", "gasket", "seal", "bearing", "strut"]
+QUERIES = {
+    "prefix_1_char": lambda rng: f"q={rng.choice(WORDS)[:1]}",
+    "prefix_3_chars": lambda rng: f"q={rng.choice(WORDS)[:3]}",
+    "prefix_full_word": lambda rng: f"q={rng.choice(WORDS)}+{rng.choice(WORDS)[:2]}",
+    "contains": lambda rng: f"q={rng.choice(WORDS)[1:4]}&match=contains",
+    "prefix_and_price": lambda rng: f"q={rng.choice(WORDS)[:2]}&min_price=20&max_price=80",
+    "price_range_sorted": lambda rng: f"min_price={rng.randint(0, 400)}&max_price={rng.randint(400, 500)}&sort=-price",
+}
+
+
+class BenchmarkConfig:
+    TESTING = True
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    CACHE_TYPE = "SimpleCache"
+    RATELIMIT_ENABLED = False
+    METRICS_ENABLED = False
+    SWAGGER_UI_ENABLED = False
+
+
+def populate(rows, rng):
+    batch = []
+    for n in range(rows):
+        name = f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {n}"
+        batch.append({"name": name, "price": round(rng.uniform(1, 500), 2)})
+        if len(batch) == 10000:
+            db.session.execute(db.insert(Inventory), batch)
+            batch = []
+    if batch:
+        db.session.execute(db.insert(Inventory), batch)
+    db.session.commit()
+    db.session.execute(db.text("ANALYZE"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=200, help="requests per query shape")
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as directory:
+        BenchmarkConfig.SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(directory, "bench.db")
+        app = create_app(BenchmarkConfig)
+        with app.app_context():
+            populate(args.rows, rng)
+        client = app.test_client()
+
+        for name, make_query in QUERIES.items():
+            plans = []
+            with app.app_context():
+                listener = lambda conn, cursor, statement, params, context, many: plans.append((statement, params))
+                db.event.listen(db.engine, "before_cursor_execute", listener)
+                client.get("/inventory/search?" + make_query(rng))
+                db.event.remove(db.engine, "before_cursor_execute", listener)
+                statement, params = plans[-1]
+                plan = db.session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, params).all()
+            samples = []
+            for _ in range(args.requests):
+                url = "/inventory/search?" + make_query(rng)
+                started = time.perf_counter()
+                response = client.get(url)
+                samples.append((time.perf_counter() - started) * 1000)
+                assert response.status_code == 200, (url, response.status_code)
+            samples.sort()
+            print(json.dumps({
+                "query": name, "rows": args.rows,
+                "p50_ms": round(statistics.median(samples), 2),
+                "p99_ms": round(samples[int(len(samples) * 0.99) - 1], 2),
+                "plan": [row[-1] for row in plan],
+            }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""Load and latency benchmark for every API route, against a locally launched gunicorn.
+
+1. Generates a synthetic dataset with benchmarks.datagen into a temporary SQLite file
+   (or --database-url, which is emptied first).
+2. Starts gunicorn with gunicorn.conf.py and the production config (--workers,
+   --threads; rate limiting off) on a free local port.
+3. Sends --warmup requests per route, then --requests per route as one shuffled mix
+   from --concurrency client threads, covering every route of the customers,
+   mechanics, service ticket, inventory and reports blueprints.
+4. Reads SQL statements per request for each endpoint from /metrics before and after.
+
+    python -m benchmarks.load --customers 1000 --tickets 10000 --concurrency 8
+    python -m benchmarks.load --save-baseline benchmarks/baselines/local.json
+    python -m benchmarks.load --baseline benchmarks/baselines/local.json --tolerance 0.25
+
+Prints one JSON line per route (p50/p95/p99 ms, errors, queries per request) and a
+summary line with overall throughput. Exits non-zero if a route answered with an
+unexpected status, or, with --baseline, if a route's p95 or queries per request or the
+overall throughput is worse than the baseline by more than --tolerance. Baselines are
+only comparable between runs with the same dataset and concurrency options on the same
+machine, so record one per machine.
+"""
+import argparse
+import http.client
+import itertools
+import json
+import math
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app import create_app, db
+from app.auth.utils import encode_mechanic_token, encode_token
+from benchmarks.datagen import PASSWORD, DataConfig, WORDS, populate, ticket_customer, ticket_vin
+from benchmarks.startup import ROOT, _free_port
+
+METRIC_LINE = re.compile(r'^http_request_sql_statements_(sum|count)\{endpoint="([^"]+)"\} (\S+)$')
+
+
+class Client:
+    """Minimal JSON-over-HTTP client; every request opens its own connection, as gunicorn's sync workers close them."""
+
+    def __init__(self, port):
+        self.port = port
+
+    def request(self, method, path, body=None, headers=None, raw=None, content_type="application/json"):
+        connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+        try:
+            headers = dict(headers or {})
+            payload = raw
+            if body is not None:
+                payload = json.dumps(body).encode()
+            if payload is not None:
+                headers["Content-Type"] = content_type
+            connection.request(method, path, payload, headers)
+            response = connection.getresponse()
+            data = response.read()
+            return response.status, data
+        finally:
+            connection.close()
+
+
+class Scenario:
+    """Builds valid requests for each route from the dataset's known shape."""
+
+    def __init__(self, client, counts, seed):
+        self.client = client
+        self.customers = counts["customers"]
+        self.mechanics = counts["mechanics"]
+        self.parts = counts["parts"]
+        self.tickets = counts["tickets"]
+        self.local = threading.local()
+        self.seed = seed
+        self.unique = itertools.count(1)
+        self.spare_mechanics = itertools.count(counts["mechanics"] + 1)  # Registered by populate_spares()
+
+    @property
+    def rng(self):
+        if not hasattr(self.local, "rng"):
+            self.local.rng = random.Random(f"{self.seed}-{threading.get_ident()}")
+        return self.local.rng
+
+    def customer_auth(self, customer_id):
+        return {"Authorization": f"Bearer {encode_token(customer_id)}"}
+
+    def mechanic_auth(self):
+        return {"Authorization": f"Bearer {encode_mechanic_token(self.rng.randint(1, self.mechanics))}"}
+
+    def any_ticket(self):
+        ticket_id = self.rng.randint(1, self.tickets)
+        return ticket_id, ticket_customer(ticket_id, self.customers)
+
+    def new_ticket(self):
+        # Untimed setup for routes that consume a ticket
+        customer_id = self.rng.randint(1, self.customers)
+        status, data = self.client.request("POST", "/service-tickets/", {"VIN": "SETUP", "description": "Load test"},
+                                           self.customer_auth(customer_id))
+        return json.loads(data)["id"], customer_id
+
+    def routes(self):
+        """(endpoint, expected statuses, request builder) for every route; a builder returns (method, path, kwargs)."""
+        r = self
+        return [
+            ("customer.login", {200}, lambda: ("POST", "/customers/login", {"body": {
+                "email": f"customer{r.rng.randint(1, r.customers)}@example.com", "password": PASSWORD}})),
+            ("customer.register", {201}, lambda: ("POST", "/customers/register", {"body": {
+                "name": "Load Test", "email": f"load{next(r.unique)}@example.com", "password": PASSWORD,
+                "phone": "5550000000"}})),
+            ("customer.get_customers", {200}, lambda: ("GET", "/customers/?limit=50", {})),
+            ("customer.my_tickets", {200}, lambda: ("GET", "/customers/my-tickets", {
+                "headers": r.customer_auth(r.rng.randint(1, r.customers))})),
+            ("customer.create_service_ticket", {201}, lambda: ("POST", "/customers/create-ticket", {
+                "body": {"VIN": "LOADTEST", "description": "Noise"},
+                "headers": r.customer_auth(r.rng.randint(1, r.customers))})),
+            ("mechanic.mechanic_login", {200}, lambda: ("POST", "/mechanics/login", {"body": {
+                "email": f"mechanic{r.rng.randint(1, r.mechanics)}@example.com", "password": PASSWORD}})),
+            ("mechanic.register_mechanic", {201}, lambda: ("POST", "/mechanics/register", {"body": {
+                "name": "Load Test", "email": f"loadmech{next(r.unique)}@example.com", "password": PASSWORD,
+                "phone": f"9{next(r.unique):09}", "salary": 50000}})),
+            ("mechanic.get_mechanics", {200}, lambda: ("GET", "/mechanics/?limit=50", {})),
+            ("mechanic.get_mechanic", {200}, lambda: ("GET", f"/mechanics/{r.rng.randint(1, r.mechanics)}", {})),
+            ("mechanic.update_mechanic", {200}, lambda: r._update_mechanic()),
+            ("mechanic.delete_mechanic", {200}, lambda: ("DELETE", f"/mechanics/{next(r.spare_mechanics)}", {})),
+            ("mechanic.mechanic_statistics", {200}, lambda: ("GET", "/mechanics/statistics?limit=10", {
+                "headers": r.mechanic_auth()})),
+            ("service_ticket.create_service_ticket", {201}, lambda: ("POST", "/service-tickets/", {
+                "body": {"VIN": "LOADTEST", "description": "Noise"},
+                "headers": r.customer_auth(r.rng.randint(1, r.customers))})),
+            ("service_ticket.get_service_ticket", {200}, lambda: r._own_ticket("GET", "")),
+            ("service_ticket.update_service_ticket", {200}, lambda: r._own_ticket("PUT", "", {
+                "description": "Updated by load test"})),
+            ("service_ticket.delete_service_ticket", {200}, lambda: r._delete_ticket()),
+            ("service_ticket.get_service_tickets_by_vin", {200}, lambda: (
+                "GET", f"/service-tickets/by-vin/{ticket_vin(r.rng.randint(1, r.tickets))}", {"headers": r.mechanic_auth()})),
+            ("service_ticket.add_mechanics_to_service_ticket", {200}, lambda: (
+                "PUT", f"/service-tickets/{r.rng.randint(1, r.tickets)}/add-mechanics", {"body": {
+                    "add_ids": [r.rng.randint(1, r.mechanics)], "remove_ids": [r.rng.randint(1, r.mechanics)]}})),
+            ("service_ticket.add_parts_to_service_ticket", {200}, lambda: (
+                "POST", f"/service-tickets/{r.rng.randint(1, r.tickets)}/parts", {"headers": r.mechanic_auth(), "body": {
+                    "parts": [{"inventory_id": r.rng.randint(1, r.parts), "quantity": 1} for _ in range(5)]}})),
+            ("service_ticket.get_service_ticket_total", {200}, lambda: (
+                "GET", f"/service-tickets/{r.rng.randint(1, r.tickets)}/total", {"headers": r.mechanic_auth()})),
+            ("inventory.create_inventory", {201}, lambda: ("POST", "/inventory/", {"body": {
+                "name": f"Load part {next(r.unique)}", "price": 9.99, "quantity": 10}})),
+            ("inventory.get_inventories", {200}, lambda: ("GET", "/inventory/?limit=50", {})),
+            ("inventory.get_inventory", {200}, lambda: ("GET", f"/inventory/{r.rng.randint(1, r.parts)}", {})),
+            ("inventory.update_inventory", {200}, lambda: ("PUT", f"/inventory/{r.rng.randint(1, r.parts)}", {
+                "body": {"name": "Repriced part", "price": round(r.rng.uniform(1, 500), 2)}})),
+            ("inventory.delete_inventory", {200}, lambda: r._delete_part()),
+            ("inventory.search_inventory", {200}, lambda: (
+                "GET", f"/inventory/search?q={r.rng.choice(WORDS)[:3]}&limit=20", {})),
+            ("inventory.import_inventories", {200}, lambda: ("POST", "/inventory/import", {
+                "headers": r.mechanic_auth(), "content_type": "application/x-ndjson", "raw": "".join(
+                    json.dumps({"name": f"Imported {next(r.unique)}", "price": 5}) + "\n" for _ in range(50)
+                ).encode()})),
+            ("inventory.add_part_to_service_ticket", {200}, lambda: (
+                "POST", f"/inventory/{r.rng.randint(1, r.parts)}/add-part", {"headers": r.mechanic_auth(), "body": {
+                    "ticket_id": r.rng.randint(1, r.tickets), "quantity": 1}})),
+            ("reports.tickets_report", {200}, lambda: ("GET", "/reports/tickets?period=week", {
+                "headers": r.mechanic_auth()})),
+            ("reports.mechanics_report", {200}, lambda: ("GET", "/reports/mechanics?period=month", {
+                "headers": r.mechanic_auth()})),
+        ]
+
+    def _update_mechanic(self):
+        mechanic_id = self.rng.randint(1, self.mechanics)
+        return "PUT", f"/mechanics/{mechanic_id}", {"body": {
+            "name": f"Mechanic {mechanic_id}", "email": f"mechanic{mechanic_id}@example.com",
+            "phone": f"2{mechanic_id:09}", "salary": 40000 + self.rng.randrange(40000)}}
+
+    def _own_ticket(self, method, suffix, body=None):
+        ticket_id, customer_id = self.any_ticket()
+        kwargs = {"headers": self.customer_auth(customer_id)}
+        if body is not None:
+            kwargs["body"] = body
+        return method, f"/service-tickets/{ticket_id}{suffix}", kwargs
+
+    def _delete_ticket(self):
+        ticket_id, customer_id = self.new_ticket()
+        return "DELETE", f"/service-tickets/{ticket_id}", {"headers": self.customer_auth(customer_id)}
+
+    def _delete_part(self):
+        status, data = self.client.request("POST", "/inventory/", {"name": "Disposable", "price": 1})
+        return "DELETE", f"/inventory/{json.loads(data)['id']}", {}
+
+
+def statement_counts(client):
+    """{endpoint: (statements, requests)} from the SQL-statements histogram on /metrics."""
+    status, data = client.request("GET", "/metrics")
+    totals = {}
+    for line in data.decode().splitlines():
+        match = METRIC_LINE.match(line)
+        if match:
+            kind, endpoint, value = match.groups()
+            sums = totals.setdefault(endpoint, [0.0, 0.0])
+            sums[0 if kind == "sum" else 1] = float(value)
+    return totals
+
+
+def percentile(samples, fraction):
+    return samples[max(0, math.ceil(fraction * len(samples)) - 1)]
+
+
+def start_gunicorn(env, workers, threads, timeout=60):
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "-w", str(workers), "--threads", str(threads),
+         "-b", f"127.0.0.1:{port}"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    client = Client(port)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if client.request("GET", "/metrics")[0] == 200:
+                return process, client
+        except OSError:
+            time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError("gunicorn did not start in time")
+
+
+def run(scenario, routes, per_route, concurrency):
+    """Replay per_route requests of every route as one shuffled mix; returns ({endpoint: samples}, failures, seconds)."""
+    jobs = [route for route in routes for _ in range(per_route)]
+    random.Random(scenario.seed).shuffle(jobs)
+    samples = {endpoint: [] for endpoint, _, _ in routes}
+    failures = {}
+    lock = threading.Lock()
+
+    def call(route):
+        endpoint, expected, build = route
+        method, path, kwargs = build()
+        started = time.perf_counter()
+        status, _ = scenario.client.request(method, path, **kwargs)
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            samples[endpoint].append(elapsed)
+            if status not in expected:
+                failures.setdefault(endpoint, {}).setdefault(str(status), 0)
+                failures[endpoint][str(status)] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        list(executor.map(call, jobs))
+    return samples, failures, time.perf_counter() - started
+
+
+def compare(results, summary, baseline, tolerance):
+    """Regressions against a stored baseline, as human-readable strings."""
+    regressions = []
+    for endpoint, base in baseline["routes"].items():
+        current = results.get(endpoint)
+        if current is None:
+            continue
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{endpoint}: p95 {current['p95_ms']} ms vs baseline {base['p95_ms']} ms")
+        if (current["queries_per_request"] is not None and base["queries_per_request"] is not None
+                and current["queries_per_request"] > base["queries_per_request"] * (1 + tolerance) + 0.01):
+            regressions.append(f"{endpoint}: {current['queries_per_request']} queries/request "
+                               f"vs baseline {base['queries_per_request']}")
+    if summary["requests_per_second"] < baseline["summary"]["requests_per_second"] * (1 - tolerance):
+        regressions.append(f"throughput {summary['requests_per_second']} req/s "
+                           f"vs baseline {baseline['summary']['requests_per_second']} req/s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--tickets", type=int, default=10000)
+    parser.add_argument("--parts", type=int, default=1000)
+    parser.add_argument("--mechanics", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", help="run against this database instead of a temporary SQLite file")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=1, help="gunicorn threads per worker")
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads")
+    parser.add_argument("--requests", type=int, default=50, help="timed requests per route")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed requests per route first")
+    parser.add_argument("--only", help="comma-separated endpoints to run, e.g. inventory.search_inventory")
+    parser.add_argument("--baseline", help="fail on regressions against this baseline file")
+    parser.add_argument("--save-baseline", help="write this run's results as a baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression (default 0.25)")
+    args = parser.parse_args()
+    options = {name: getattr(args, name) for name in
+               ("customers", "tickets", "parts", "mechanics", "seed", "workers", "threads", "concurrency", "requests")}
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = args.database_url or "sqlite:///" + os.path.join(directory, "load.db")
+        DataConfig.SQLALCHEMY_DATABASE_URI = database_url
+        app = create_app(DataConfig)
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            spares = args.mechanics + args.warmup + args.requests  # delete_mechanic consumes one per request
+            counts = populate(args.customers, args.tickets, args.parts, spares, seed=args.seed)
+            counts["mechanics"] = args.mechanics
+            db.engine.dispose()
+
+        env = dict(os.environ, PYTHONPATH=ROOT, SQLALCHEMY_DATABASE_URI=database_url,
+                   METRICS_DIR=os.path.join(directory, "metrics"), CACHE_DIR=os.path.join(directory, "cache"),
+                   RATELIMIT_ENABLED="false", SWAGGER_UI_ENABLED="false", WEB_CONCURRENCY=str(args.workers),
+                   GUNICORN_THREADS=str(args.threads))
+        process, client = start_gunicorn(env, args.workers, args.threads)
+        try:
+            scenario = Scenario(client, counts, args.seed)
+            routes = scenario.routes()
+            if args.only:
+                wanted = set(args.only.split(","))
+                routes = [route for route in routes if route[0] in wanted]
+            run(scenario, routes, args.warmup, args.concurrency)
+            time.sleep(1.5)  # Let every worker flush its metrics (METRICS_FLUSH_INTERVAL)
+            before = statement_counts(client)
+            samples, failures, seconds = run(scenario, routes, args.requests, args.concurrency)
+            time.sleep(1.5)
+            after = statement_counts(client)
+        finally:
+            process.terminate()
+            process.wait()
+        if args.database_url:
+            with app.app_context():
+                db.drop_all()
+
+    results = {}
+    for endpoint, timings in samples.items():
+        timings.sort()
+        statements, requests = (a - b for a, b in zip(after.get(endpoint, (0, 0)), before.get(endpoint, (0, 0))))
+        results[endpoint] = {
+            "requests": len(timings),
+            "errors": failures.get(endpoint, {}),
+            "p50_ms": round(percentile(timings, 0.50), 2),
+            "p95_ms": round(percentile(timings, 0.95), 2),
+            "p99_ms": round(percentile(timings, 0.99), 2),
+            "queries_per_request": round(statements / requests, 2) if requests else None,
+        }
+        print(json.dumps({"endpoint": endpoint, **results[endpoint]}))
+    total = sum(result["requests"] for result in results.values())
+    summary = {"requests": total, "seconds": round(seconds, 2), "requests_per_second": round(total / seconds, 1)}
+
+    regressions = [f"{endpoint}: unexpected statuses {errors}" for endpoint, errors in failures.items()]
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("options") != options:
+            print(f"warning: baseline was recorded with {baseline.get('options')}", file=sys.stderr)
+        regressions += compare(results, summary, baseline, args.tolerance)
+    print(json.dumps({**summary, "regressions": regressions}))
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w") as f:
+            json.dump({"options": options, "summary": summary, "routes": results}, f, indent=2, sort_keys=True)
+    if regressions:
+        raise SystemExit("\n".join(regressions))
+
+
+if __name__ == "__main__":
+    main()
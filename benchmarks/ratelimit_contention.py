@@ -0,0 +1,86 @@
+"""Rate limit storage contention benchmark.
+
+Starts N worker processes that hit the limiter storage as fast as they can, like N gunicorn
+workers serving requests at once, and reports per-hit latency and total throughput:
+
+    python -m benchmarks.ratelimit_contention --processes 8 --hits 2000
+    python -m benchmarks.ratelimit_contention --strategy moving-window --keys 1
+
+--keys 1 puts every process on the same key (all clients behind one IP, worst case);
+larger values spread the hits like distinct clients. Every write takes SQLite's file lock,
+so the p99 column is the one to watch as --processes grows. memory:// is measured in one
+process as the no-sharing baseline. Results are printed as JSON; latencies in microseconds.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, MovingWindowRateLimiter
+import app.ratelimit_storage  # noqa: F401  Registers the sqlite:// scheme
+
+STRATEGIES = {"fixed-window": FixedWindowRateLimiter, "moving-window": MovingWindowRateLimiter}
+
+
+def _worker(uri, strategy, hits, keys, start, results):
+    limiter = STRATEGIES[strategy](storage_from_string(uri))
+    # A limit that is never reached, so every hit performs a write
+    limit = parse(f"{hits * 1000} per hour")
+    latencies = []
+    start.wait()
+    for hit in range(hits):
+        started = time.perf_counter()
+        limiter.hit(limit, "bench", str(hit % keys))
+        latencies.append(time.perf_counter() - started)
+    results.put(latencies)
+
+
+def run(uri, strategy, processes, hits, keys):
+    start = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_worker, args=(uri, strategy, hits, keys, start, results))
+               for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    time.sleep(0.2)  # Let every process open its connection before the gate opens
+    started = time.perf_counter()
+    start.set()
+    latencies = [latency for _ in workers for latency in results.get()]
+    elapsed = time.perf_counter() - started
+    for worker in workers:
+        worker.join()
+
+    latencies.sort()
+    return {
+        "storage": uri.split(":", 1)[0],
+        "processes": processes,
+        "hits_per_second": round(len(latencies) / elapsed),
+        "p50_us": round(statistics.median(latencies) * 1e6, 1),
+        "p99_us": round(latencies[int(len(latencies) * 0.99) - 1] * 1e6, 1),
+        "max_us": round(latencies[-1] * 1e6, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--hits", type=int, default=1000, help="hits per process")
+    parser.add_argument("--keys", type=int, default=1, help="distinct rate limit keys")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="fixed-window")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        uri = "sqlite:///" + os.path.join(directory, "ratelimit.db")
+        rows = [run("memory://", args.strategy, 1, args.hits, args.keys)]
+        for processes in sorted({1, args.processes}):
+            rows.append(run(uri, args.strategy, processes, args.hits, args.keys))
+    for row in rows:
+        print(json.dumps({"strategy": args.strategy, "keys": args.keys, **row}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Report latency benchmark: rollup reads vs aggregating the ticket tables on request.
+
+Fills a temporary SQLite database with --tickets tickets spread over --days days (two
+part lines and one mechanic each), rebuilds the rollups with the backfill, then times
+GET /reports/tickets (rollup rows only) against the same weekly numbers computed by a
+GROUP BY over service_tickets, inventory_service_ticket and inventory:
+
+    python -m benchmarks.reports --tickets 100000 --days 365
+
+Both must return the same totals. Results are medians in milliseconds, printed as JSON.
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from app import create_app, db
+from app.auth.utils import encode_mechanic_token
+from app.blueprints.reports.rollups import PERIODS, backfill_rollups
+from app.models import Customer, Inventory, Mechanic, ServiceTicket, inventory_service_ticket, mechanic_service_ticket
+
+
+class BenchmarkConfig:
+    TESTING = True
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    CACHE_TYPE = "SimpleCache"
+    RATELIMIT_ENABLED = False
+    METRICS_ENABLED = False
+    SWAGGER_UI_ENABLED = False
+
+
+def populate(tickets, days):
+    started = datetime(2024, 1, 1)
+    db.session.add(Customer(name="Bench", email="bench@example.com", phone="1", password_hash="x"))
+    db.session.add_all([Mechanic(name=f"Mechanic {n}", email=f"m{n}@example.com", phone=str(n), salary=1,
+                                 password_hash="x") for n in range(20)])
+    db.session.execute(db.insert(Inventory), [{"name": f"Part {n}", "price": n % 50 + 0.99} for n in range(500)])
+    db.session.flush()
+    spacing = days * 86400 / tickets
+    db.session.execute(db.insert(ServiceTicket), [
+        {"VIN": f"VIN{n:014}", "description": "Service", "customer_id": 1,
+         "service_date": started + timedelta(seconds=n * spacing)} for n in range(tickets)
+    ])
+    db.session.execute(db.insert(inventory_service_ticket), [
+        {"service_ticket_id": n + 1, "inventory_id": (n + offset) % 500 + 1, "quantity": offset % 3 + 1}
+        for n in range(tickets) for offset in (0, 7)
+    ])
+    db.session.execute(db.insert(mechanic_service_ticket), [
+        {"service_ticket_id": n + 1, "mechanic_id": n % 20 + 1} for n in range(tickets)
+    ])
+    db.session.commit()
+
+
+def aggregate_on_request():
+    """The weekly ticket report computed from the base tables, as it would be without rollups."""
+    day = db.func.date(ServiceTicket.service_date)
+    line = inventory_service_ticket.c
+    tickets = dict(db.session.execute(db.select(day, db.func.count()).group_by(day)).all())
+    parts = {row[0]: row[1:] for row in db.session.execute(
+        db.select(day, db.func.sum(line.quantity), db.func.sum(Inventory.price * line.quantity))
+        .join(inventory_service_ticket, line.service_ticket_id == ServiceTicket.id)
+        .join(Inventory, Inventory.id == line.inventory_id).group_by(day))}
+    weeks = {}
+    for day_text in sorted(tickets.keys() | parts.keys()):
+        week = PERIODS["week"](datetime.strptime(day_text, "%Y-%m-%d").date())
+        bucket = weeks.setdefault(week, [0, 0, 0])
+        bucket[0] += tickets.get(day_text, 0)
+        units, revenue = parts.get(day_text, (0, 0))
+        bucket[1] += units
+        bucket[2] += revenue
+    return [{"period": week.isoformat(), "tickets": t, "parts_units": u, "parts_revenue": round(r, 2)}
+            for week, (t, u, r) in weeks.items()]
+
+
+def time_ms(function, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = function()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        BenchmarkConfig.SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(directory, "bench.db")
+        app = create_app(BenchmarkConfig)
+        client = app.test_client()
+        with app.app_context():
+            populate(args.tickets, args.days)
+            backfill_ms, _ = time_ms(backfill_rollups, 1)
+            headers = {"Authorization": f"Bearer {encode_mechanic_token(1)}"}
+            aggregate_ms, expected = time_ms(aggregate_on_request, args.runs)
+        rollup_ms, response = time_ms(lambda: client.get("/reports/tickets?period=week", headers=headers), args.runs)
+        if response.json != expected:
+            raise SystemExit("Rollup report differs from the on-request aggregate")
+        print(json.dumps({
+            "tickets": args.tickets, "days": args.days, "backfill_ms": round(backfill_ms, 2),
+            "aggregate_on_request_ms": round(aggregate_ms, 2), "rollup_report_ms": round(rollup_ms, 2),
+            "speedup": round(aggregate_ms / rollup_ms, 1),
+        }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""List serialization benchmark: marshmallow on ORM objects vs the compiled row dumpers.
+
+Fills a temporary SQLite database with --rows customers, mechanics, inventory items and
+service tickets (two parts each), then times, per list schema, the whole read path as the
+endpoints run it: query, dump and JSON encoding.
+
+    python -m benchmarks.serialization --rows 10000 --runs 5
+
+Each pair of outputs is checked to be byte-for-byte identical before timing is reported.
+Results are medians in milliseconds, printed as JSON.
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from sqlalchemy.orm import selectinload
+from app import create_app, db
+from app.blueprints.customers.schemas import customers_schema, customers_row_dumper
+from app.blueprints.mechanic.schemas import mechanics_schema, mechanics_row_dumper
+from app.blueprints.inventory.schemas import inventories_schema, inventories_row_dumper
+from app.blueprints.service_ticket.schemas import service_tickets_schema, service_tickets_row_dumper
+from app.models import Customer, Inventory, Mechanic, ServiceTicket, inventory_service_ticket
+
+
+class BenchmarkConfig:
+    TESTING = True
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    CACHE_TYPE = "SimpleCache"
+    RATELIMIT_ENABLED = False
+    METRICS_ENABLED = False
+    SWAGGER_UI_ENABLED = False
+
+
+def populate(rows):
+    started = datetime(2024, 1, 1)
+    db.session.execute(db.insert(Customer), [
+        {"name": f"Customer {n}", "email": f"c{n}@example.com", "phone": f"555{n:07}", "password_hash": "x"}
+        for n in range(rows)
+    ])
+    db.session.execute(db.insert(Mechanic), [
+        {"name": f"Mechanic {n}", "email": f"m{n}@example.com", "phone": f"556{n:07}",
+         "salary": 40000 + n * 0.5, "password_hash": "x"}
+        for n in range(rows)
+    ])
+    db.session.execute(db.insert(Inventory), [{"name": f"Part {n}", "price": n % 500 + 0.99} for n in range(rows)])
+    db.session.execute(db.insert(ServiceTicket), [
+        {"VIN": f"VIN{n:014}", "description": "Service", "service_date": started + timedelta(minutes=n),
+         "customer_id": n % rows + 1}
+        for n in range(rows)
+    ])
+    db.session.execute(db.insert(inventory_service_ticket), [
+        {"service_ticket_id": n + 1, "inventory_id": (n + offset) % rows + 1} for n in range(rows) for offset in (0, 7)
+    ])
+    db.session.commit()
+
+
+def time_ms(function, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = function()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        BenchmarkConfig.SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(directory, "bench.db")
+        app = create_app(BenchmarkConfig)
+        cases = [
+            ("customers", Customer, customers_schema, customers_row_dumper, []),
+            ("mechanics", Mechanic, mechanics_schema, mechanics_row_dumper, []),
+            ("inventory", Inventory, inventories_schema, inventories_row_dumper, []),
+            ("service_tickets", ServiceTicket, service_tickets_schema, service_tickets_row_dumper,
+             [selectinload(ServiceTicket.inventory_items)]),
+        ]
+        with app.app_context():
+            populate(args.rows)
+            for name, model, schema, dumper, options in cases:
+
+                def marshmallow_path():
+                    objects = model.query.options(*options).order_by(model.id).all()
+                    output = app.json.dumps(schema.dump(objects))
+                    db.session.expunge_all()  # Keep the identity map from serving the next run
+                    return output
+
+                def row_path():
+                    rows = db.session.execute(dumper.select().order_by(model.id))
+                    return app.json.dumps(dumper.dump(rows))
+
+                marshmallow_ms, expected = time_ms(marshmallow_path, args.runs)
+                rows_ms, actual = time_ms(row_path, args.runs)
+                if actual != expected:
+                    raise SystemExit(f"{name}: row dumper output differs from marshmallow")
+                print(json.dumps({
+                    "schema": name, "rows": args.rows, "marshmallow_ms": round(marshmallow_ms, 2),
+                    "row_dumper_ms": round(rows_ms, 2), "speedup": round(marshmallow_ms / rows_ms, 2),
+                }))
+
+
+if __name__ == "__main__":
+    main()
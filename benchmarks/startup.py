@@ -0,0 +1,104 @@
+"""Worker startup benchmark.
+
+Measures, in fresh interpreter processes so nothing is already imported:
+  import   time to `import app`
+  create   time for create_app() with the production config
+  first    time from process start until the first request has been served
+
+    python -m benchmarks.startup --runs 10
+    python -m benchmarks.startup --gunicorn   # time until a real gunicorn worker answers
+
+Use `python -X importtime -c "import app"` to see which imports dominate.
+Results are medians in milliseconds, printed as JSON so runs can be compared.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+application = app.create_app("config.ProductionConfig")
+created = time.perf_counter()
+response = application.test_client().get("/metrics")
+served = time.perf_counter()
+assert response.status_code == 200, response.status_code
+print(json.dumps({
+    "import": (imported - started) * 1000,
+    "create": (created - imported) * 1000,
+    "first": (served - started) * 1000,
+}))
+"""
+
+
+def _env(database_path):
+    env = dict(os.environ)
+    env.setdefault("SQLALCHEMY_DATABASE_URI", f"sqlite:///{database_path}")
+    env.setdefault("METRICS_DIR", tempfile.mkdtemp(prefix="startup-metrics-"))
+    env["PYTHONPATH"] = ROOT
+    return env
+
+
+def measure_in_process(env):
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_gunicorn(env, timeout=30):
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "-w", "1", "-b", f"127.0.0.1:{port}"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=1) as response:
+                    if response.status == 200:
+                        return {"first": (time.perf_counter() - started) * 1000}
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError("gunicorn did not serve a request in time")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--gunicorn", action="store_true", help="measure a real gunicorn worker")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = _env(os.path.join(directory, "startup.db"))
+        measure = measure_gunicorn if args.gunicorn else measure_in_process
+        samples = [measure(env) for _ in range(args.runs)]
+
+    result = {key: round(statistics.median(sample[key] for sample in samples), 2) for key in samples[0]}
+    result["runs"] = args.runs
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
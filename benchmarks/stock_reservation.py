@@ -0,0 +1,119 @@
+"""Stock reservation concurrency benchmark: technicians racing for the last units.
+
+Stocks --items parts with --stock units each, then starts --workers processes that
+each keep reserving one unit at a time onto their own service ticket (the same
+reserve_part call POST /inventory/<id>/add-part makes) until every part reports
+insufficient stock:
+
+    python -m benchmarks.stock_reservation --workers 8 --items 4 --stock 250
+    python -m benchmarks.stock_reservation --database-url postgresql://localhost/bench
+
+Without --database-url a temporary SQLite file is used; a database given with it is
+emptied first and dropped afterwards, so point it at a scratch database. Afterwards it checks that
+nothing was oversold: the units reserved by all workers, the quantities on the
+ticket lines and the stock taken out must all agree, and no stock level may be
+negative. Prints throughput as JSON; exits non-zero on an oversell.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from app import create_app, db
+from app.blueprints.inventory.stock import StockError, reserve_part
+from app.models import Customer, Inventory, ServiceTicket, inventory_service_ticket
+
+
+class BenchmarkConfig:
+    TESTING = True
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    CACHE_TYPE = "SimpleCache"
+    RATELIMIT_ENABLED = False
+    METRICS_ENABLED = False
+    SWAGGER_UI_ENABLED = False
+
+
+def populate(workers, items, stock):
+    db.drop_all()
+    db.create_all()
+    db.session.add(Customer(name="Bench", email="bench@example.com", phone="1", password_hash="x"))
+    db.session.flush()
+    db.session.execute(db.insert(ServiceTicket), [
+        {"VIN": f"VIN{n:014}", "description": "Bench", "customer_id": 1} for n in range(workers)
+    ])
+    db.session.execute(db.insert(Inventory), [
+        {"name": f"Part {n}", "price": 10, "quantity": stock} for n in range(items)
+    ])
+    db.session.commit()
+
+
+def worker(ticket_id, items, start, results):
+    app = create_app(BenchmarkConfig)
+    rng = random.Random(ticket_id)
+    reserved = refused = 0
+    with app.app_context():
+        available = list(range(1, items + 1))
+        start.wait()
+        while available:
+            inventory_id = rng.choice(available)
+            try:
+                reserve_part(ticket_id, inventory_id)
+                reserved += 1
+            except StockError:
+                refused += 1
+                available.remove(inventory_id)
+        db.engine.dispose()
+    results.put((reserved, refused))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--items", type=int, default=4)
+    parser.add_argument("--stock", type=int, default=250, help="initial units of each part")
+    parser.add_argument("--database-url", help="run against this database instead of a temporary SQLite file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        BenchmarkConfig.SQLALCHEMY_DATABASE_URI = args.database_url or "sqlite:///" + os.path.join(directory, "bench.db")
+        app = create_app(BenchmarkConfig)
+        with app.app_context():
+            populate(args.workers, args.items, args.stock)
+            db.engine.dispose()  # Don't hand pooled connections to the forked workers
+
+        start = multiprocessing.Event()
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=worker, args=(n + 1, args.items, start, results))
+                     for n in range(args.workers)]
+        for process in processes:
+            process.start()
+        time.sleep(1)  # Let every worker build its app before the race starts
+        started = time.perf_counter()
+        start.set()
+        counts = [results.get() for _ in processes]
+        elapsed = time.perf_counter() - started
+        for process in processes:
+            process.join()
+
+        with app.app_context():
+            stock = db.session.scalars(db.select(Inventory.quantity)).all()
+            on_tickets = db.session.scalar(db.select(db.func.sum(inventory_service_ticket.c.quantity)))
+            if args.database_url:
+                db.drop_all()
+        reserved = sum(count[0] for count in counts)
+        attempts = reserved + sum(count[1] for count in counts)
+        expected = args.items * args.stock
+        print(json.dumps({
+            "workers": args.workers, "items": args.items, "stock": expected,
+            "reserved": reserved, "on_tickets": on_tickets, "left_in_stock": sum(stock),
+            "attempts": attempts, "seconds": round(elapsed, 3),
+            "reservations_per_second": round(reserved / elapsed, 1),
+        }))
+        if not reserved == on_tickets == expected or any(level != 0 for level in stock):
+            raise SystemExit("Oversold or lost stock")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Export/import throughput and memory benchmark for `flask export` / `flask import`.
+
+Fills a temporary SQLite database with benchmarks.datagen (in a subprocess, so its memory
+isn't counted), exports it, imports the file into a second empty database and checks every
+table's row count matches:
+
+    python -m benchmarks.transfer --customers 10000 --tickets 1000000
+
+Prints rows per second for each direction, the file size and the process's peak RSS,
+which should stay flat as --tickets grows. Pass --database-url / --target-url to measure
+against MySQL or PostgreSQL instead (both are emptied first).
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from app import create_app, db
+from app.transfer import export_data, import_data
+from benchmarks.datagen import DataConfig
+
+
+def peak_rss_mb():
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)  # KiB on Linux
+
+
+def make_app(url, empty=False):
+    class Config(DataConfig):
+        SQLALCHEMY_DATABASE_URI = url
+    app = create_app(Config)
+    if empty:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customers", type=int, default=10000)
+    parser.add_argument("--tickets", type=int, default=200000)
+    parser.add_argument("--parts", type=int, default=1000)
+    parser.add_argument("--mechanics", type=int, default=50)
+    parser.add_argument("--database-url")
+    parser.add_argument("--target-url")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        source_url = args.database_url or "sqlite:///" + os.path.join(directory, "source.db")
+        subprocess.run([sys.executable, "-m", "benchmarks.datagen", "--database-url", source_url,
+                        "--customers", str(args.customers), "--tickets", str(args.tickets),
+                        "--parts", str(args.parts), "--mechanics", str(args.mechanics)],
+                       check=True, stdout=subprocess.DEVNULL)
+        source = make_app(source_url)
+        target = make_app(args.target_url or "sqlite:///" + os.path.join(directory, "target.db"), empty=True)
+        path = os.path.join(directory, "export.ndjson.gz")
+        rss_at_start = peak_rss_mb()
+
+        with source.app_context():
+            started = time.perf_counter()
+            exported = export_data(path)
+            export_seconds = time.perf_counter() - started
+        with target.app_context():
+            started = time.perf_counter()
+            imported = import_data(path)
+            import_seconds = time.perf_counter() - started
+        if imported != exported:
+            raise SystemExit(f"Row counts differ: exported {exported}, imported {imported}")
+
+        rows = sum(exported.values())
+        print(json.dumps({
+            "rows": rows, "file_mb": round(os.path.getsize(path) / 2 ** 20, 1),
+            "export_seconds": round(export_seconds, 2), "export_rows_per_second": round(rows / export_seconds),
+            "import_seconds": round(import_seconds, 2), "import_rows_per_second": round(rows / import_seconds),
+            "peak_rss_mb_at_start": rss_at_start, "peak_rss_mb": peak_rss_mb(),
+        }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import os
+import shutil
+import tempfile
+
+wsgi_app = "flask_app:app"
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+# More than one thread switches to the gthread worker; group commit batches between these threads
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+# Load the app once in the master; app.pooling disposes inherited connections in each worker
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# Workers never run `flask db`, so don't make each of them import Alembic
+os.environ.setdefault("MIGRATE_ENABLED", "false")
+
+# Every worker writes its metrics snapshot here and /metrics sums them. Set at import
+# time so the app sees it even when it is loaded in the master (preload_app).
+metrics_dir = os.environ.setdefault("METRICS_DIR", os.path.join(tempfile.gettempdir(), "mechanic-api-metrics"))
+
+
+def on_starting(server):
+    # Counters restart with the server, so drop the previous run's snapshots
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def post_worker_init(worker):
+    from app import pooling
+    from app.extensions import db
+    pooling.warm(worker.wsgi, db)
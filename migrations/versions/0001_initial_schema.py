@@ -0,0 +1,80 @@
+"""initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 13:08:33.394840
+
+The schema that db.create_all() produced before migrations were introduced. For a
+database created that way, run `flask db stamp 0001` once and then `flask db upgrade`.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('customers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=150), nullable=False),
+    sa.Column('password_hash', sa.String(length=256), nullable=False),
+    sa.Column('phone', sa.String(length=15), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_table('inventory',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('price', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('mechanics',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=150), nullable=False),
+    sa.Column('phone', sa.String(length=150), nullable=False),
+    sa.Column('salary', sa.Float(), nullable=False),
+    sa.Column('password_hash', sa.String(length=256), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email'),
+    sa.UniqueConstraint('phone')
+    )
+    op.create_table('service_tickets',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('VIN', sa.String(length=17), nullable=False),
+    sa.Column('description', sa.String(length=300), nullable=False),
+    sa.Column('service_date', sa.DateTime(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('inventory_service_ticket',
+    sa.Column('inventory_id', sa.Integer(), nullable=False),
+    sa.Column('service_ticket_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['inventory_id'], ['inventory.id'], ),
+    sa.ForeignKeyConstraint(['service_ticket_id'], ['service_tickets.id'], ),
+    sa.PrimaryKeyConstraint('inventory_id', 'service_ticket_id')
+    )
+    op.create_table('mechanic_service_ticket',
+    sa.Column('mechanic_id', sa.Integer(), nullable=False),
+    sa.Column('service_ticket_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['mechanic_id'], ['mechanics.id'], ),
+    sa.ForeignKeyConstraint(['service_ticket_id'], ['service_tickets.id'], ),
+    sa.PrimaryKeyConstraint('mechanic_id', 'service_ticket_id')
+    )
+
+
+def downgrade():
+    op.drop_table('mechanic_service_ticket')
+    op.drop_table('inventory_service_ticket')
+    op.drop_table('service_tickets')
+    op.drop_table('mechanics')
+    op.drop_table('inventory')
+    op.drop_table('customers')
@@ -0,0 +1,42 @@
+"""mechanic ticket counts
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 13:10:02.118523
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('mechanic_ticket_counts',
+    sa.Column('mechanic_id', sa.Integer(), nullable=False),
+    sa.Column('ticket_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['mechanic_id'], ['mechanics.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('mechanic_id')
+    )
+    with op.batch_alter_table('mechanic_ticket_counts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_mechanic_ticket_counts_ticket_count'), ['ticket_count'], unique=False)
+
+    # Seed the aggregate from the existing assignments (same as `flask mechanic rebuild-stats`)
+    op.execute(
+        "INSERT INTO mechanic_ticket_counts (mechanic_id, ticket_count) "
+        "SELECT mechanics.id, COUNT(mechanic_service_ticket.service_ticket_id) FROM mechanics "
+        "LEFT OUTER JOIN mechanic_service_ticket ON mechanic_service_ticket.mechanic_id = mechanics.id "
+        "GROUP BY mechanics.id"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('mechanic_ticket_counts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_mechanic_ticket_counts_ticket_count'))
+
+    op.drop_table('mechanic_ticket_counts')
@@ -0,0 +1,44 @@
+"""service ticket indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 13:08:48.976006
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('inventory_service_ticket', schema=None) as batch_op:
+        batch_op.create_index('ix_inventory_service_ticket_service_ticket_id', ['service_ticket_id'], unique=False)
+
+    with op.batch_alter_table('mechanic_service_ticket', schema=None) as batch_op:
+        batch_op.create_index('ix_mechanic_service_ticket_service_ticket_id', ['service_ticket_id'], unique=False)
+
+    with op.batch_alter_table('service_tickets', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_service_tickets_customer_id'), ['customer_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_service_tickets_service_date'), ['service_date'], unique=False)
+        batch_op.create_index('ix_service_tickets_vin_service_date', ['VIN', 'service_date'], unique=False)
+
+
+
+def downgrade():
+    with op.batch_alter_table('service_tickets', schema=None) as batch_op:
+        batch_op.drop_index('ix_service_tickets_vin_service_date')
+        batch_op.drop_index(batch_op.f('ix_service_tickets_service_date'))
+        batch_op.drop_index(batch_op.f('ix_service_tickets_customer_id'))
+
+    with op.batch_alter_table('mechanic_service_ticket', schema=None) as batch_op:
+        batch_op.drop_index('ix_mechanic_service_ticket_service_ticket_id')
+
+    with op.batch_alter_table('inventory_service_ticket', schema=None) as batch_op:
+        batch_op.drop_index('ix_inventory_service_ticket_service_ticket_id')
+
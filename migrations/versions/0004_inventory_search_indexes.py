@@ -0,0 +1,31 @@
+"""inventory search indexes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 13:29:25.512037
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('inventory', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_inventory_price'), ['price'], unique=False)
+
+    # Expression index; autogenerate can't compare these, so it is maintained by hand
+    op.create_index('ix_inventory_name_lower', 'inventory', [sa.func.lower(sa.column('name'))], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_inventory_name_lower', table_name='inventory')
+
+    with op.batch_alter_table('inventory', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_inventory_price'))
@@ -0,0 +1,44 @@
+"""inventory stock quantities
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 13:33:14.220778
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def _restore_name_index():
+    # On SQLite the check constraint means copying the table, which loses ix_inventory_name_lower:
+    # expression indexes can't be reflected, so the batch copy doesn't know to recreate it
+    if op.get_context().dialect.name == 'sqlite':
+        op.create_index('ix_inventory_name_lower', 'inventory', [sa.func.lower(sa.column('name'))], unique=False)
+
+
+def upgrade():
+    with op.batch_alter_table('inventory', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('quantity', sa.Integer(), server_default='0', nullable=False))
+        # Existing parts start out of stock until counted; the check backs up the conditional reservation UPDATE
+        batch_op.create_check_constraint('ck_inventory_quantity_nonnegative', 'quantity >= 0')
+    _restore_name_index()
+
+    with op.batch_alter_table('inventory_service_ticket', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('quantity', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('inventory_service_ticket', schema=None) as batch_op:
+        batch_op.drop_column('quantity')
+
+    with op.batch_alter_table('inventory', schema=None) as batch_op:
+        batch_op.drop_constraint('ck_inventory_quantity_nonnegative', type_='check')
+        batch_op.drop_column('quantity')
+    _restore_name_index()
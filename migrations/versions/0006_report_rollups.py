@@ -0,0 +1,60 @@
+"""report rollups
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 13:40:59.541540
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('report_ticket_days',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('ticket_count', sa.Integer(), nullable=False),
+    sa.Column('parts_units', sa.Integer(), nullable=False),
+    sa.Column('parts_revenue', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('day')
+    )
+    op.create_table('report_mechanic_days',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('mechanic_id', sa.Integer(), nullable=False),
+    sa.Column('ticket_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['mechanic_id'], ['mechanics.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('day', 'mechanic_id')
+    )
+
+    # Seed the rollups from the existing tickets (same as `flask reports backfill`)
+    if op.get_context().dialect.name == 'sqlite':
+        day = "date(service_tickets.service_date)"
+    else:
+        day = "CAST(service_tickets.service_date AS DATE)"
+    op.execute(
+        "INSERT INTO report_ticket_days (day, ticket_count, parts_units, parts_revenue) "
+        "SELECT day, SUM(tickets), SUM(units), SUM(revenue) FROM ("
+        f"SELECT {day} AS day, 1 AS tickets, 0 AS units, 0.0 AS revenue FROM service_tickets "
+        f"UNION ALL SELECT {day}, 0, inventory_service_ticket.quantity, "
+        "inventory.price * inventory_service_ticket.quantity FROM service_tickets "
+        "JOIN inventory_service_ticket ON inventory_service_ticket.service_ticket_id = service_tickets.id "
+        "JOIN inventory ON inventory.id = inventory_service_ticket.inventory_id"
+        ") AS activity GROUP BY day"
+    )
+    op.execute(
+        "INSERT INTO report_mechanic_days (day, mechanic_id, ticket_count) "
+        f"SELECT {day}, mechanic_service_ticket.mechanic_id, COUNT(*) FROM service_tickets "
+        "JOIN mechanic_service_ticket ON mechanic_service_ticket.service_ticket_id = service_tickets.id "
+        f"GROUP BY {day}, mechanic_service_ticket.mechanic_id"
+    )
+
+
+def downgrade():
+    op.drop_table('report_mechanic_days')
+    op.drop_table('report_ticket_days')
@@ -0,0 +1,28 @@
+"""uppercase vins
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 09:12:03.114873
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # VINs are stored uppercase (ServiceTicket validates them) so the by-VIN lookup can
+    # stay an exact match on ix_service_tickets_vin_service_date
+    tickets = sa.table('service_tickets', sa.column('VIN', sa.String(17)))
+    op.execute(tickets.update().where(tickets.c.VIN != sa.func.upper(tickets.c.VIN))
+               .values(VIN=sa.func.upper(tickets.c.VIN)))
+
+
+def downgrade():
+    pass  # The original casing isn't kept; uppercase VINs are valid before this revision too